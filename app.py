@@ -1,13 +1,13 @@
 import streamlit as st
 from dotenv import load_dotenv
 import os
-import google.generativeai as genai
 
 # Import modules
 from modules.resume_analyzer import render_resume_analysis_tab
 from modules.job_matcher import render_job_matching_tab
 from modules.job_search import render_job_search_tab, render_salary_tab
 from modules.ui_components import load_css, render_header, render_footer
+from utils.gemini_client import configure_gemini, warm_up_gemini
 
 # Load environment variables
 load_dotenv()
@@ -24,10 +24,10 @@ st.set_page_config(
 # Load custom CSS
 load_css()
 
-# Configure Gemini API
+# Configure Gemini API (once per process; reruns reuse the shared client)
 api_key = os.getenv("GOOGLE_API_KEY")
-if api_key:
-    genai.configure(api_key=api_key)
+if configure_gemini(api_key):
+    warm_up_gemini()
 else:
     st.error("⚠️ GOOGLE_API_KEY not found in environment variables. Please add it to .env file.")
 
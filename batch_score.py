@@ -0,0 +1,361 @@
+"""
+Headless batch scoring of many resumes against one or more job descriptions
+
+PDFs are parsed in a process pool, then each resume gets local skill
+extraction and job matches plus the requested Gemini analyses for every job
+description (and, with --local-score, the local ATS breakdown), with at most
+--concurrency resumes being scored at once. One JSON record per (resume, job
+description) is appended to the output file as soon as it is ready; rerunning
+the same command skips every pair already written without errors, so an
+interrupted run resumes where it stopped (retried pairs are appended again,
+and the last record for a pair wins).
+
+Usage:
+    python batch_score.py --resumes resumes/ --jd jd.txt --analyses ats_score --out results.jsonl
+    python batch_score.py --manifest resumes.csv --jd backend.txt --jd data.txt --parquet results.parquet
+    python batch_score.py --resumes resumes/ --jd jd.txt --local-score --top-matches 0
+"""
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dotenv import load_dotenv
+import pandas as pd
+from utils.pdf_utils import parse_resume
+from utils.skill_extractor import extract_skills_locally
+from utils.metrics import record_metric, summarize_values
+from utils.gemini_client import configure_gemini
+from utils.ats_scorer import score_resume_locally
+from utils.structured_output import ANALYSIS_SCHEMAS, record_to_dict
+from modules.resume_analyzer import LOCAL_SCORE_NARRATIVES, PROMPT_TEMPLATES, analyze_resume, analyze_resume_structured
+from modules.job_matcher import match_jobs
+
+DEFAULT_OUTPUT = "batch_results.jsonl"
+DEFAULT_PARSE_WORKERS = min(8, os.cpu_count() or 1)
+# Resumes scored at once, which also bounds concurrent Gemini calls
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TOP_MATCHES = 5
+PROGRESS_EVERY = 50
+
+def list_resumes(resume_dir=None, manifest=None):
+    """
+    Resume PDF paths from a directory or a manifest
+
+    Args:
+        resume_dir: Directory searched recursively for .pdf files
+        manifest: CSV with a "path" column, or a text file with one path per
+            line; relative paths are taken relative to the manifest
+
+    Returns:
+        Sorted list of unique paths
+    """
+    paths = []
+    if resume_dir:
+        for root, _, files in os.walk(resume_dir):
+            paths.extend(os.path.join(root, name) for name in files if name.lower().endswith(".pdf"))
+    if manifest:
+        base_dir = os.path.dirname(os.path.abspath(manifest))
+        if manifest.lower().endswith(".csv"):
+            entries = pd.read_csv(manifest)["path"].dropna().astype(str).tolist()
+        else:
+            with open(manifest, "r", encoding="utf-8") as f:
+                entries = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        paths.extend(entry if os.path.isabs(entry) else os.path.join(base_dir, entry) for entry in entries)
+    return sorted(set(paths))
+
+def load_job_descriptions(paths):
+    """
+    Read job description files
+
+    Args:
+        paths: Text file paths
+
+    Returns:
+        Dict of job description id (file name without extension) -> text
+    """
+    job_descriptions = {}
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            job_descriptions[os.path.splitext(os.path.basename(path))[0]] = f.read()
+    return job_descriptions
+
+def load_checkpoint(out_path):
+    """
+    (resume, jd) pairs already written to the output without errors
+
+    Args:
+        out_path: JSONL output of a previous run
+
+    Returns:
+        Set of (resume path, job description id) tuples
+    """
+    done = set()
+    if not os.path.exists(out_path):
+        return done
+    with open(out_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by an interrupted run
+                continue
+            if not record.get("errors"):
+                done.add((record["resume"], record["jd"]))
+    return done
+
+def parse_resume_file(path):
+    """
+    Read and parse one PDF (runs in a worker process)
+
+    Args:
+        path: PDF path
+
+    Returns:
+        Tuple (ParsedResume, timings dict)
+    """
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        pdf_bytes = f.read()
+    read_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    parsed = parse_resume(pdf_bytes, parallel=False)
+    return parsed, {"read": read_seconds, "parse": time.perf_counter() - start}
+
+def score_resume(path, parsed, timings, job_descriptions, analyses, top_matches, local_score=False, structured=False):
+    """
+    Skills, job matches and Gemini analyses for one parsed resume
+
+    Args:
+        path: PDF path
+        parsed: ParsedResume
+        timings: Stage timings so far (read, parse), extended in place
+        job_descriptions: Dict of job description id -> text
+        analyses: Analysis types passed to analyze_resume
+        top_matches: Number of job matches, 0 to skip matching
+        local_score: Add the local ATS breakdown (score_resume_locally) per job description
+        structured: Store analyses as validated JSON records instead of markdown
+
+    Returns:
+        List of records, one per job description
+    """
+    start = time.perf_counter()
+    skills = extract_skills_locally(parsed.text)
+    timings["skills"] = time.perf_counter() - start
+
+    matches, match_error = [], None
+    if top_matches and skills:
+        start = time.perf_counter()
+        try:
+            # Database only, so results do not depend on what the local live warehouse holds
+            found = match_jobs(", ".join(skills), top_n=top_matches, include_live=False)
+            matches = found[["job_link", "similarity_percentage"]].to_dict("records")
+        except Exception as e:
+            # Reported on every record, so the pair is retried on the next run
+            match_error = str(e)
+        timings["match"] = time.perf_counter() - start
+
+    pdf_content = parsed.gemini_parts() if analyses else None
+    records = []
+    for jd_id, job_description in job_descriptions.items():
+        record = {
+            "resume": path,
+            "jd": jd_id,
+            "resume_hash": parsed.content_hash,
+            "pages": parsed.page_count,
+            "skills": skills,
+            "matches": matches,
+            "analyses": {},
+            "errors": {"match": match_error} if match_error else {},
+        }
+        ats_score = None
+        if local_score or any(analysis_type in LOCAL_SCORE_NARRATIVES for analysis_type in analyses):
+            # Also the score of the ats_score and match_percentage analyses; Gemini only adds the narrative
+            start = time.perf_counter()
+            ats_score = score_resume_locally(parsed.text, job_description, resume_skills=skills)
+            timings["ats"] = timings.get("ats", 0.0) + time.perf_counter() - start
+            if local_score:
+                record["ats"] = ats_score.to_dict()
+        for analysis_type in analyses:
+            start = time.perf_counter()
+            try:
+                if structured:
+                    result = record_to_dict(
+                        analyze_resume_structured(analysis_type, pdf_content, job_description, ats_score=ats_score)
+                    )
+                else:
+                    result = analyze_resume(analysis_type, pdf_content, job_description, ats_score=ats_score)
+                record["analyses"][analysis_type] = result
+            except Exception as e:
+                record["errors"][analysis_type] = str(e)
+            timings[f"gemini.{analysis_type}"] = timings.get(f"gemini.{analysis_type}", 0.0) + time.perf_counter() - start
+        records.append(record)
+    return records
+
+class BatchRun:
+    """Parse in a process pool, score in a bounded thread pool, append results as they finish"""
+
+    def __init__(self, out_file, job_descriptions, analyses, top_matches, local_score, structured,
+                 parse_workers, concurrency):
+        self.out_file = out_file
+        self.job_descriptions = job_descriptions
+        self.analyses = analyses
+        self.top_matches = top_matches
+        self.local_score = local_score
+        self.structured = structured
+        self.parse_pool = ProcessPoolExecutor(parse_workers, mp_context=multiprocessing.get_context("spawn"))
+        self.score_pool = ThreadPoolExecutor(concurrency)
+        # Parsed resumes waiting to be scored are bounded, so memory stays flat on large batches
+        self.slots = threading.BoundedSemaphore(concurrency + 2 * parse_workers)
+        self.write_lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        # Every stage timing of this run; the metrics store only keeps the most recent samples
+        self.stage_seconds = defaultdict(list)
+        self.start = time.perf_counter()
+
+    def submit(self, path, jd_ids):
+        """Queue one resume for the job descriptions it still lacks results for"""
+        self.slots.acquire()
+        submitted_at = time.perf_counter()
+        job_descriptions = {jd_id: self.job_descriptions[jd_id] for jd_id in jd_ids}
+        future = self.parse_pool.submit(parse_resume_file, path)
+        future.add_done_callback(lambda f: self._on_parsed(path, job_descriptions, f, submitted_at))
+
+    def _on_parsed(self, path, job_descriptions, future, submitted_at):
+        try:
+            parsed, timings = future.result()
+        except Exception as e:
+            error_records = [{"resume": path, "jd": jd_id, "errors": {"parse": str(e)}} for jd_id in job_descriptions]
+            self._finish(error_records, {}, submitted_at)
+            return
+        self.score_pool.submit(self._score, path, job_descriptions, parsed, timings, submitted_at)
+
+    def _score(self, path, job_descriptions, parsed, timings, submitted_at):
+        try:
+            records = score_resume(
+                path, parsed, timings, job_descriptions, self.analyses, self.top_matches, self.local_score,
+                self.structured,
+            )
+        except Exception as e:
+            records = [{"resume": path, "jd": jd_id, "errors": {"score": str(e)}} for jd_id in job_descriptions]
+        self._finish(records, timings, submitted_at)
+
+    def _finish(self, records, timings, submitted_at):
+        timings["total"] = time.perf_counter() - submitted_at
+        for stage, seconds in timings.items():
+            record_metric(f"batch.{stage}", seconds=seconds)
+        with self.write_lock:
+            for stage, seconds in timings.items():
+                self.stage_seconds[stage].append(seconds)
+            for record in records:
+                self.out_file.write(json.dumps(record) + "\n")
+            self.out_file.flush()
+            self.completed += 1
+            self.failed += any(record.get("errors") for record in records)
+            if self.completed % PROGRESS_EVERY == 0:
+                elapsed = time.perf_counter() - self.start
+                print(f"  {self.completed} resumes, {self.completed / elapsed * 60:.1f}/min", file=sys.stderr)
+        self.slots.release()
+
+    def close(self):
+        self.parse_pool.shutdown(wait=True)
+        self.score_pool.shutdown(wait=True)
+
+def stage_report(stage_seconds, analyses):
+    """p50/p95/mean/max seconds per stage over every resume of a run"""
+    report = {}
+    for stage in ["read", "parse", "skills", "match", "ats", *(f"gemini.{a}" for a in analyses), "total"]:
+        summary = summarize_values(stage_seconds.get(stage, ()))
+        if summary:
+            report[stage] = {key: round(value, 4) for key, value in summary.items() if key != "count"}
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", help="Directory of resume PDFs (searched recursively)")
+    parser.add_argument("--manifest", help="CSV with a 'path' column, or a text file with one PDF path per line")
+    parser.add_argument("--jd", action="append", required=True, help="Job description text file (repeatable)")
+    parser.add_argument("--analyses", nargs="*", default=[], choices=[t for t in PROMPT_TEMPLATES if t != "extract_skills"],
+                        help="Gemini analyses to run per resume and job description")
+    parser.add_argument("--top-matches", type=int, default=DEFAULT_TOP_MATCHES, help="Job database matches per resume (0 to skip)")
+    parser.add_argument("--local-score", action="store_true",
+                        help="Add the local ATS score breakdown (no Gemini call) per resume and job description")
+    parser.add_argument("--structured", action="store_true",
+                        help="Ask Gemini for JSON and store validated records (scores as numbers) instead of markdown")
+    parser.add_argument("--out", default=DEFAULT_OUTPUT, help="JSONL output, also the checkpoint")
+    parser.add_argument("--parquet", help="Also export all results to this Parquet file at the end")
+    parser.add_argument("--parse-workers", type=int, default=DEFAULT_PARSE_WORKERS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--restart", action="store_true", help="Ignore and overwrite existing results")
+    parser.add_argument("--limit", type=int, help="Only process the first N pending resumes")
+    args = parser.parse_args()
+    if not args.resumes and not args.manifest:
+        parser.error("pass --resumes and/or --manifest")
+    if args.parquet and not any(importlib.util.find_spec(engine) for engine in ("pyarrow", "fastparquet")):
+        # Checked up front so a long run does not end without its export
+        parser.error("--parquet needs pyarrow (pip install pyarrow) or fastparquet")
+    if args.structured and set(args.analyses) - set(ANALYSIS_SCHEMAS):
+        parser.error(f"--structured supports these analyses: {', '.join(ANALYSIS_SCHEMAS)}")
+
+    load_dotenv()
+    if args.analyses and not configure_gemini(os.getenv("GOOGLE_API_KEY")):
+        parser.error("GOOGLE_API_KEY is required for --analyses")
+
+    job_descriptions = load_job_descriptions(args.jd)
+    paths = list_resumes(args.resumes, args.manifest)
+    if args.restart and os.path.exists(args.out):
+        os.remove(args.out)
+    done = load_checkpoint(args.out)
+    pending = [
+        (path, [jd_id for jd_id in job_descriptions if (path, jd_id) not in done]) for path in paths
+    ]
+    pending = [(path, jd_ids) for path, jd_ids in pending if jd_ids]
+    print(f"{len(paths)} resumes, {len(paths) - len(pending)} already done, {len(pending)} to score", file=sys.stderr)
+    if args.limit:
+        pending = pending[:args.limit]
+
+    start = time.perf_counter()
+    with open(args.out, "a", encoding="utf-8") as out_file:
+        run = BatchRun(
+            out_file, job_descriptions, args.analyses, args.top_matches, args.local_score, args.structured,
+            args.parse_workers, args.concurrency,
+        )
+        try:
+            for path, jd_ids in pending:
+                run.submit(path, jd_ids)
+        finally:
+            run.close()
+    elapsed = time.perf_counter() - start
+
+    if args.parquet:
+        # A retried pair appears again further down the JSONL; the last record wins
+        results = pd.read_json(args.out, lines=True).drop_duplicates(["resume", "jd"], keep="last")
+        if "ats" in results:
+            # Flat column so screening results can be sorted and filtered directly
+            results["ats_total"] = results["ats"].map(lambda ats: ats["total"] if isinstance(ats, dict) else None)
+        # Nested fields are kept as JSON strings so any Parquet engine can write them
+        for column in ("skills", "matches", "analyses", "errors", "ats"):
+            if column in results:
+                results[column] = results[column].map(json.dumps)
+        try:
+            results.to_parquet(args.parquet, index=False)
+        except ImportError as e:
+            print(f"⚠️ Parquet export needs pyarrow or fastparquet: {e}", file=sys.stderr)
+
+    print(json.dumps({
+        "resumes": run.completed,
+        "failed": run.failed,
+        "seconds": round(elapsed, 2),
+        "resumes_per_minute": round(run.completed / elapsed * 60, 1) if elapsed else None,
+        "stages": stage_report(run.stage_seconds, args.analyses),
+        "output": args.out,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compare the LSH job match backend against the exact inverted-index path
+
+Reports recall@k and latency percentiles for both backends on queries
+sampled from the job corpus itself, and whether the LSH recall meets
+LSH_RECALL_TARGET.
+
+Usage:
+    python -m benchmarks.ann_benchmark --queries 200 --k 5 --n-tables 8 --n-bits 14
+"""
+import argparse
+import json
+import time
+import numpy as np
+from utils.ann_index import DEFAULT_LSH_PARAMS, LSH_RECALL_TARGET, get_lsh_index
+from utils.job_index import DEFAULT_CSV_PATH, DEFAULT_INDEX_DIR, get_job_index, top_n_indices
+
+def sample_queries(job_index, num_queries, seed=0):
+    """Build skill queries from random subsets of random job postings"""
+    rng = np.random.default_rng(seed)
+    queries = []
+    for row in rng.choice(len(job_index), size=num_queries, replace=len(job_index) < num_queries):
+        skills = [s for s in job_index.jobs.get(int(row), "job_skills").split(",") if s.strip()]
+        keep = max(1, len(skills) // 2)
+        queries.append(", ".join(rng.choice(skills, size=min(keep, len(skills)), replace=False)))
+    return queries
+
+def time_backend(backend, queries, k):
+    """Run every query through a backend, returning latencies and top-k results"""
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        rows, scores = backend.score_candidates(query)
+        top = top_n_indices(scores, k)
+        latencies.append(time.perf_counter() - start)
+        results.append((rows[top], scores[top]))
+    return np.array(latencies), results
+
+def recall_at_k(exact_results, approx_results, k):
+    """Tie-aware recall: an approximate hit counts if it scores at least the exact k-th score"""
+    recalls = []
+    for (_, exact_scores), (_, approx_scores) in zip(exact_results, approx_results):
+        if not len(exact_scores):
+            recalls.append(1.0)
+            continue
+        threshold = exact_scores[-1] - 1e-9
+        recalls.append(min(1.0, np.sum(approx_scores >= threshold) / len(exact_scores)))
+    return float(np.mean(recalls))
+
+def summarize(latencies):
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 3),
+        "mean_ms": round(float(latencies.mean()) * 1000, 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=DEFAULT_CSV_PATH)
+    parser.add_argument("--index-dir", default=DEFAULT_INDEX_DIR)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--n-components", type=int, default=DEFAULT_LSH_PARAMS["n_components"])
+    parser.add_argument("--n-tables", type=int, default=DEFAULT_LSH_PARAMS["n_tables"])
+    parser.add_argument("--n-bits", type=int, default=DEFAULT_LSH_PARAMS["n_bits"])
+    parser.add_argument("--max-candidates", type=int, default=DEFAULT_LSH_PARAMS["max_candidates"])
+    parser.add_argument("--no-multiprobe", action="store_true")
+    args = parser.parse_args()
+
+    job_index = get_job_index(args.csv, args.index_dir)
+    params = {
+        "n_components": args.n_components,
+        "n_tables": args.n_tables,
+        "n_bits": args.n_bits,
+        "max_candidates": args.max_candidates,
+        "multiprobe": not args.no_multiprobe,
+    }
+    start = time.perf_counter()
+    lsh = get_lsh_index(job_index, params)
+    build_seconds = time.perf_counter() - start
+
+    queries = sample_queries(job_index, args.queries)
+    exact_latencies, exact_results = time_backend(job_index, queries, args.k)
+    lsh_latencies, lsh_results = time_backend(lsh, queries, args.k)
+    recall = recall_at_k(exact_results, lsh_results, args.k)
+
+    report = {
+        "num_jobs": len(job_index),
+        "num_queries": len(queries),
+        "k": args.k,
+        "lsh_params": lsh.params,
+        "lsh_load_or_build_seconds": round(build_seconds, 3),
+        "exact": summarize(exact_latencies),
+        "lsh": {
+            **summarize(lsh_latencies),
+            "recall_at_k": round(recall, 4),
+            "recall_target": LSH_RECALL_TARGET,
+            "meets_target": recall >= LSH_RECALL_TARGET,
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
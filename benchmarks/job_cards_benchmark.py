@@ -0,0 +1,77 @@
+"""
+Per-row job formatting (the tab's old render path) vs build_job_cards
+
+The legacy formatter below reproduces what render_job_card used to compute
+for every job on every rerun: dict lookups, None cleanup, location assembly,
+dateutil parsing, salary period mapping and int formatting.
+
+Usage:
+    python -m benchmarks.job_cards_benchmark --jobs 100 1000 10000
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from dateutil import parser
+from benchmarks.mock_jsearch_server import make_job
+from utils.job_cards import build_job_cards, sort_job_cards
+
+def legacy_format(job):
+    job_city = job.get("job_city", "") or ""
+    job_state = job.get("job_state", "") or ""
+    if job_city or job_state:
+        location = f"{job_city}, {job_state}".strip().rstrip(',').lstrip(',')
+    else:
+        location = job.get("job_country", "Remote")
+    try:
+        days_ago = (datetime.now(timezone.utc) - parser.parse(job.get("job_posted_at_datetime_utc"))).days
+        posted = "Today" if days_ago == 0 else "Yesterday" if days_ago == 1 else f"{days_ago} days ago"
+    except Exception:
+        posted = "Recently"
+    salary_text = ""
+    min_salary, max_salary = job.get("job_min_salary"), job.get("job_max_salary")
+    if min_salary or max_salary:
+        currency = job.get("job_salary_currency", "$")
+        period = {"YEAR": "/year", "MONTH": "/month", "HOUR": "/hour"}.get(job.get("job_salary_period"), "")
+        if min_salary and max_salary:
+            salary_text = f"{currency}{int(min_salary):,} - {currency}{int(max_salary):,}{period}"
+        elif min_salary:
+            salary_text = f"From {currency}{int(min_salary):,}{period}"
+        else:
+            salary_text = f"Up to {currency}{int(max_salary):,}{period}"
+    description = job.get("job_description", "No description available.")
+    if len(description) > 500:
+        description = description[:500] + "..."
+    return (job.get("job_title"), job.get("employer_name"), location, posted, salary_text, description)
+
+def best_of(fn, repeats=5):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return round(min(times) * 1000, 2)
+
+def main():
+    parser_ = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser_.add_argument("--jobs", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser_.parse_args()
+
+    report = []
+    for num_jobs in args.jobs:
+        jobs = [make_job("benchmark", i) for i in range(num_jobs)]
+        cards = build_job_cards(jobs)
+        legacy = [legacy_format(job) for job in jobs]
+        # Same display strings as the old path
+        assert [(c.location, c.posted_label, c.salary_text, c.description) for c in cards] == \
+            [(l[2], l[3], l[4], l[5]) for l in legacy]
+        report.append({
+            "jobs": num_jobs,
+            "legacy_per_rerun_ms": best_of(lambda: [legacy_format(job) for job in jobs]),
+            "build_job_cards_once_ms": best_of(lambda: build_job_cards(jobs)),
+            "sort_newest_ms": best_of(lambda: sort_job_cards(cards, "Newest")),
+        })
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
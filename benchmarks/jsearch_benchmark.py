@@ -0,0 +1,69 @@
+"""
+Sequential vs concurrent JSearch page fetching against the local mock server
+
+The sequential baseline reproduces the old tab behaviour (one page at a time
+with a 1s sleep between pages). The report includes the highest request rate
+the server observed, which must stay within the configured limit.
+
+Usage:
+    python -m benchmarks.jsearch_benchmark --results 100 --latency 0.3 --rate-limit 5
+"""
+import argparse
+import json
+import time
+from utils import api_utils
+from utils.jsearch_client import TokenBucket, collect_jobs, fetch_jobs_pages
+from benchmarks.mock_jsearch_server import start_mock_server
+
+def run_sequential(num_pages):
+    jobs = []
+    for page in range(1, num_pages + 1):
+        result = api_utils.fetch_jobs_api("Software Engineer", "India", False, page, use_cache=False)
+        if not isinstance(result, list) or not result:
+            break
+        jobs.extend(result)
+        if page < num_pages:
+            time.sleep(1)
+    return jobs
+
+def run_concurrent(num_pages, rate, burst):
+    limiter = TokenBucket(rate, burst)
+    page_results = fetch_jobs_pages("Software Engineer", "India", False, num_pages, limiter=limiter, use_cache=False)
+    jobs, error = collect_jobs(page_results)
+    return jobs, error
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--rate-limit", type=float, default=5.0, help="Server-side limit (requests/second)")
+    parser.add_argument("--client-rate", type=float, default=4.0, help="Client token bucket rate")
+    parser.add_argument("--client-burst", type=int, default=1,
+                        help="Client bucket capacity; burst + rate must stay within the server limit")
+    args = parser.parse_args()
+    num_pages = (args.results + 9) // 10
+
+    report = {"pages": num_pages, "server_latency_s": args.latency, "server_rate_limit": args.rate_limit}
+    for mode in ("sequential", "concurrent"):
+        server = start_mock_server(latency=args.latency, rate_limit=args.rate_limit, total_results=args.results)
+        api_utils.JSEARCH_BASE_URL = server.base_url
+        start = time.perf_counter()
+        if mode == "sequential":
+            jobs, error = run_sequential(num_pages), None
+        else:
+            jobs, error = run_concurrent(num_pages, args.client_rate, args.client_burst)
+        report[mode] = {
+            "seconds": round(time.perf_counter() - start, 3),
+            "jobs": len(jobs),
+            "error": error,
+            "server_429s": server.rejected,
+            "max_requests_per_second": server.max_requests_per_second(),
+        }
+        server.shutdown()
+        server.server_close()
+
+    report["speedup"] = round(report["sequential"]["seconds"] / report["concurrent"]["seconds"], 2)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Local stand-in for the Gemini model
+
+MockGeminiModel has the generate_content interface the app uses and streams a
+canned answer with a configurable time to first chunk and per-chunk delay.
+Prompts that ask for a JSON object (structured mode) get a valid object with
+the keys the prompt lists. install_mock_gemini puts it in the process-wide
+client registry, so every Gemini call in the process goes to the mock.
+"""
+import json
+import re
+import threading
+import time
+from utils import gemini_client
+
+ANSWER = (
+    "## Overall Assessment\nThe candidate matches most of the core requirements. "
+    "Strengths include hands-on experience with the main stack and production ownership. "
+    "Gaps: cloud certifications and large-scale system design are not evidenced.\n"
+    "## Suggested Improvements\n- Quantify impact in each role\n- Add the missing keywords\n"
+)
+_SCHEMA_LINE = re.compile(r'"(\w+)": (?:integer from 0 to (\d+)|(\[)|")')
+
+class MockChunk:
+    def __init__(self, text):
+        self.text = text
+
+class MockGeminiModel:
+    """Streams a fixed answer after ttft seconds, chunk_delay seconds apart"""
+
+    def __init__(self, ttft=0.05, chunk_delay=0.005, chunks=20):
+        self.ttft = ttft
+        self.chunk_delay = chunk_delay
+        self.chunks = chunks
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _answer(self, prompt):
+        fields = _SCHEMA_LINE.findall(prompt)
+        if not fields:
+            return ANSWER
+        answer = {}
+        for name, maximum, is_list in fields:
+            if maximum:
+                answer[name] = int(maximum) * 3 // 4
+            elif is_list:
+                answer[name] = ["Add the missing keywords", "Quantify impact"]
+            else:
+                answer[name] = "The candidate matches most of the core requirements."
+        return json.dumps(answer)
+
+    def _stream(self, answer):
+        time.sleep(self.ttft)
+        size = max(1, -(-len(answer) // self.chunks))
+        for start in range(0, len(answer), size):
+            if start:
+                time.sleep(self.chunk_delay)
+            yield MockChunk(answer[start:start + size])
+
+    def generate_content(self, contents, generation_config=None, stream=False, **kwargs):
+        with self._lock:
+            self.calls += 1
+        answer = self._answer(contents[0] if contents else "")
+        chunks = self._stream(answer)
+        return chunks if stream else MockChunk("".join(chunk.text for chunk in chunks))
+
+    def count_tokens(self, contents):
+        return {"total_tokens": len(str(contents)) // 4}
+
+def install_mock_gemini(ttft=0.05, chunk_delay=0.005, chunks=20):
+    """
+    Route every Gemini call in this process to a MockGeminiModel
+
+    Returns:
+        The installed MockGeminiModel
+    """
+    model = MockGeminiModel(ttft, chunk_delay, chunks)
+    with gemini_client._client_lock:
+        gemini_client._configured_key = "mock"
+        gemini_client._models[gemini_client.get_gemini_model_name()] = model
+    return model
@@ -0,0 +1,177 @@
+"""
+Local stand-in for the JSearch API
+
+Serves /search and /estimated-salary with synthetic data, a configurable
+per-request latency, a sliding-window rate limit that answers 429 with a
+Retry-After header and optional injected 503s. Every request and connection is
+recorded so tests can check the client's behaviour.
+
+Usage:
+    python -m benchmarks.mock_jsearch_server --port 8765 --latency 0.5 --rate-limit 5
+    JSEARCH_BASE_URL=http://127.0.0.1:8765 streamlit run app.py
+"""
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TITLES = ["Software Engineer", "Data Scientist", "Data Analyst", "Product Manager", "Web Developer"]
+CITIES = [("Bengaluru", "KA", "IN"), ("Austin", "TX", "US"), (None, None, "US"), ("Pune", "MH", "IN")]
+PERIODS = ["YEAR", "MONTH", "HOUR", None]
+
+def make_job(query, index):
+    """Deterministic synthetic posting shaped like a JSearch result"""
+    city, state, country = CITIES[index % len(CITIES)]
+    has_salary = index % 3 != 0
+    return {
+        "job_id": f"mock-{abs(hash(query)) % 10_000}-{index}",
+        "job_title": f"{TITLES[index % len(TITLES)]} {index}",
+        "employer_name": f"Company {index % 17}",
+        "job_city": city,
+        "job_state": state,
+        "job_country": country,
+        "job_employment_type": "FULLTIME",
+        "job_posted_at_datetime_utc": f"2026-10-{1 + index % 15:02d}T08:00:00.000Z",
+        "job_apply_link": f"https://example.com/jobs/{index}",
+        "job_description": f"Synthetic description for posting {index}. " * 20,
+        "job_min_salary": 50000 + 1000 * index if has_salary else None,
+        "job_max_salary": 90000 + 1000 * index if has_salary and index % 2 else None,
+        "job_salary_currency": "$",
+        "job_salary_period": PERIODS[index % len(PERIODS)],
+    }
+
+class MockJSearchServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.3, rate_limit=5.0, total_results=200, retry_after=1, fail_every=0):
+        super().__init__(address, MockJSearchHandler)
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.total_results = total_results
+        self.retry_after = retry_after
+        self.fail_every = fail_every
+        self.lock = threading.Lock()
+        self.window = deque()
+        self.requests = []
+        self.rejected = 0
+        self.failed = 0
+        self.connections = 0
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def admit(self):
+        # Sliding one-second window; False means the caller is over the limit
+        now = time.monotonic()
+        with self.lock:
+            while self.window and now - self.window[0] >= 1.0:
+                self.window.popleft()
+            if self.rate_limit and len(self.window) >= self.rate_limit:
+                self.rejected += 1
+                return False
+            self.window.append(now)
+            self.requests.append(now)
+            return True
+
+    def should_fail(self):
+        # Every fail_every-th admitted request gets a 503
+        with self.lock:
+            if self.fail_every and len(self.requests) % self.fail_every == 0:
+                self.failed += 1
+                return True
+            return False
+
+    def max_requests_per_second(self):
+        """Most admitted requests seen in any one-second window"""
+        with self.lock:
+            times = list(self.requests)
+        best, start = 0, 0
+        for end in range(len(times)):
+            while times[end] - times[start] >= 1.0:
+                start += 1
+            best = max(best, end - start + 1)
+        return best
+
+class MockJSearchHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so connection reuse by the client is visible in server.connections
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        if not server.admit():
+            self._send_json(429, {"message": "Too many requests"}, {"Retry-After": str(server.retry_after)})
+            return
+        time.sleep(server.latency)
+        if server.should_fail():
+            self._send_json(503, {"message": "Service unavailable"})
+            return
+
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path.endswith("/search"):
+            page = int(params.get("page", "1"))
+            start = (page - 1) * 10
+            end = min(server.total_results, start + 10)
+            jobs = [make_job(params.get("query", ""), i) for i in range(start, end)]
+            self._send_json(200, {"status": "OK", "data": jobs})
+        elif url.path.endswith("/estimated-salary"):
+            self._send_json(200, {"status": "OK", "data": [{
+                "job_title": params.get("job_title"),
+                "location": params.get("location"),
+                "publisher_name": "Mock",
+                "min_salary": 60000,
+                "median_salary": 85000,
+                "max_salary": 120000,
+            }]})
+        else:
+            self._send_json(404, {"message": "Not found"})
+
+def start_mock_server(port=0, latency=0.3, rate_limit=5.0, total_results=200, retry_after=1, fail_every=0):
+    """
+    Start the mock server in a background thread
+
+    Returns:
+        The running MockJSearchServer (call shutdown() to stop it)
+    """
+    server = MockJSearchServer(("127.0.0.1", port), latency, rate_limit, total_results, retry_after, fail_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--rate-limit", type=float, default=5.0)
+    parser.add_argument("--total-results", type=int, default=200)
+    parser.add_argument("--fail-every", type=int, default=0, help="Answer every Nth request with a 503")
+    args = parser.parse_args()
+    server = MockJSearchServer(("127.0.0.1", args.port), args.latency, args.rate_limit, args.total_results,
+                               fail_every=args.fail_every)
+    print(f"Mock JSearch listening on {server.base_url}")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
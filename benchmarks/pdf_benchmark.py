@@ -0,0 +1,87 @@
+"""
+Time resume ingestion on synthetic 1-, 5- and 20-page PDFs
+
+Compares the inline (serial) parse against the page-parallel process pool.
+
+Usage:
+    python -m benchmarks.pdf_benchmark --pages 1 5 20 --repeat 5 --dpi 72
+"""
+import argparse
+import json
+import time
+import numpy as np
+import fitz  # PyMuPDF
+from utils import pdf_utils
+
+RESUME_LINES = [
+    "Jane Doe - Senior Data Engineer",
+    "Skills: Python, SQL, Apache Spark, Airflow, AWS, Docker, Kubernetes, Machine Learning",
+    "Built batch and streaming data pipelines processing 2TB per day.",
+    "Led migration of the analytics warehouse to a lakehouse architecture.",
+    "Mentored five engineers and introduced code review and CI/CD practices.",
+]
+
+def make_synthetic_pdf(num_pages, lines_per_page=40):
+    """
+    Build a text PDF with num_pages resume-like pages
+
+    Args:
+        num_pages: Number of pages
+        lines_per_page: Text lines written on each page
+
+    Returns:
+        PDF bytes
+    """
+    pdf_document = fitz.open()
+    for page_number in range(num_pages):
+        page = pdf_document.new_page()
+        text = "\n".join(
+            f"{RESUME_LINES[(page_number + i) % len(RESUME_LINES)]} ({page_number}.{i})"
+            for i in range(lines_per_page)
+        )
+        page.insert_text((40, 40), text, fontsize=9)
+    pdf_bytes = pdf_document.tobytes()
+    pdf_document.close()
+    return pdf_bytes
+
+def time_parse(pdf_bytes, num_pages, repeat, dpi, parallel):
+    """Wall-clock seconds for each of repeat parses, all pages processed"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pdf_utils.parse_resume(pdf_bytes, dpi=dpi, max_pages=num_pages, parallel=parallel)
+        timings.append(time.perf_counter() - start)
+    return np.array(timings)
+
+def summarize(timings):
+    return {
+        "p50_ms": round(float(np.percentile(timings, 50)) * 1000, 2),
+        "p95_ms": round(float(np.percentile(timings, 95)) * 1000, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--dpi", type=int, default=pdf_utils.RESUME_DPI)
+    args = parser.parse_args()
+
+    # Start the worker processes before timing anything
+    pdf_utils.parse_resume(make_synthetic_pdf(pdf_utils.PARALLEL_MIN_PAGES), parallel=True)
+
+    report = {"dpi": args.dpi, "workers": pdf_utils.PARSE_WORKERS, "results": []}
+    for num_pages in args.pages:
+        pdf_bytes = make_synthetic_pdf(num_pages)
+        serial = time_parse(pdf_bytes, num_pages, args.repeat, args.dpi, parallel=False)
+        parallel = time_parse(pdf_bytes, num_pages, args.repeat, args.dpi, parallel=True)
+        report["results"].append({
+            "pages": num_pages,
+            "pdf_bytes": len(pdf_bytes),
+            "serial": summarize(serial),
+            "parallel": summarize(parallel),
+            "speedup": round(float(np.median(serial) / np.median(parallel)), 2),
+        })
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Per-rerun render time and payload of the job search results
+
+Renders a synthetic result set through Streamlit's AppTest runner and sums the
+serialized size of every message the script sends, which is what goes over
+the websocket to the browser. "all" renders every card the way the tab used
+to (including the per-card <style> block); "paged" renders the cached result
+set through render_job_results, first page and after clicking Next.
+
+Usage:
+    python -m benchmarks.render_benchmark --jobs 100 --reruns 5
+"""
+import argparse
+import json
+import time
+import numpy as np
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+_payload_sizes = []
+_original_run = LocalScriptRunner.run
+
+def _measuring_run(self, *args, **kwargs):
+    tree = _original_run(self, *args, **kwargs)
+    _payload_sizes.append(sum(msg.ByteSize() for msg in self.forward_msgs()))
+    return tree
+
+LocalScriptRunner.run = _measuring_run
+
+def all_cards_app(num_jobs):
+    import os
+    import sys
+    sys.path.insert(0, os.getcwd())
+    import streamlit as st
+    from benchmarks.mock_jsearch_server import make_job
+    from modules.job_search import render_job_card
+    from utils.job_cards import build_job_cards
+
+    legacy_style = """
+    <style>
+    .job-card {
+        border: 1px solid #ddd;
+        border-radius: 8px;
+        padding: 15px;
+        margin-bottom: 15px;
+        background-color: #f9f9f9;
+    }
+    </style>
+    """
+    for card in build_job_cards([make_job("benchmark", i) for i in range(num_jobs)]):
+        st.markdown(legacy_style, unsafe_allow_html=True)
+        render_job_card(card)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+def paged_app(num_jobs):
+    import os
+    import sys
+    sys.path.insert(0, os.getcwd())
+    import streamlit as st
+    from benchmarks.mock_jsearch_server import make_job
+    from modules.job_search import render_job_results
+    from utils.job_cards import build_job_cards
+
+    if "job_search_results" not in st.session_state:
+        jobs = build_job_cards([make_job("benchmark", i) for i in range(num_jobs)])
+        st.session_state.job_search_results = {"jobs": jobs, "error": None}
+    render_job_results(st.session_state.job_search_results["jobs"])
+
+def measure(app, num_jobs, reruns, click_next=False):
+    at = AppTest.from_function(app, kwargs={"num_jobs": num_jobs}, default_timeout=60)
+    at.run()
+    if click_next:
+        at.button(key="job_results_next").click().run()
+    seconds, sizes = [], []
+    for _ in range(reruns):
+        _payload_sizes.clear()
+        start = time.perf_counter()
+        at.run()
+        seconds.append(time.perf_counter() - start)
+        sizes.append(_payload_sizes[-1])
+    assert not at.exception, at.exception
+    return {
+        "rerun_ms_p50": round(float(np.percentile(seconds, 50)) * 1000, 1),
+        "payload_kb": round(float(np.mean(sizes)) / 1024, 1),
+        "elements": len(list(at.main)),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+
+    report = {
+        "jobs": args.jobs,
+        "all": measure(all_cards_app, args.jobs, args.reruns),
+        "paged": measure(paged_app, args.jobs, args.reruns),
+        "paged_next": measure(paged_app, args.jobs, args.reruns, click_next=True),
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Accuracy vs latency of local skill extraction compared to Gemini
+
+Without --resumes, synthetic resumes are written from random job postings so
+the true skill list is known. With --resumes DIR, every .pdf/.txt in DIR is
+used; the reference is then Gemini's output, so pass --with-gemini.
+
+Usage:
+    python -m benchmarks.skill_extraction_benchmark --samples 200
+    python -m benchmarks.skill_extraction_benchmark --resumes resumes/ --with-gemini
+"""
+import argparse
+import json
+import os
+import time
+import numpy as np
+from utils.job_index import get_job_index
+from utils.pdf_utils import parse_resume
+from utils.skills import normalize_skill, split_skills
+from utils.skill_extractor import get_skill_extractor
+from modules.resume_analyzer import extract_skills_with_gemini
+
+SENTENCES = [
+    "Worked extensively with {} on production systems.",
+    "Delivered projects using {} across several teams.",
+    "Hands-on experience in {}.",
+    "Trained new hires on {} best practices.",
+]
+
+def synthetic_resumes(num_samples, seed=0):
+    """Resume-like texts built from random postings, with their true skills"""
+    job_index = get_job_index()
+    rng = np.random.default_rng(seed)
+    samples = []
+    for row in rng.choice(len(job_index), size=num_samples, replace=len(job_index) < num_samples):
+        raw_skills = [s.strip() for s in job_index.jobs.get(int(row), "job_skills").split(",") if s.strip()]
+        lines = [SENTENCES[i % len(SENTENCES)].format(skill) for i, skill in enumerate(raw_skills)]
+        samples.append(("\n".join(lines), set(split_skills(", ".join(raw_skills)))))
+    return samples
+
+def load_resumes(directory):
+    """(text, None) for each .pdf/.txt resume in a directory"""
+    samples = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.lower().endswith(".pdf"):
+            with open(path, "rb") as f:
+                samples.append((parse_resume(f.read(), parallel=False).text, None))
+        elif name.lower().endswith(".txt"):
+            with open(path, "r", encoding="utf-8") as f:
+                samples.append((f.read(), None))
+    return samples
+
+def score(predicted, reference):
+    """Precision, recall and F1 of two normalized skill sets"""
+    if not predicted and not reference:
+        return 1.0, 1.0, 1.0
+    hits = len(predicted & reference)
+    precision = hits / len(predicted) if predicted else 0.0
+    recall = hits / len(reference) if reference else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+def latency_summary(latencies):
+    return {
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--resumes", help="Directory of .pdf/.txt resumes")
+    parser.add_argument("--with-gemini", action="store_true", help="Also time Gemini extraction (uses quota)")
+    args = parser.parse_args()
+
+    samples = load_resumes(args.resumes) if args.resumes else synthetic_resumes(args.samples)
+    extractor = get_skill_extractor()
+
+    local_latencies, gemini_latencies = [], []
+    local_scores, gemini_scores = [], []
+    for text, truth in samples:
+        start = time.perf_counter()
+        local = {normalize_skill(s) for s in extractor.extract(text)}
+        local_latencies.append(time.perf_counter() - start)
+
+        gemini = None
+        if args.with_gemini:
+            start = time.perf_counter()
+            response = extract_skills_with_gemini(text)
+            gemini_latencies.append(time.perf_counter() - start)
+            gemini = {normalize_skill(s) for s in response.split(",") if normalize_skill(s)}
+            if truth is not None:
+                gemini_scores.append(score(gemini, truth))
+
+        reference = truth if truth is not None else gemini
+        if reference is not None:
+            local_scores.append(score(local, reference))
+
+    report = {
+        "num_resumes": len(samples),
+        "reference": "synthetic ground truth" if not args.resumes else "gemini",
+        "local": latency_summary(local_latencies),
+    }
+    if local_scores:
+        report["local"].update(dict(zip(("precision", "recall", "f1"), np.round(np.mean(local_scores, axis=0), 4).tolist())))
+    if gemini_latencies:
+        report["gemini"] = latency_summary(gemini_latencies)
+        if gemini_scores:
+            report["gemini"].update(dict(zip(("precision", "recall", "f1"), np.round(np.mean(gemini_scores, axis=0), 4).tolist())))
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+"""
+Hot-path benchmark suite on synthetic data with local stand-ins for Gemini and JSearch
+
+Every case runs in a fresh process, working in a scratch directory with its own
+data/ (synthetic job corpus, index, caches, warehouse), and reports latency
+percentiles, throughput and the process's peak RSS. Corpus-dependent cases
+(index build, job matching) run once per --rows size; the others run on the
+smallest corpus. Results are written as JSON; pass --compare with an earlier
+result file to get per-case ratios against it.
+
+Cases:
+    job_index.build           build_job_index over the synthetic corpus
+    find_job_matches          skill queries through match_jobs, job database only (no live warehouse)
+    extract_text_from_pdf     uncached parse of synthetic N-page PDFs
+    extract_skills_locally    trie skill extraction on synthetic resumes
+    score_resume_locally      local ATS scoring
+    compact_job_description   JD boilerplate stripping and budgeting
+    analyze_resume            local ATS score plus mocked Gemini narrative, cache miss and cache hit
+    analyze_resume_structured local ATS score plus mocked Gemini narrative, JSON mode
+    fetch_jobs_pages          concurrent page fetch from the mock JSearch server
+    build_job_cards           formatting a fetched result set
+    render_job_results        Streamlit rerun of the paged results (AppTest)
+
+Usage:
+    python -m benchmarks.suite --rows 10000 100000
+    python -m benchmarks.suite --rows 1000000 5000000 --cases job_index.build find_job_matches
+    python -m benchmarks.suite --compare benchmarks/results/abc1234.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is then reported as None
+    resource = None
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def timed_calls(fn, inputs, warmup=3):
+    """
+    Call fn on every input, returning per-call latencies
+
+    Args:
+        fn: Function of one argument
+        inputs: Arguments, one call each
+        warmup: Calls on the first inputs made beforehand and not timed
+
+    Returns:
+        List of seconds
+    """
+    for value in inputs[:warmup]:
+        fn(value)
+    latencies = []
+    for value in inputs:
+        start = time.perf_counter()
+        fn(value)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def summarize(latencies, items_per_call=1):
+    """Latency percentiles (ms) and throughput (items/s) of a list of call latencies"""
+    latencies = np.asarray(latencies, dtype=float)
+    return {
+        "calls": int(len(latencies)),
+        "latency_ms": {
+            "p50": round(float(np.percentile(latencies, 50)) * 1000, 3),
+            "p95": round(float(np.percentile(latencies, 95)) * 1000, 3),
+            "p99": round(float(np.percentile(latencies, 99)) * 1000, 3),
+            "mean": round(float(latencies.mean()) * 1000, 3),
+            "max": round(float(latencies.max()) * 1000, 3),
+        },
+        "throughput_per_s": round(len(latencies) * items_per_call / float(latencies.sum()), 2) if latencies.sum() else None,
+    }
+
+# Cases: each returns a summary dict; imports are local so baseline RSS excludes them
+
+def case_job_index_build(rows):
+    from utils.job_index import build_job_index
+    start = time.perf_counter()
+    build_job_index()
+    return summarize([time.perf_counter() - start], items_per_call=rows)
+
+def case_find_job_matches(rows, queries, seed=0):
+    from benchmarks.synthetic import sample_skill_lists
+    from modules.job_matcher import match_jobs
+    from utils.job_index import get_job_index
+    start = time.perf_counter()
+    get_job_index()
+    load_seconds = time.perf_counter() - start
+    rng = np.random.default_rng(seed)
+    skill_queries = [", ".join(skills[:8]) for skills in sample_skill_lists(rng, queries)]
+    # The live warehouse is left out so results depend only on the synthetic corpus
+    result = summarize(timed_calls(lambda query: match_jobs(query, include_live=False), skill_queries))
+    result["index_load_seconds"] = round(load_seconds, 3)
+    return result
+
+def case_extract_text_from_pdf(pages, repeat):
+    import io
+    from benchmarks.synthetic import resume_pdf
+    from utils import pdf_utils
+    pdf_bytes = resume_pdf(pages)
+
+    def parse(_):
+        # Measure the parse itself, not the per-process parsed resume cache
+        with pdf_utils._parsed_resumes_lock:
+            pdf_utils._parsed_resumes.clear()
+        pdf_utils.extract_text_from_pdf(io.BytesIO(pdf_bytes))
+
+    result = summarize(timed_calls(parse, list(range(repeat)), warmup=1), items_per_call=pages)
+    result["pdf_bytes"] = len(pdf_bytes)
+    return result
+
+def _resume_texts(samples, seed=0):
+    from benchmarks.synthetic import resume_text, sample_skill_lists
+    rng = np.random.default_rng(seed)
+    return [resume_text(skills) for skills in sample_skill_lists(rng, samples)]
+
+def case_extract_skills_locally(samples):
+    from utils.skill_extractor import extract_skills_locally
+    return summarize(timed_calls(extract_skills_locally, _resume_texts(samples)))
+
+def case_score_resume_locally(samples):
+    from benchmarks.synthetic import COMMON_SKILLS, job_description_text
+    from utils.ats_scorer import score_resume_locally
+    job_description = job_description_text(COMMON_SKILLS[:12])
+    return summarize(timed_calls(lambda text: score_resume_locally(text, job_description), _resume_texts(samples)))
+
+def case_compact_job_description(samples, seed=0):
+    from benchmarks.synthetic import job_description_text, sample_skill_lists
+    from utils.prompt_budget import compact_job_description
+    rng = np.random.default_rng(seed)
+    # Repeated sections push the JD over the default budget, so ranking runs too
+    job_descriptions = [job_description_text(skills, repeats=4) for skills in sample_skill_lists(rng, samples)]
+    return summarize(timed_calls(compact_job_description, job_descriptions))
+
+def case_analyze_resume(calls, ttft, cached):
+    from benchmarks.mock_gemini import install_mock_gemini
+    from benchmarks.synthetic import COMMON_SKILLS, job_description_text, resume_text
+    from modules.resume_analyzer import analyze_resume
+    install_mock_gemini(ttft=ttft)
+    text = resume_text(COMMON_SKILLS[:15])
+    pdf_content = [f"Resume text:\n{text}"]
+    job_description = job_description_text(COMMON_SKILLS[5:20])
+    # A distinct JD per call (and per run, as --workdir keeps caches) misses the response cache;
+    # the same JD hits it after the first call
+    inputs = [job_description if cached else f"{job_description}\nReference {time.time_ns()}-{i}" for i in range(calls)]
+    return summarize(timed_calls(
+        lambda jd: analyze_resume("ats_score", pdf_content, jd, resume_text=text), inputs, warmup=1 if cached else 0
+    ))
+
+def case_analyze_resume_structured(calls, ttft):
+    from benchmarks.mock_gemini import install_mock_gemini
+    from benchmarks.synthetic import COMMON_SKILLS, job_description_text, resume_text
+    from modules.resume_analyzer import analyze_resume_structured
+    install_mock_gemini(ttft=ttft)
+    text = resume_text(COMMON_SKILLS[:15])
+    pdf_content = [f"Resume text:\n{text}"]
+    job_description = job_description_text(COMMON_SKILLS[5:20])
+    inputs = [f"{job_description}\nReference {time.time_ns()}-{i}" for i in range(calls)]
+    return summarize(timed_calls(
+        lambda jd: analyze_resume_structured("ats_score", pdf_content, jd, resume_text=text), inputs, warmup=0
+    ))
+
+def case_fetch_jobs_pages(pages, latency, repeat):
+    from benchmarks.mock_jsearch_server import start_mock_server
+    from utils import api_utils
+    from utils.jsearch_client import TokenBucket, collect_jobs, fetch_jobs_pages
+    server = start_mock_server(latency=latency, rate_limit=1000, total_results=pages * 10)
+    api_utils.JSEARCH_BASE_URL = server.base_url
+
+    def fetch(_):
+        jobs, error = collect_jobs(fetch_jobs_pages(
+            "Software Engineer", "India", False, pages, limiter=TokenBucket(100, 10), use_cache=False
+        ))
+        if error:
+            raise RuntimeError(error)
+
+    try:
+        result = summarize(timed_calls(fetch, list(range(repeat)), warmup=1), items_per_call=pages)
+    finally:
+        server.shutdown()
+    result["server_latency_s"] = latency
+    return result
+
+def case_build_job_cards(jobs, repeat):
+    from benchmarks.mock_jsearch_server import make_job
+    from utils.job_cards import build_job_cards
+    postings = [make_job("benchmark", i) for i in range(jobs)]
+    return summarize(timed_calls(build_job_cards, [postings] * repeat, warmup=1), items_per_call=jobs)
+
+def case_render_job_results(jobs, reruns):
+    from streamlit.testing.v1 import AppTest
+    from benchmarks.render_benchmark import paged_app
+    at = AppTest.from_function(paged_app, kwargs={"num_jobs": jobs}, default_timeout=60)
+    at.run()
+
+    def rerun(_):
+        at.run()
+
+    result = summarize(timed_calls(rerun, list(range(reruns)), warmup=1))
+    if at.exception:
+        raise RuntimeError(at.exception)
+    return result
+
+CASES = {
+    "job_index.build": case_job_index_build,
+    "find_job_matches": case_find_job_matches,
+    "extract_text_from_pdf": case_extract_text_from_pdf,
+    "extract_skills_locally": case_extract_skills_locally,
+    "score_resume_locally": case_score_resume_locally,
+    "compact_job_description": case_compact_job_description,
+    "analyze_resume": case_analyze_resume,
+    "analyze_resume_structured": case_analyze_resume_structured,
+    "fetch_jobs_pages": case_fetch_jobs_pages,
+    "build_job_cards": case_build_job_cards,
+    "render_job_results": case_render_job_results,
+}
+
+def run_case(name, workdir, params):
+    """Run one case in the current (fresh) process; the child side of run_isolated"""
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    os.chdir(workdir)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    result = CASES[name](**params)
+    result["wall_seconds"] = round(time.perf_counter() - start, 3)
+    result["baseline_rss_mb"] = baseline
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+def run_isolated(name, workdir, params):
+    """
+    Run a case in a new process so its peak RSS is its own
+
+    Returns:
+        Result dict with name and params, or with an error message if the case failed
+    """
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        try:
+            result = pool.submit(run_case, name, workdir, params).result()
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+    return {"case": name, "params": params, **result}
+
+def git_revision():
+    """Short commit hash of the working tree, with "-dirty" when it has changes"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+def case_key(result):
+    return f"{result['case']} {json.dumps(result['params'], sort_keys=True)}"
+
+def compare(results, baseline_path):
+    """
+    Ratios of each case against a previous run (current / baseline)
+
+    Args:
+        results: Result dicts of this run
+        baseline_path: JSON report of an earlier run
+
+    Returns:
+        List of dicts with case, params and p50, p95, throughput and peak RSS ratios
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {case_key(result): result for result in json.load(f)["results"]}
+
+    def ratio(new, old):
+        return round(new / old, 3) if new is not None and old else None
+
+    rows = []
+    for result in results:
+        old = baseline.get(case_key(result))
+        if old is None or "error" in old or "error" in result:
+            continue
+        rows.append({
+            "case": result["case"],
+            "params": result["params"],
+            "p50_ratio": ratio(result["latency_ms"]["p50"], old["latency_ms"]["p50"]),
+            "p95_ratio": ratio(result["latency_ms"]["p95"], old["latency_ms"]["p95"]),
+            "throughput_ratio": ratio(result["throughput_per_s"], old["throughput_per_s"]),
+            "peak_rss_ratio": ratio(result["peak_rss_mb"], old["peak_rss_mb"]),
+        })
+    return rows
+
+def plan(args):
+    """(case, rows, params) for every case selected on the command line"""
+    smallest = min(args.rows)
+    planned = []
+    for rows in args.rows:
+        planned.append(("job_index.build", rows, {"rows": rows}))
+        planned.append(("find_job_matches", rows, {"rows": rows, "queries": args.queries}))
+    for pages in args.pdf_pages:
+        planned.append(("extract_text_from_pdf", smallest, {"pages": pages, "repeat": args.pdf_repeat}))
+    planned += [
+        ("extract_skills_locally", smallest, {"samples": args.samples}),
+        ("score_resume_locally", smallest, {"samples": args.samples}),
+        ("compact_job_description", smallest, {"samples": args.samples}),
+        ("analyze_resume", smallest, {"calls": args.gemini_calls, "ttft": args.gemini_ttft, "cached": False}),
+        ("analyze_resume", smallest, {"calls": args.gemini_calls, "ttft": args.gemini_ttft, "cached": True}),
+        ("analyze_resume_structured", smallest, {"calls": args.gemini_calls, "ttft": args.gemini_ttft}),
+        ("fetch_jobs_pages", smallest, {"pages": args.jsearch_pages, "latency": args.jsearch_latency,
+                                        "repeat": args.fetch_repeat}),
+        ("build_job_cards", smallest, {"jobs": args.card_jobs, "repeat": args.card_repeat}),
+        ("render_job_results", smallest, {"jobs": args.card_jobs, "reruns": args.render_reruns}),
+    ]
+    return [item for item in planned if not args.cases or item[0] in args.cases]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000], help="Synthetic corpus sizes")
+    parser.add_argument("--cases", nargs="*", choices=list(CASES), help="Only run these cases")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--samples", type=int, default=500, help="Resumes or JDs per text-processing case")
+    parser.add_argument("--pdf-pages", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--pdf-repeat", type=int, default=10)
+    parser.add_argument("--gemini-calls", type=int, default=30)
+    parser.add_argument("--gemini-ttft", type=float, default=0.05, help="Mock Gemini time to first chunk (seconds)")
+    parser.add_argument("--jsearch-pages", type=int, default=10)
+    parser.add_argument("--jsearch-latency", type=float, default=0.05, help="Mock JSearch latency (seconds)")
+    parser.add_argument("--fetch-repeat", type=int, default=5)
+    parser.add_argument("--card-jobs", type=int, default=1000)
+    parser.add_argument("--card-repeat", type=int, default=10)
+    parser.add_argument("--render-reruns", type=int, default=10)
+    parser.add_argument("--workdir", help="Scratch directory (kept); defaults to a temporary one")
+    parser.add_argument("--out", help="Report path, defaults to benchmarks/results/<commit>.json")
+    parser.add_argument("--compare", help="Earlier report to compare against")
+    args = parser.parse_args()
+
+    from benchmarks.synthetic import write_job_skills_csv
+
+    revision = git_revision()
+    workdir = args.workdir or tempfile.mkdtemp(prefix="resume-bench-")
+    corpus_seconds = {}
+    results = []
+    try:
+        for name, rows, params in plan(args):
+            case_dir = os.path.join(workdir, f"rows_{rows}")
+            csv_path = os.path.join(case_dir, "data", "cleaned_job_skills.csv")
+            if not os.path.exists(csv_path):
+                os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+                start = time.perf_counter()
+                write_job_skills_csv(csv_path, rows)
+                corpus_seconds[rows] = round(time.perf_counter() - start, 2)
+            print(f"▶ {name} {json.dumps(params)}", file=sys.stderr)
+            result = run_isolated(name, case_dir, params)
+            if "error" in result:
+                print(f"  ⚠️ {result['error']}", file=sys.stderr)
+            else:
+                print(f"  p50 {result['latency_ms']['p50']} ms, {result['throughput_per_s']}/s, "
+                      f"peak RSS {result['peak_rss_mb']} MB", file=sys.stderr)
+            results.append(result)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "revision": revision,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "corpus_seconds": corpus_seconds,
+        "results": results,
+    }
+    if args.compare:
+        report["comparison"] = {"baseline": args.compare, "cases": compare(results, args.compare)}
+
+    out_path = args.out or os.path.join(DEFAULT_RESULTS_DIR, f"{revision}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report.get("comparison", {"results": len(results), "output": out_path}), indent=2))
+
+if __name__ == "__main__":
+    main()
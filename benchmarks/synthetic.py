@@ -0,0 +1,149 @@
+"""
+Synthetic inputs for the benchmarks: job skill corpora, resumes and job descriptions
+
+Skills are drawn from a fixed vocabulary (common real skills followed by a
+long tail of generated tool names) with Zipf-like frequencies, so index sizes,
+posting list lengths and query selectivity resemble the real corpus.
+
+Usage:
+    python -m benchmarks.synthetic --rows 1000000 --out data/cleaned_job_skills.csv
+"""
+import argparse
+import csv
+import numpy as np
+from benchmarks.pdf_benchmark import make_synthetic_pdf
+
+COMMON_SKILLS = [
+    "Python", "SQL", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust", "Scala", "R", "Excel",
+    "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "Statistics", "Data Analysis", "Pandas",
+    "NumPy", "scikit-learn", "TensorFlow", "PyTorch", "Spark", "Hadoop", "Kafka", "Airflow", "dbt", "Snowflake",
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Linux", "Git", "CI/CD", "Jenkins", "REST APIs",
+    "GraphQL", "React", "Angular", "Vue", "Node.js", "Django", "Flask", "Spring Boot", "PostgreSQL", "MySQL",
+    "MongoDB", "Redis", "Elasticsearch", "Tableau", "Power BI", "Looker", "Agile", "Scrum", "Jira",
+    "Project Management", "Product Management", "Communication", "Leadership", "Customer Service",
+    "Time Management", "Problem Solving", "Teamwork", "Salesforce", "SAP", "ERP", "Six Sigma", "Lean",
+    "Accounting", "Payroll", "Budgeting", "Forecasting", "Marketing", "SEO", "Content Writing", "Sales",
+    "Negotiation", "Patient Care", "Nursing", "Recruiting", "Training", "Quality Assurance", "Selenium",
+    "Microservices", "System Design", "Networking", "Cybersecurity", "Figma", "UX Design",
+]
+VOCABULARY_SIZE = 5000
+SKILLS_PER_POSTING = (5, 25)
+ZIPF_EXPONENT = 1.1
+
+EEO_STATEMENT = (
+    "We are an equal opportunity employer. All qualified applicants will receive consideration for employment "
+    "without regard to race, color, religion, sex, sexual orientation, gender identity, national origin, "
+    "disability or protected veteran status."
+)
+BENEFITS = [
+    "Competitive salary and stock options",
+    "Health insurance, dental insurance and vision insurance",
+    "401(k) matching",
+    "Paid time off and parental leave",
+]
+
+def skill_vocabulary(size=VOCABULARY_SIZE):
+    """Common skills followed by generated tool names, most frequent first"""
+    return COMMON_SKILLS + [f"Tool{i}" for i in range(size - len(COMMON_SKILLS))]
+
+def skill_probabilities(size=VOCABULARY_SIZE, exponent=ZIPF_EXPONENT):
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return weights / weights.sum()
+
+def sample_skill_lists(rng, count, vocabulary=None, probabilities=None):
+    """
+    Random skill lists, one per posting
+
+    Args:
+        rng: numpy Generator
+        count: Number of lists
+        vocabulary: Skill names, defaults to skill_vocabulary()
+        probabilities: Draw probabilities, defaults to skill_probabilities()
+
+    Returns:
+        List of lists of skill names (no duplicates within a list)
+    """
+    vocabulary = vocabulary or skill_vocabulary()
+    probabilities = skill_probabilities(len(vocabulary)) if probabilities is None else probabilities
+    sizes = rng.integers(SKILLS_PER_POSTING[0], SKILLS_PER_POSTING[1] + 1, size=count)
+    draws = rng.choice(len(vocabulary), size=int(sizes.sum()), p=probabilities)
+    return [
+        [vocabulary[i] for i in dict.fromkeys(chunk.tolist())]
+        for chunk in np.split(draws, np.cumsum(sizes)[:-1])
+    ]
+
+def write_job_skills_csv(path, rows, seed=0, chunk_rows=100_000):
+    """
+    Write a corpus in the format of cleaned_job_skills.csv, in chunks
+
+    Args:
+        path: Output CSV path
+        rows: Number of postings
+        seed: Random seed
+        chunk_rows: Postings generated per chunk (bounds memory for millions of rows)
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = skill_vocabulary()
+    probabilities = skill_probabilities(len(vocabulary))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["job_link", "job_skills"])
+        for start in range(0, rows, chunk_rows):
+            count = min(chunk_rows, rows - start)
+            skill_lists = sample_skill_lists(rng, count, vocabulary, probabilities)
+            writer.writerows(
+                (f"https://example.com/jobs/{start + i}", ", ".join(skills))
+                for i, skills in enumerate(skill_lists)
+            )
+
+def resume_text(skills, years=6):
+    """Resume-like text with the usual sections, mentioning the given skills"""
+    return "\n".join([
+        "Jane Doe",
+        "Summary",
+        f"Engineer with {years} years of experience delivering data and software projects.",
+        "Experience",
+        f"Senior Engineer, Acme Corp 2021 - Present",
+        *(f"- Delivered production systems using {skill}." for skill in skills[: len(skills) // 2]),
+        f"Engineer, Initech {2021 - years} - 2021",
+        *(f"- Built and maintained services with {skill}." for skill in skills[len(skills) // 2:]),
+        "Education",
+        "B.S. Computer Science",
+        "Skills",
+        ", ".join(skills),
+    ])
+
+def job_description_text(skills, years=5, repeats=1):
+    """Job description with requirements plus EEO and benefits boilerplate"""
+    requirements = [f"- {years}+ years of experience with {skills[0]}"] + [
+        f"- Experience with {skill}" for skill in skills[1:]
+    ]
+    section = "\n".join([
+        "About us",
+        "We are a fast-growing company with offices in 12 countries and a culture of innovation and collaboration.",
+        "Responsibilities",
+        "- Design, build and own production services end to end",
+        "Requirements",
+        *requirements,
+        "- Bachelor's degree in Computer Science or a related field",
+        "Benefits",
+        *(f"- {benefit}" for benefit in BENEFITS),
+        EEO_STATEMENT,
+    ])
+    return "\n".join([section] * repeats)
+
+def resume_pdf(num_pages):
+    """Multi-page text PDF bytes (same generator as the PDF benchmark)"""
+    return make_synthetic_pdf(num_pages)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="data/cleaned_job_skills.csv")
+    args = parser.parse_args()
+    write_job_skills_csv(args.out, args.rows, args.seed)
+    print(f"✅ {args.rows} synthetic postings -> {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,98 @@
+import html
 import streamlit as st
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from utils.pdf_utils import extract_text_from_pdf
-from modules.resume_analyzer import extract_skills_from_text
+from utils.job_index import get_job_index, top_n_indices
+from utils.ann_index import get_match_backend
+from utils.job_warehouse import get_live_index
+from modules.resume_features import get_resume_skills
 
-def find_job_matches(user_skills, top_n=5):
+def _format_matches(job_index, indices, scores):
+    """Turn top-N positions and scores into the job matches DataFrame"""
+    # Only the top rows are read from the memory-mapped job store
+    top_jobs = job_index.jobs.take(indices, ['job_link', 'job_skills'])
+    top_jobs['similarity_score'] = scores
+    top_jobs['similarity_percentage'] = (scores * 100).round(2)
+    return top_jobs
+
+def match_batch(queries, top_n=5):
     """
-    Find job matches based on user skills using TF-IDF and cosine similarity
+    Find job matches for many skill strings at once
+    
+    All queries are scored against the job matrix in one chunked pass, so
+    re-ranking thousands of stored resumes needs no refit and no Python loop
+    over the corpus.
     
+    Args:
+        queries: List of comma-separated skill strings
+        top_n: Number of top matches to return per query
+        
+    Returns:
+        List of DataFrames with top matching jobs, one per query
+    """
+    job_index = get_job_index()
+    indices, scores = job_index.search(list(queries), top_n)
+    return [_format_matches(job_index, row_indices, row_scores) for row_indices, row_scores in zip(indices, scores)]
+
+def _merge_live_matches(matches, user_skills, top_n):
+    """Add the best postings from the live warehouse index and keep the overall top-N"""
+    live_index = get_live_index()
+    positions, scores = live_index.score_candidates(user_skills)
+    if not len(positions):
+        return matches
+    top = top_n_indices(scores, top_n)
+    live_matches = live_index.take(positions[top])
+    # take() skips ids missing from the warehouse, so align scores by posting id
+    top_scores = pd.Series(scores[top], index=live_index.ids[positions[top]])
+    live_matches['similarity_score'] = top_scores.reindex(live_matches.index).to_numpy()
+    live_matches['similarity_percentage'] = (live_matches['similarity_score'] * 100).round(2)
+    live_matches['source'] = 'live'
+    matches = pd.concat([matches.assign(source='database'), live_matches])
+    return matches.sort_values('similarity_score', ascending=False, kind='stable').head(top_n)
+
+def match_jobs(user_skills, top_n=5, include_live=True):
+    """
+    Find job matches based on user skills using TF-IDF and cosine similarity
+    over normalized skills
+
     Args:
         user_skills: Comma-separated string of user skills
         top_n: Number of top matches to return
-        
+        include_live: Whether to also search postings ingested from job searches
+
     Returns:
         DataFrame with top matching jobs
+
+    Raises:
+        Exception: If the job index cannot be loaded or searched
     """
-    try: 
-        #df = pd.read_csv("/Users/chinku/git/ATS_AI_Proj/cleaned_job_skills.csv")
-        df = pd.read_csv("data/cleaned_job_skills.csv")
+    # The index is built offline (python -m utils.job_index) and loaded once per
+    # process; it is rebuilt automatically when the CSV changes
+    job_index = get_job_index()
+    # Prune through the inverted skill index (or the ANN backend selected by
+    # JOB_MATCH_BACKEND), then score only the survivors exactly
+    rows, similarities = get_match_backend(job_index).score_candidates(user_skills)
+    top = top_n_indices(similarities, top_n)
+    matches = _format_matches(job_index, rows[top], similarities[top])
+    if include_live:
+        # Postings saved from real-time searches, scored in the same vector space
+        matches = _merge_live_matches(matches, user_skills, top_n)
+    return matches
 
-        df_cleaned = df.dropna(subset=['job_skills'])
-        vectorizer = TfidfVectorizer()
-        job_skill_vectors = vectorizer.fit_transform(df_cleaned['job_skills'])
-        user_vector = vectorizer.transform([user_skills])
-        similarities = cosine_similarity(user_vector, job_skill_vectors).flatten()
-        top_indices = similarities.argsort()[-top_n:][::-1]
-        top_jobs = df_cleaned.iloc[top_indices][['job_link', 'job_skills']]
-        top_jobs['similarity_score'] = similarities[top_indices]
-        top_jobs['similarity_percentage'] = (similarities[top_indices] * 100).round(2)
-    
-        return top_jobs
+def find_job_matches(user_skills, top_n=5, include_live=True):
+    """
+    match_jobs for the UI: errors are shown with st.error
+
+    Args:
+        user_skills: Comma-separated string of user skills
+        top_n: Number of top matches to return
+        include_live: Whether to also search postings ingested from job searches
+        
+    Returns:
+        DataFrame with top matching jobs, empty on error
+    """
+    try:
+        return match_jobs(user_skills, top_n, include_live)
     except Exception as e:
         st.error(f"Error finding job matches: {e}")
         return pd.DataFrame()
@@ -45,18 +107,20 @@ def render_job_matching_tab():
     with col1:
         st.markdown("### Upload Resume for Skills")
         job_match_file = st.file_uploader("Upload Resume PDF", type=["pdf"], key="job_match_upload", label_visibility="collapsed")
+        enhance_skills = st.checkbox("✨ Enhance skill extraction with AI", value=False, key="enhance_skills",
+                                     help="Skills are matched locally against our job database; this also asks Gemini")
         
         # Check if we came from the analysis tab with a resume
         if 'resume_text' in st.session_state and job_match_file is None:
             st.info("Using the resume you already uploaded.")
-            extracted_skills = extract_skills_from_text(st.session_state.resume_text)
+            extracted_skills = get_resume_skills(st.session_state.resume_text, enhance=enhance_skills)
             st.success("✅ Skills extracted from your resume")
         elif job_match_file is not None:
             st.success("✅ Resume uploaded for job matching")
             resume_text = extract_text_from_pdf(job_match_file)
             if resume_text:
                 with st.spinner("Extracting skills from resume..."):
-                    extracted_skills = extract_skills_from_text(resume_text)
+                    extracted_skills = get_resume_skills(resume_text, enhance=enhance_skills)
     
     with col2:
         st.markdown("### Or Enter Your Skills Manually")
@@ -88,12 +152,22 @@ def render_job_matching_tab():
                 if not matches.empty:
                     st.markdown('<div class="sub-header">Top Job Matches</div>', unsafe_allow_html=True)
                     
-                    for idx, row in matches.iterrows():
+                    # The index is a store row or live posting id, so number by rank
+                    for rank, (_, row) in enumerate(matches.iterrows(), start=1):
+                        # Live postings come straight from JSearch, so escape before rendering as HTML
+                        fresh_posting = ""
+                        if row.get('source') == 'live':
+                            fresh_posting = (
+                                f"<p><strong>🆕 {html.escape(str(row['job_title']))}</strong> at "
+                                f"{html.escape(str(row['employer_name']))} ({html.escape(str(row['location']))})</p>"
+                            )
+                        job_link = html.escape(str(row['job_link']))
                         st.markdown(f"""
                         <div class="job-match">
-                            <h4>Match #{idx+1} - {row['similarity_percentage']}% Match</h4>
-                            <p><strong>Job Link:</strong> <a href="{row['job_link']}" target="_blank">{row['job_link']}</a></p>
-                            <p><strong>Required Skills:</strong> {row['job_skills']}</p>
+                            <h4>Match #{rank} - {row['similarity_percentage']}% Match</h4>
+                            {fresh_posting}
+                            <p><strong>Job Link:</strong> <a href="{job_link}" target="_blank">{job_link}</a></p>
+                            <p><strong>Required Skills:</strong> {html.escape(str(row['job_skills']))}</p>
                         </div>
                         """, unsafe_allow_html=True)
                 else:
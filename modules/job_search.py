@@ -1,63 +1,86 @@
-import streamlit as st
 import time
-from datetime import datetime, timezone
-from dateutil import parser
+import streamlit as st
 from utils.api_utils import fetch_jobs_api, fetch_salary_estimate
+from utils.jsearch_client import collect_jobs, fetch_jobs_pages
+from utils.job_cards import SORT_OPTIONS, build_job_cards, sort_job_cards
+from utils.job_warehouse import ingest_postings
+from utils.metrics import record_metric
 from utils.pdf_utils import extract_text_from_pdf
 from modules.resume_analyzer import extract_skills_from_text
+from modules.resume_features import extract_job_title_from_resume, get_resume_job_title
+
+# Job cards rendered per page of search results
+JOBS_PER_PAGE = 10
 
-def format_posted_date(posted_date):
+def render_job_card(card):
     """
-    Format the job posted date to a human-readable format
+    Render one job posting as a card
     
     Args:
-        posted_date: ISO date string
-        
-    Returns:
-        Human-readable date string (e.g., "Today", "Yesterday", "3 days ago")
+        card: JobCard built by build_job_cards (nothing is formatted here)
     """
-    try:
-        date_obj = parser.parse(posted_date)
-        now = datetime.now(timezone.utc)
-        
-        # Calculate days ago
-        days_ago = (now - date_obj).days
-        if days_ago == 0:
-            return "Today"
-        elif days_ago == 1:
-            return "Yesterday"
-        else:
-            return f"{days_ago} days ago"
-    except:
-        # If date parsing fails, keep the original
-        return "Recently"
+    with st.container():
+        # Card styling comes from the .job-card rule in load_css, injected once per page
+        st.markdown(f"<div class='job-card'>", unsafe_allow_html=True)
+
+        # Header lines go out as one markdown element rather than one per line
+        header_lines = [
+            f"### {card.title}",
+            f"**{card.company}** • {card.location} • {card.job_type}",
+            f"Posted: {card.posted_label}",
+        ]
+        if card.salary_text:
+            header_lines.append(f"**Salary:** {card.salary_text}")
+        st.markdown("\n\n".join(header_lines))
+
+        with st.expander("Job Description"):
+            st.markdown(card.description)
+
+        # Apply button
+        col1, col2 = st.columns([3, 1])
+        with col2:
+            st.markdown(f"[Apply Now]({card.apply_link})")
 
-def extract_job_title_from_resume(resume_text):
+        st.markdown("</div>", unsafe_allow_html=True)
+
+def _set_results_page(page):
+    st.session_state.job_results_page = page
+
+def render_job_results(jobs):
     """
-    Extract the most recent job title from resume text
-    This is a simplified implementation that could be enhanced with ML
+    Render the visible page of a cached result set, with pagination controls
+    
+    Only JOBS_PER_PAGE cards are sent to the browser per rerun, however many
+    jobs were fetched.
     
     Args:
-        resume_text: Full text of the resume
-        
-    Returns:
-        Estimated job title
+        jobs: JobCard records from build_job_cards
     """
-    # This is a very basic implementation - in a real app, you'd use a more sophisticated approach
-    common_titles = [
-        "Software Engineer", "Data Scientist", "Product Manager", "Data Analyst",
-        "Web Developer", "Front End Developer", "Back End Developer", "Full Stack Developer",
-        "UI/UX Designer", "Project Manager", "Business Analyst", "Marketing Manager"
-    ]
+    start = time.perf_counter()
+    num_pages = max(1, (len(jobs) + JOBS_PER_PAGE - 1) // JOBS_PER_PAGE)
+    page = min(max(st.session_state.get("job_results_page", 0), 0), num_pages - 1)
+    first = page * JOBS_PER_PAGE
+    visible = jobs[first:first + JOBS_PER_PAGE]
     
-    # Find which titles appear in the resume
-    found_titles = [title for title in common_titles if title.lower() in resume_text.lower()]
+    for job in visible:
+        render_job_card(job)
     
-    if found_titles:
-        return found_titles[0]
-    else:
-        # Default fallback
-        return "Software Engineer"
+    if num_pages > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            st.button("← Previous", key="job_results_prev", disabled=page == 0,
+                      on_click=_set_results_page, args=(page - 1,), use_container_width=True)
+        with col2:
+            st.markdown(
+                f"<div style='text-align: center'>Page {page + 1} of {num_pages} "
+                f"(jobs {first + 1}-{first + len(visible)} of {len(jobs)})</div>",
+                unsafe_allow_html=True,
+            )
+        with col3:
+            st.button("Next →", key="job_results_next", disabled=page == num_pages - 1,
+                      on_click=_set_results_page, args=(page + 1,), use_container_width=True)
+    
+    record_metric("render.job_search", seconds=time.perf_counter() - start, cards=len(visible), total_jobs=len(jobs))
 
 def render_job_search_tab():
     """Render the real-time job search tab in the Streamlit UI"""
@@ -73,7 +96,7 @@ def render_job_search_tab():
         
         # Check if we have a resume from a previous tab
         if 'resume_text' in st.session_state:
-            default_job_title = extract_job_title_from_resume(st.session_state.resume_text)
+            default_job_title = get_resume_job_title(st.session_state.resume_text)
         
         job_role = st.text_input("Job Title", value=default_job_title, label_visibility="collapsed")
     
@@ -105,7 +128,7 @@ def render_job_search_tab():
                 resume_text = extract_text_from_pdf(job_search_file)
                 if resume_text:
                     st.session_state.resume_text = resume_text
-                    job_title_suggestion = extract_job_title_from_resume(resume_text)
+                    job_title_suggestion = get_resume_job_title(resume_text)
                     st.success(f"✅ Resume analyzed. Suggested job title: {job_title_suggestion}")
     
     # Check if we should automatically trigger a search (from another tab)
@@ -118,137 +141,59 @@ def render_job_search_tab():
         if not job_role.strip():
             st.error("⚠️ Please enter a job title")
         else:
+            # Calculate pages needed (10 results per page from the API)
+            pages_needed = (results_count + 9) // 10  # Ceiling division
+            
+            progress_bar = st.progress(0)
+            progress_text = st.empty()
+            first_results = st.empty()
+            pages_done = []
+            
+            def show_page(page, result):
+                pages_done.append(page)
+                progress_bar.progress(len(pages_done) / pages_needed)
+                progress_text.text(f"Fetched {len(pages_done)} of {pages_needed} pages...")
+                if page == 1 and isinstance(result, list):
+                    # Show the first results while the remaining pages are still loading
+                    with first_results.container():
+                        for card in build_job_cards(result[:min(JOBS_PER_PAGE, results_count)]):
+                            render_job_card(card)
+            
             with st.spinner(f"Searching for {job_role} jobs in {job_location}..."):
-                # Calculate pages needed (10 results per page from the API)
-                pages_needed = (results_count + 9) // 10  # Ceiling division
-                all_jobs = []
-                
-                progress_bar = st.progress(0)
-                
-                # Fetch multiple pages if needed
-                for page in range(1, pages_needed + 1):
-                    progress_text = st.empty()
-                    progress_text.text(f"Fetching page {page} of {pages_needed}...")
-                    
-                    # Fetch jobs from JSearch API
-                    new_jobs = fetch_jobs_api(job_role, job_location, remote_only, page)
-                    
-                    if isinstance(new_jobs, dict) and "error" in new_jobs:
-                        st.error(new_jobs["error"])
-                        break
-                    
-                    if not new_jobs:
-                        # No more results
-                        break
-                    
-                    all_jobs.extend(new_jobs)
-                    progress_bar.progress(page / pages_needed)
-                    
-                    # Don't overwhelm the API
-                    if page < pages_needed:
-                        time.sleep(1)
-                
-                # Limit to requested number
-                all_jobs = all_jobs[:results_count]
-                progress_bar.progress(100)
-                
-                if all_jobs:
-                    st.success(f"Found {len(all_jobs)} job listings")
-                    
-                    # Display results
-                    for i, job in enumerate(all_jobs):
-                        with st.container():
-                            # Create a card-like container for each job
-                            st.markdown("""
-                            <style>
-                            .job-card {
-                                border: 1px solid #ddd;
-                                border-radius: 8px;
-                                padding: 15px;
-                                margin-bottom: 15px;
-                                background-color: #f9f9f9;
-                            }
-                            </style>
-                            """, unsafe_allow_html=True)
-                            
-                            st.markdown(f"<div class='job-card'>", unsafe_allow_html=True)
-                            
-                            # Extract job details
-                            title = job.get("job_title", "Unknown Position")
-                            company = job.get("employer_name", "Unknown Company")
-                            
-                            # Handle location data safely
-                            job_city = job.get("job_city", "")
-                            job_state = job.get("job_state", "")
-                            
-                            # Handle None values for location fields
-                            job_city = "" if job_city is None else job_city
-                            job_state = "" if job_state is None else job_state
-                                
-                            location = ""
-                            if job_city or job_state:
-                                location = f"{job_city}, {job_state}".strip().rstrip(',').lstrip(',')
-                            else:
-                                location = job.get("job_country", "Remote")
-                                
-                            job_type = job.get("job_employment_type", "Full-time")
-                            posted_date = job.get("job_posted_at_datetime_utc", "Recently")
-                            job_url = job.get("job_apply_link", "")
-                            
-                            # Format date
-                            posted_date_formatted = format_posted_date(posted_date)
-                            
-                            # Display job information
-                            st.markdown(f"### {title}")
-                            st.markdown(f"**{company}** • {location} • {job_type}")
-                            st.markdown(f"Posted: {posted_date_formatted}")
-                            
-                            # Display salary if available
-                            if job.get("job_min_salary") or job.get("job_max_salary"):
-                                min_salary = job.get("job_min_salary", "")
-                                max_salary = job.get("job_max_salary", "")
-                                salary_currency = job.get("job_salary_currency", "$")
-                                salary_period = job.get("job_salary_period", "YEAR")
-                                
-                                # Format salary period
-                                if salary_period == "YEAR":
-                                    period_text = "/year"
-                                elif salary_period == "MONTH":
-                                    period_text = "/month"
-                                elif salary_period == "HOUR":
-                                    period_text = "/hour"
-                                else:
-                                    period_text = ""
-                                
-                                # Display salary range
-                                if min_salary and max_salary:
-                                    salary_text = f"{salary_currency}{int(min_salary):,} - {salary_currency}{int(max_salary):,}{period_text}"
-                                elif min_salary:
-                                    salary_text = f"From {salary_currency}{int(min_salary):,}{period_text}"
-                                elif max_salary:
-                                    salary_text = f"Up to {salary_currency}{int(max_salary):,}{period_text}"
-                                else:
-                                    salary_text = ""
-                                
-                                if salary_text:
-                                    st.markdown(f"**Salary:** {salary_text}")
-                            
-                            # Description (truncated)
-                            description = job.get("job_description", "No description available.")
-                            if len(description) > 500:
-                                description = description[:500] + "..."
-                            
-                            with st.expander("Job Description"):
-                                st.markdown(description)
-                            
-                            # Apply button
-                            col1, col2 = st.columns([3, 1])
-                            with col2:
-                                st.markdown(f"[Apply Now]({job_url})")
-                            
-                            st.markdown("</div>", unsafe_allow_html=True)
-                else:
-                    st.warning("No job listings found. Try different search terms or location.")
+                # Pages are fetched concurrently under the shared JSearch rate limit
+                page_results = fetch_jobs_pages(job_role, job_location, remote_only, pages_needed, on_page=show_page)
+            
+            progress_text.empty()
+            progress_bar.progress(100)
+            first_results.empty()
+            
+            # Limit to requested number
+            all_jobs, error = collect_jobs(page_results)
+            all_jobs = all_jobs[:results_count]
+            
+            # Formatted once and kept in the session, so paging never refetches or reformats
+            st.session_state.job_search_results = {"jobs": build_job_cards(all_jobs), "error": error}
+            st.session_state.job_results_page = 0
+            
+            if all_jobs:
+                # Keep the postings so the Job Matching tab can search them locally
+                try:
+                    ingest_postings(all_jobs)
+                except Exception as e:
+                    st.caption(f"⚠️ Could not save these postings for job matching: {e}")
+    
+    results = st.session_state.get("job_search_results")
+    if results:
+        if results["error"]:
+            st.error(results["error"])
+        
+        if results["jobs"]:
+            st.success(f"Found {len(results['jobs'])} job listings")
+            sort_by = st.selectbox("Sort by", SORT_OPTIONS, key="job_results_sort",
+                                   on_change=_set_results_page, args=(0,))
+            render_job_results(sort_job_cards(results["jobs"], sort_by))
+        elif not results["error"]:
+            st.warning("No job listings found. Try different search terms or location.")
 
 def render_salary_tab():
     """Render the salary estimate tab in the Streamlit UI"""
@@ -1,7 +1,18 @@
 import streamlit as st
 import base64
-from utils.pdf_utils import input_pdf_setup
+import itertools
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.pdf_utils import get_parsed_resume, input_pdf_setup
 from utils.api_utils import get_gemini_response
+from utils.skill_extractor import extract_skills_locally, merge_skill_lists
+from utils.ats_scorer import CATEGORY_POINTS, score_resume_locally
+from utils.structured_output import (
+    ANALYSIS_SCHEMAS, ATSReport, MatchPercentage, get_structured_response, record_to_dict, record_to_markdown,
+)
+from utils.prompt_budget import budget_job_description, prompt_tokens
+from utils.metrics import metric_names, summarize_metric, summarize_metric_by
 
 # Define prompt templates
 PROMPT_TEMPLATES = {
@@ -45,25 +56,235 @@ PROMPT_TEMPLATES = {
     """
 }
 
-def analyze_resume(analysis_type, pdf_content, job_description):
+# Narrative for a score computed locally by score_resume_locally; the breakdown is appended
+ATS_NARRATIVE_PROMPT = """
+    You are an advanced ATS (Applicant Tracking System) analyzer specializing in resume evaluation.
+    The resume has already been scored against the job description; the breakdown is given below.
+    Do not compute a new score. Explain the main reasons behind each category score and give
+    a list of concrete, prioritized improvements to increase the ATS score.
+    Format your response clearly with section headers and make it visually scannable.
+    """
+
+# Narrative for a match percentage computed locally (the overall local ATS score)
+MATCH_NARRATIVE_PROMPT = """
+    You are a skilled ATS (Applicant Tracking System) scanner.
+    The resume has already been matched against the job description; the match percentage is the
+    overall score below, followed by its breakdown and the missing keywords.
+    Do not compute a new percentage. Comment on the most important missing keywords and give your
+    final thoughts on how well the candidate fits the role.
+    """
+
+# Analyses whose score is computed locally: metric name suffix and prompt of the Gemini narrative
+LOCAL_SCORE_NARRATIVES = {
+    "ats_score": ("ats_narrative", ATS_NARRATIVE_PROMPT),
+    "match_percentage": ("match_narrative", MATCH_NARRATIVE_PROMPT),
+}
+
+# Analyses run together by the "Full Report" action, in display order
+FULL_REPORT_ANALYSES = {
+    "resume_review": "Resume Review",
+    "skills_improvement": "Skills Improvement",
+    "match_percentage": "Match Percentage",
+    "ats_score": "ATS Score Check",
+}
+
+# Upper bound on concurrent Gemini calls from one Full Report
+FULL_REPORT_MAX_WORKERS = 4
+
+def prepare_job_description(analysis_type, prompt, pdf_content, job_description):
+    """
+    Fit the job description into the prompt budget before a Gemini call
+    
+    Args:
+        analysis_type: Analysis the request is for
+        prompt: Prompt text of the request
+        pdf_content: Processed PDF content
+        job_description: Job description text as pasted
+        
+    Returns:
+        Tuple (job description to send, metric fields for the Gemini call)
+    """
+    job_description, stats = budget_job_description(job_description, analysis_type)
+    tokens_saved = stats["original_tokens"] - stats["compacted_tokens"]
+    return job_description, {
+        "prompt_tokens": prompt_tokens(prompt, pdf_content, job_description),
+        "jd_tokens_saved": tokens_saved,
+        "jd_compacted": tokens_saved > 0,
+    }
+
+def _local_score(analysis_type, resume_text, job_description, ats_score):
+    if ats_score is not None:
+        return ats_score
+    if resume_text is None:
+        raise ValueError(f"{analysis_type} is scored locally and needs the resume text")
+    return score_resume_locally(resume_text, job_description)
+
+def _narrative_prompt(analysis_type, ats_score):
+    narrative_type, prompt = LOCAL_SCORE_NARRATIVES[analysis_type]
+    return narrative_type, f"{prompt}\nScore breakdown:\n{ats_score.summary()}\n"
+
+def local_score_markdown(analysis_type, ats_score):
+    """
+    Markdown of a locally computed score, shown above Gemini's narrative
+    
+    Args:
+        analysis_type: Key of LOCAL_SCORE_NARRATIVES
+        ats_score: ATSScore from score_resume_locally
+        
+    Returns:
+        Markdown text
+    """
+    if analysis_type == "ats_score":
+        return ats_score.summary()
+    lines = [f"Match percentage: {ats_score.total}%"]
+    if ats_score.missing_keywords:
+        lines.append(f"Missing keywords: {', '.join(ats_score.missing_keywords)}")
+    if ats_score.missing_skills:
+        lines.append(f"Missing skills: {', '.join(ats_score.missing_skills)}")
+    return "\n".join(lines)
+
+def analyze_resume(analysis_type, pdf_content, job_description, stream=False, timing=None, resume_text=None,
+                   ats_score=None):
     """
     Analyze resume based on the selected analysis type
     
+    ATS score and match percentage are scored locally (score_resume_locally);
+    Gemini only writes their narrative, which follows the local score.
+    
     Args:
         analysis_type: Type of analysis to perform
         pdf_content: Processed PDF content
         job_description: Job description text
+        stream: Return a generator of text chunks instead of the full text
+        timing: Optional dict filled with this call's timings once it completes
+        resume_text: Resume text, needed for the locally scored analyses
+        ats_score: Local score if already computed, instead of resume_text
         
     Returns:
-        Analysis results from Gemini
+        Analysis results from Gemini (a chunk generator if stream is True)
     """
+    if analysis_type in LOCAL_SCORE_NARRATIVES:
+        ats_score = _local_score(analysis_type, resume_text, job_description, ats_score)
+        score = local_score_markdown(analysis_type, ats_score)
+        narrative = analyze_score_narrative(analysis_type, ats_score, pdf_content, job_description, stream, timing)
+        if stream:
+            return itertools.chain([f"{score}\n\n"], narrative)
+        return f"{score}\n\n{narrative}"
+    
     prompt = PROMPT_TEMPLATES.get(analysis_type)
     if not prompt:
-        return "Invalid analysis type"
+        return iter(["Invalid analysis type"]) if stream else "Invalid analysis type"
     
-    return get_gemini_response(prompt, pdf_content, job_description)
+    job_description, metric_fields = prepare_job_description(analysis_type, prompt, pdf_content, job_description)
+    return get_gemini_response(
+        prompt, pdf_content, job_description, stream=stream, metric_name=f"gemini.{analysis_type}",
+        metric_fields=metric_fields, timing=timing,
+    )
 
-def extract_skills_from_text(resume_text):
+def analyze_resume_structured(analysis_type, pdf_content, job_description, resume_text=None, ats_score=None):
+    """
+    Analyze resume in JSON mode, returning a typed record instead of markdown
+    
+    For ATS score and match percentage the scores and missing keywords come
+    from the local score; only the improvements or final thoughts come from Gemini.
+    
+    Args:
+        analysis_type: Analysis type with a schema in ANALYSIS_SCHEMAS
+        pdf_content: Processed PDF content
+        job_description: Job description text
+        resume_text: Resume text, needed for the locally scored analyses
+        ats_score: Local score if already computed, instead of resume_text
+        
+    Returns:
+        Record instance (ResumeReview, SkillsImprovement, MatchPercentage or ATSReport)
+    """
+    if analysis_type not in ANALYSIS_SCHEMAS:
+        raise ValueError(f"No structured schema for analysis type: {analysis_type}")
+    if analysis_type in LOCAL_SCORE_NARRATIVES:
+        ats_score = _local_score(analysis_type, resume_text, job_description, ats_score)
+        narrative_type, prompt = _narrative_prompt(analysis_type, ats_score)
+        job_description, metric_fields = prepare_job_description(narrative_type, prompt, pdf_content, job_description)
+        narrative = get_structured_response(
+            narrative_type, prompt, pdf_content, job_description, metric_fields=metric_fields
+        )
+        if analysis_type == "ats_score":
+            return ATSReport(
+                overall_score=ats_score.total,
+                keyword_match=ats_score.keyword_match,
+                skills_relevance=ats_score.skills_relevance,
+                experience_match=ats_score.experience_match,
+                education=ats_score.education,
+                improvements=narrative.improvements,
+            )
+        return MatchPercentage(
+            match_percentage=ats_score.total,
+            missing_keywords=tuple(dict.fromkeys(ats_score.missing_skills + ats_score.missing_keywords)),
+            final_thoughts=narrative.final_thoughts,
+        )
+    
+    prompt = PROMPT_TEMPLATES[analysis_type]
+    job_description, metric_fields = prepare_job_description(analysis_type, prompt, pdf_content, job_description)
+    return get_structured_response(analysis_type, prompt, pdf_content, job_description, metric_fields=metric_fields)
+
+def analyze_score_narrative(analysis_type, ats_score, pdf_content, job_description, stream=False, timing=None):
+    """
+    Ask Gemini to explain a locally computed score and suggest improvements
+    
+    Args:
+        analysis_type: Key of LOCAL_SCORE_NARRATIVES ("ats_score" or "match_percentage")
+        ats_score: ATSScore from score_resume_locally
+        pdf_content: Processed PDF content
+        job_description: Job description text
+        stream: Return a generator of text chunks instead of the full text
+        timing: Optional dict filled with this call's timings once it completes
+        
+    Returns:
+        Narrative from Gemini (a chunk generator if stream is True)
+    """
+    narrative, prompt = _narrative_prompt(analysis_type, ats_score)
+    job_description, metric_fields = prepare_job_description(narrative, prompt, pdf_content, job_description)
+    return get_gemini_response(
+        prompt, pdf_content, job_description, stream=stream, metric_name=f"gemini.{narrative}",
+        metric_fields=metric_fields, timing=timing,
+    )
+
+def analyze_resume_full_report(pdf_content, job_description, analysis_types=None, max_workers=FULL_REPORT_MAX_WORKERS,
+                                structured=False, resume_text=None):
+    """
+    Run several analyses concurrently on the same processed resume
+    
+    Args:
+        pdf_content: Processed PDF content, shared by every analysis
+        job_description: Job description text
+        analysis_types: Analysis types to run, defaults to FULL_REPORT_ANALYSES
+        max_workers: Maximum number of concurrent Gemini calls
+        structured: Return typed records (analyze_resume_structured) instead of markdown
+        resume_text: Resume text, needed when ATS score or match percentage is included
+        
+    Yields:
+        Tuples (analysis_type, response, error) in completion order; error is
+        None on success and response is None on failure
+    """
+    analysis_types = list(analysis_types or FULL_REPORT_ANALYSES)
+    analyze = analyze_resume_structured if structured else analyze_resume
+    # Both locally scored analyses share one score
+    ats_score = None
+    if resume_text is not None and any(t in LOCAL_SCORE_NARRATIVES for t in analysis_types):
+        ats_score = score_resume_locally(resume_text, job_description)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(analysis_types)))) as executor:
+        futures = {
+            executor.submit(
+                analyze, analysis_type, pdf_content, job_description, resume_text=resume_text, ats_score=ats_score
+            ): analysis_type
+            for analysis_type in analysis_types
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+def extract_skills_with_gemini(resume_text):
     """
     Extract skills from resume text using Gemini
     
@@ -81,7 +302,93 @@ def extract_skills_from_text(resume_text):
         }
     ]
     
-    return get_gemini_response(prompt, pdf_content, "")
+    return get_gemini_response(prompt, pdf_content, "", metric_name="gemini.extract_skills")
+
+def extract_skills_from_text(resume_text, enhance=False):
+    """
+    Extract skills from resume text
+    
+    Skills are matched locally against the job skills vocabulary, which takes
+    milliseconds and needs no network. Gemini is used when enhance is set
+    (its skills are merged with the local ones) or when nothing is found
+    locally, e.g. because the job database is unavailable.
+    
+    Args:
+        resume_text: Plain text extracted from resume
+        enhance: Also ask Gemini and merge its skills in
+        
+    Returns:
+        Comma-separated list of skills
+    """
+    try:
+        local_skills = extract_skills_locally(resume_text)
+    except Exception:
+        local_skills = []
+    
+    if local_skills and not enhance:
+        return ", ".join(local_skills)
+    
+    gemini_skills = extract_skills_with_gemini(resume_text).split(",")
+    return ", ".join(merge_skill_lists(local_skills, gemini_skills))
+
+def render_local_ats_score(ats_score):
+    """Show the local ATS score, its category breakdown and missing keywords"""
+    st.metric("ATS Score", f"{ats_score.total}/100")
+    columns = st.columns(len(ats_score.categories()))
+    for column, (label, points) in zip(columns, ats_score.categories().items()):
+        column.metric(label, f"{points}/{CATEGORY_POINTS}")
+    if ats_score.missing_keywords:
+        st.markdown(f"**Missing keywords:** {', '.join(ats_score.missing_keywords)}")
+
+def render_local_match_percentage(ats_score):
+    """Show the local match percentage and the job keywords and skills the resume lacks"""
+    st.metric("Match", f"{ats_score.total}%")
+    if ats_score.missing_keywords:
+        st.markdown(f"**Missing keywords:** {', '.join(ats_score.missing_keywords)}")
+    if ats_score.missing_skills:
+        st.markdown(f"**Missing skills:** {', '.join(ats_score.missing_skills)}")
+
+def render_payload_stats():
+    """Show Gemini latency and request size per payload mode, and job description savings, for this process"""
+    rows = []
+    for name in metric_names():
+        if not name.startswith("gemini."):
+            continue
+        latency = summarize_metric_by(name, "total_seconds", "payload_mode", exclude={"cached": True})
+        size = summarize_metric_by(name, "payload_bytes", "payload_mode", exclude={"cached": True})
+        for mode, stats in latency.items():
+            rows.append({
+                "Analysis": name.split(".", 1)[1],
+                "Payload": mode,
+                "Requests": stats["count"],
+                "Mean latency (s)": round(stats["mean"], 2),
+                "p95 latency (s)": round(stats["p95"], 2),
+                "Mean size (KB)": round(size[mode]["mean"] / 1024, 1),
+            })
+    if rows:
+        with st.expander("Gemini request stats"):
+            st.dataframe(rows, use_container_width=True)
+    
+    budget_rows = []
+    for name in metric_names():
+        if not name.startswith("jd_budget."):
+            continue
+        analysis = name.split(".", 1)[1]
+        saved = summarize_metric(name, "tokens_saved")
+        latency = summarize_metric_by(f"gemini.{analysis}", "total_seconds", "jd_compacted", exclude={"cached": True})
+        budget_rows.append({
+            "Analysis": analysis,
+            "Requests": saved["count"],
+            "Mean JD tokens": round(summarize_metric(name, "original_tokens")["mean"]),
+            "Mean JD tokens sent": round(summarize_metric(name, "compacted_tokens")["mean"]),
+            "Mean tokens saved": round(saved["mean"]),
+            "Compaction (ms)": round(summarize_metric(name, "seconds")["mean"] * 1000, 1),
+            "Mean latency compacted (s)": round(latency[True]["mean"], 2) if True in latency else None,
+            "Mean latency as pasted (s)": round(latency[False]["mean"], 2) if False in latency else None,
+        })
+    if budget_rows:
+        with st.expander("Job description budget"):
+            st.dataframe(budget_rows, use_container_width=True)
 
 def render_resume_analysis_tab():
     """Render the resume analysis tab in the Streamlit UI"""
@@ -116,6 +423,13 @@ def render_resume_analysis_tab():
         submit2 = st.button("📈 Skills Improvement")
         submit4 = st.button("🔍 ATS Score Check")
 
+    # Run every analysis at once
+    full_report_button = st.button("🧾 Full Report")
+    structured_report = st.checkbox(
+        "Structured results (scores and lists as data)", key="full_report_structured",
+        help="Ask Gemini for JSON, so scores can be compared and the report re-rendered without new calls",
+    )
+
     # Add button for real-time job search
     jobs_button = st.button("🔎 Find Matching Jobs")
 
@@ -138,28 +452,115 @@ def render_resume_analysis_tab():
             elif not input_text.strip():
                 st.error("⚠️ Please enter a job description")
             else:
-                with st.spinner("Analyzing your resume..."):
-                    try:
+                try:
+                    with st.spinner("Analyzing your resume..."):
                         pdf_content = input_pdf_setup(uploaded_file)
-                        response = analyze_resume(analysis_code, pdf_content, input_text)
-                        
-                        st.markdown(f'<div class="sub-header">{analysis_name} Results</div>', unsafe_allow_html=True)
-                        st.markdown(response)
-                        
-                        # Save option
-                        if st.button("📥 Save Results", key="save_results"):
-                            with st.spinner("Preparing download..."):
-                                download_text = f"# {analysis_name} Results\n\n{response}"
-                                st.download_button(
-                                    label="Download Results as Text",
-                                    data=download_text,
-                                    file_name=f"resume_{analysis_code}.txt",
-                                    mime="text/plain",
-                                    key="download_button"
-                                )
-                    except Exception as e:
-                        st.error(f"An error occurred: {e}")
-    
+                    
+                    st.markdown(f'<div class="sub-header">{analysis_name} Results</div>', unsafe_allow_html=True)
+                    # Filled by this call only; the metric store is shared with other sessions
+                    timing = {}
+                    ats_score = None
+                    if analysis_code in LOCAL_SCORE_NARRATIVES:
+                        # The score itself is computed locally and shown at once; Gemini only writes the narrative
+                        start = time.perf_counter()
+                        ats_score = score_resume_locally(get_parsed_resume(uploaded_file).text, input_text)
+                        if analysis_code == "ats_score":
+                            render_local_ats_score(ats_score)
+                        else:
+                            render_local_match_percentage(ats_score)
+                        st.caption(f"Scored locally in {(time.perf_counter() - start) * 1000:.0f} ms")
+                        chunks = analyze_score_narrative(
+                            analysis_code, ats_score, pdf_content, input_text, stream=True, timing=timing
+                        )
+                    else:
+                        chunks = analyze_resume(analysis_code, pdf_content, input_text, stream=True, timing=timing)
+                    # Render chunks as they arrive instead of waiting for the full response
+                    response = st.write_stream(chunks)
+                    if ats_score is not None:
+                        response = f"{local_score_markdown(analysis_code, ats_score)}\n\n{response}"
+                    
+                    if timing.get("ttft_seconds") is not None:
+                        payload_kb = timing["payload_bytes"] / 1024
+                        st.caption(
+                            f"First output after {timing['ttft_seconds']:.1f}s • completed in {timing['total_seconds']:.1f}s"
+                            f" • sent {payload_kb:.1f} KB as {timing['payload_mode']}"
+                        )
+                    
+                    # Save option
+                    if st.button("📥 Save Results", key="save_results"):
+                        with st.spinner("Preparing download..."):
+                            download_text = f"# {analysis_name} Results\n\n{response}"
+                            st.download_button(
+                                label="Download Results as Text",
+                                data=download_text,
+                                file_name=f"resume_{analysis_code}.txt",
+                                mime="text/plain",
+                                key="download_button"
+                            )
+                except Exception as e:
+                    st.error(f"An error occurred: {e}")
+
+    # Full report: all analyses concurrently, each section filled as it finishes
+    if full_report_button:
+        if uploaded_file is None:
+            st.error("⚠️ Please upload your resume first")
+        elif not input_text.strip():
+            st.error("⚠️ Please enter a job description")
+        else:
+            try:
+                with st.spinner("Preparing your resume..."):
+                    pdf_content = input_pdf_setup(uploaded_file)
+                
+                st.markdown('<div class="sub-header">Full Report</div>', unsafe_allow_html=True)
+                sections = {}
+                for analysis_code, analysis_name in FULL_REPORT_ANALYSES.items():
+                    st.markdown(f"### {analysis_name}")
+                    sections[analysis_code] = st.empty()
+                    sections[analysis_code].info("⏳ Analyzing...")
+                
+                start = time.perf_counter()
+                results = {}
+                records = {}
+                report = analyze_resume_full_report(
+                    pdf_content, input_text, structured=structured_report,
+                    resume_text=get_parsed_resume(uploaded_file).text,
+                )
+                for analysis_code, response, error in report:
+                    if error is not None:
+                        sections[analysis_code].error(f"An error occurred: {error}")
+                        continue
+                    if structured_report:
+                        records[analysis_code] = record_to_dict(response)
+                        response = record_to_markdown(response)
+                    results[analysis_code] = response
+                    sections[analysis_code].markdown(response)
+                st.caption(f"Full report completed in {time.perf_counter() - start:.1f}s")
+                
+                if records:
+                    # Kept per session, so the scores can be reused without calling Gemini again
+                    st.session_state.full_report_records = records
+                    st.download_button(
+                        label="📥 Download Full Report (JSON)",
+                        data=json.dumps(records, indent=2),
+                        file_name="resume_full_report.json",
+                        mime="application/json",
+                        key="download_full_report_json"
+                    )
+                if results:
+                    download_text = "\n\n".join(
+                        f"# {FULL_REPORT_ANALYSES[code]} Results\n\n{results[code]}"
+                        for code in FULL_REPORT_ANALYSES if code in results
+                    )
+                    st.download_button(
+                        label="📥 Download Full Report",
+                        data=download_text,
+                        file_name="resume_full_report.txt",
+                        mime="text/plain",
+                        key="download_full_report"
+                    )
+            except Exception as e:
+                st.error(f"An error occurred: {e}")
+
     # Handle jobs button - Extract job title from resume for searching
     if jobs_button:
         if uploaded_file is None:
@@ -176,4 +577,6 @@ def render_resume_analysis_tab():
             
             # Switch to job search tab programmatically
             # Note: Streamlit doesn't support direct tab switching, so we use instructions
-            st.info("✨ Click on the 'Job Search' tab to see matching jobs based on your resume!")
\ No newline at end of file
+            st.info("✨ Click on the 'Job Search' tab to see matching jobs based on your resume!")
+
+    render_payload_stats()
\ No newline at end of file
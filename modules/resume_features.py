@@ -0,0 +1,105 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import streamlit as st
+from modules.resume_analyzer import extract_skills_from_text
+
+# Feature sets kept per process, shared by every session
+RESUME_FEATURES_CACHE_SIZE = 64
+
+_resume_features = OrderedDict()
+_resume_features_lock = threading.Lock()
+
+def extract_job_title_from_resume(resume_text):
+    """
+    Extract the most recent job title from resume text
+    This is a simplified implementation that could be enhanced with ML
+    
+    Args:
+        resume_text: Full text of the resume
+        
+    Returns:
+        Estimated job title
+    """
+    # This is a very basic implementation - in a real app, you'd use a more sophisticated approach
+    common_titles = [
+        "Software Engineer", "Data Scientist", "Product Manager", "Data Analyst",
+        "Web Developer", "Front End Developer", "Back End Developer", "Full Stack Developer",
+        "UI/UX Designer", "Project Manager", "Business Analyst", "Marketing Manager"
+    ]
+    
+    # Find which titles appear in the resume
+    found_titles = [title for title in common_titles if title.lower() in resume_text.lower()]
+    
+    if found_titles:
+        return found_titles[0]
+    else:
+        # Default fallback
+        return "Software Engineer"
+
+def resume_hash(resume_text):
+    """SHA-256 of the resume text, the key for everything derived from it"""
+    return hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+
+def get_resume_features(resume_text):
+    """
+    Features derived from a resume, computed at most once per distinct resume
+    
+    The same dict is kept in the session (st.session_state.resume_features) and
+    in a process-wide cache, so reruns, tabs and other sessions reuse it. A new
+    upload has a new hash and therefore starts from an empty dict.
+    
+    Args:
+        resume_text: Plain text extracted from resume
+        
+    Returns:
+        Dict with hash and text, plus any features computed so far
+    """
+    key = resume_hash(resume_text)
+    session_features = st.session_state.get("resume_features")
+    if session_features is not None and session_features["hash"] == key:
+        return session_features
+    
+    with _resume_features_lock:
+        features = _resume_features.get(key)
+        if features is None:
+            features = {"hash": key, "text": resume_text}
+            _resume_features[key] = features
+        _resume_features.move_to_end(key)
+        while len(_resume_features) > RESUME_FEATURES_CACHE_SIZE:
+            _resume_features.popitem(last=False)
+    
+    st.session_state.resume_features = features
+    return features
+
+def get_resume_skills(resume_text, enhance=False):
+    """
+    Skills extracted from a resume, memoized per resume
+    
+    Args:
+        resume_text: Plain text extracted from resume
+        enhance: Also ask Gemini (memoized separately)
+        
+    Returns:
+        Comma-separated list of skills
+    """
+    features = get_resume_features(resume_text)
+    field = "skills_enhanced" if enhance else "skills"
+    if field not in features:
+        features[field] = extract_skills_from_text(resume_text, enhance=enhance)
+    return features[field]
+
+def get_resume_job_title(resume_text):
+    """
+    Job title suggested by a resume, memoized per resume
+    
+    Args:
+        resume_text: Plain text extracted from resume
+        
+    Returns:
+        Estimated job title
+    """
+    features = get_resume_features(resume_text)
+    if "job_title" not in features:
+        features["job_title"] = extract_job_title_from_resume(resume_text)
+    return features["job_title"]
@@ -0,0 +1,40 @@
+import csv
+import os
+import pytest
+
+# Small job corpus; each posting is written COPIES times so every skill passes
+# the skill extractor's MIN_SKILL_POSTINGS threshold
+COPIES = 3
+JOB_SKILLS = [
+    "Python, SQL, AWS, Docker, Kubernetes",
+    "Python, Machine Learning, PyTorch, SQL",
+    "Java, Spring Boot, Kafka, AWS",
+    "Python, Spark, Kafka, Airflow, SQL",
+    "C#, .NET, SQL Server, Azure",
+    "C++, Linux, Networking",
+    "JavaScript, React, Node.js, TypeScript",
+    "Excel, Accounting, Payroll",
+    "Project Management, Agile, Scrum, Jira",
+    "Python, Django, PostgreSQL, Docker",
+]
+
+@pytest.fixture(scope="session", autouse=True)
+def job_data_dir(tmp_path_factory):
+    """
+    Run the tests from a scratch directory holding data/cleaned_job_skills.csv
+
+    The app reads its data, index and caches from data/ relative to the
+    working directory, so nothing the tests build touches the real data/.
+    """
+    workdir = tmp_path_factory.mktemp("workdir")
+    os.makedirs(workdir / "data")
+    with open(workdir / "data" / "cleaned_job_skills.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["job_link", "job_skills"])
+        writer.writerows(
+            (f"https://example.com/jobs/{i}", skills) for i, skills in enumerate(JOB_SKILLS * COPIES)
+        )
+    previous = os.getcwd()
+    os.chdir(workdir)
+    yield workdir
+    os.chdir(previous)
@@ -0,0 +1,49 @@
+from utils.ats_scorer import CATEGORY_POINTS, analyze_job_description, score_resume_locally
+
+RESUME = """Jane Doe
+Summary
+Data engineer with 6 years of experience building pipelines.
+Experience
+Data Engineer, Acme Corp 2019 - Present
+- Built batch pipelines with Python, Spark and Airflow on AWS
+Education
+B.S. Computer Science
+Skills
+Python, SQL, Spark, Airflow, AWS
+"""
+
+JOB_DESCRIPTION = """Senior Data Engineer
+Requirements
+- 5+ years of experience with Python and SQL
+- Experience with Spark, Kafka and Airflow
+- Bachelor's degree in Computer Science
+"""
+
+BENEFITS = """
+Benefits
+We offer a competitive salary, health insurance, dental insurance and a 401(k) plan.
+Paid time off and parental leave.
+We are an equal opportunity employer and value diversity.
+"""
+
+def test_score_is_bounded_and_reports_missing_skills():
+    score = score_resume_locally(RESUME, JOB_DESCRIPTION)
+    assert 0 <= score.total <= 4 * CATEGORY_POINTS
+    assert score.total == sum(score.categories().values())
+    assert "kafka" in score.missing_skills
+    assert "python" in score.matched_skills
+    assert score.required_years == 5
+
+def test_benefits_paragraph_does_not_change_the_score():
+    plain = score_resume_locally(RESUME, JOB_DESCRIPTION)
+    with_benefits = score_resume_locally(RESUME, JOB_DESCRIPTION + BENEFITS)
+    assert with_benefits == plain
+    for word in ("offer", "competitive", "health", "insurance"):
+        assert word not in with_benefits.missing_keywords
+
+def test_job_description_analysis_is_memoized():
+    assert analyze_job_description(JOB_DESCRIPTION) is analyze_job_description(JOB_DESCRIPTION)
+
+def test_resume_without_the_skills_scores_lower():
+    weak = score_resume_locally("John Smith\nSkills\nExcel, Payroll", JOB_DESCRIPTION)
+    assert weak.total < score_resume_locally(RESUME, JOB_DESCRIPTION).total
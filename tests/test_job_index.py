@@ -0,0 +1,33 @@
+import os
+import numpy as np
+from utils.job_index import get_job_index, is_index_fresh, top_n_indices
+
+def write_csv(path, rows):
+    lines = ["job_link,job_skills"] + [f'https://example.com/{i},"{skills}"' for i, skills in enumerate(rows)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+def test_index_is_reused_until_the_csv_content_changes(tmp_path):
+    csv_path, index_dir = tmp_path / "jobs.csv", str(tmp_path / "index")
+    write_csv(csv_path, ["Python, SQL", "Java, Spring Boot"])
+    index = get_job_index(str(csv_path), index_dir)
+    built_at = index.manifest["built_at"]
+    assert get_job_index(str(csv_path), index_dir) is index
+
+    # Touched but unchanged: the content hash matches, so nothing is rebuilt
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert is_index_fresh(str(csv_path), index_dir)
+    assert get_job_index(str(csv_path), index_dir).manifest["built_at"] == built_at
+
+    write_csv(csv_path, ["Python, SQL", "Java, Spring Boot", "Excel, Payroll"])
+    assert not is_index_fresh(str(csv_path), index_dir)
+    rebuilt = get_job_index(str(csv_path), index_dir)
+    assert len(rebuilt) == 3
+    assert rebuilt.manifest["built_at"] > built_at
+
+def test_top_n_indices_orders_best_first():
+    scores = np.array([0.1, 0.9, 0.4, 0.9, 0.0])
+
+    assert list(top_n_indices(scores, 3)) == [1, 3, 2]
+    assert list(top_n_indices(scores, 10)) == [1, 3, 2, 0, 4]
+    assert len(top_n_indices(scores, 0)) == 0
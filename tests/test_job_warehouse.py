@@ -0,0 +1,59 @@
+from utils.job_index import get_job_index
+from utils.job_warehouse import JobWarehouse, LiveJobIndex, posting_skills
+
+def posting(job_id, link, title="Data Engineer", description="Build pipelines with Python, Spark and Kafka."):
+    return {
+        "job_id": job_id,
+        "job_apply_link": link,
+        "job_title": title,
+        "employer_name": "Acme",
+        "job_city": "Pune",
+        "job_country": "IN",
+        "job_description": description,
+    }
+
+def test_duplicates_by_id_or_apply_link_are_skipped(tmp_path):
+    warehouse = JobWarehouse(str(tmp_path / "warehouse.sqlite"))
+    assert warehouse.ingest([posting("1", "https://a"), posting("2", "https://b")]) == {"inserted": 2, "duplicates": 0}
+
+    counts = warehouse.ingest([
+        posting("1", "https://changed"),   # same job_id
+        posting("3", "https://b"),         # same apply link, new job_id
+        posting("4", "https://c"),
+        posting("4", "https://c"),         # repeated within the batch
+        posting("", "https://d"),          # no job_id, ignored
+    ])
+    assert counts == {"inserted": 1, "duplicates": 3}
+    assert len(warehouse) == 3
+
+def test_rows_after_returns_only_new_postings(tmp_path):
+    warehouse = JobWarehouse(str(tmp_path / "warehouse.sqlite"))
+    warehouse.ingest([posting("1", "https://a"), posting("2", "https://b")])
+    last_id = warehouse.rows_after(0)[-1][0]
+
+    warehouse.ingest([posting("3", "https://c")])
+    assert [row_id for row_id, _ in warehouse.rows_after(last_id)] == [last_id + 1]
+
+def test_posting_skills_merges_listed_and_extracted_skills():
+    skills = posting_skills({**posting("1", "https://a"), "job_required_skills": ["Airflow", "python"]})
+
+    assert skills.split(", ")[:2] == ["Airflow", "python"]
+    assert {"spark", "kafka"} <= set(skills.split(", "))
+
+def test_live_index_appends_new_postings_incrementally(tmp_path):
+    warehouse = JobWarehouse(str(tmp_path / "warehouse.sqlite"))
+    live = LiveJobIndex(get_job_index(), warehouse)
+    warehouse.ingest([posting("1", "https://a")])
+    assert live.refresh() == 1
+
+    warehouse.ingest([
+        posting("1", "https://a"),
+        posting("2", "https://b", "Accountant", "Payroll and accounting in Excel."),
+    ])
+    assert live.refresh() == 1
+    assert live.refresh() == 0
+    assert len(live) == 2
+
+    positions, scores = live.score_candidates("Payroll, Excel")
+    assert list(live.take(positions)["job_title"]) == ["Accountant"]
+    assert scores[0] > 0
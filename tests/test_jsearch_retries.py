@@ -0,0 +1,108 @@
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from urllib3.response import HTTPResponse
+from utils import jsearch_client
+from utils.api_utils import JSearchClient, _ReportingRetry
+from utils.jsearch_client import retry_after_seconds
+
+@pytest.fixture
+def server():
+    """Local HTTP server answering each request with the next (status, headers) in server.replies"""
+    replies, seen = [], []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen.append(self.path)
+            status, headers = replies.pop(0) if replies else (200, {})
+            body = json.dumps({"data": [{"job_id": "1"}]} if status == 200 else {"message": "busy"}).encode()
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.replies, httpd.seen = replies, seen
+    httpd.url = f"http://127.0.0.1:{httpd.server_port}/search"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_server_errors_are_retried_and_counted(server):
+    server.replies.extend([(503, {}), (502, {})])
+    client = JSearchClient(backoff_factor=0, max_retries=3)
+
+    response = client.get("search", server.url)
+    assert response.status_code == 200
+    assert len(server.seen) == 3
+    stats = client.stats()["search"]
+    assert (stats["requests"], stats["attempts"], stats["errors"]) == (1, 3, 2)
+
+def test_last_failure_is_returned_when_retries_run_out(server):
+    server.replies.extend([(503, {})] * 3)
+    client = JSearchClient(backoff_factor=0, max_retries=1)
+
+    assert client.get("search", server.url).status_code == 503
+    assert len(server.seen) == 2
+
+def test_retry_after_and_backoff_are_capped():
+    retry = _ReportingRetry(total=10, backoff_factor=10, max_wait=2.5)
+    assert retry.get_retry_after(HTTPResponse(headers={"Retry-After": "120"})) == 2.5
+
+    for _ in range(5):
+        retry = retry.increment("GET", "/search", response=HTTPResponse(status=503))
+    assert retry.max_wait == 2.5
+    assert retry.get_backoff_time() == 2.5
+
+def test_statuses_outside_retry_statuses_are_not_retried_despite_retry_after(server):
+    server.replies.append((429, {"Retry-After": "1"}))
+    client = JSearchClient(retry_statuses=(503,), backoff_factor=0)
+
+    assert client.get("search", server.url).status_code == 429
+    assert len(server.seen) == 1
+
+def test_retry_after_header_parsing():
+    def response(value):
+        r = requests.models.Response()
+        if value is not None:
+            r.headers["Retry-After"] = value
+        return r
+
+    assert retry_after_seconds(response("3")) == 3.0
+    assert retry_after_seconds(response(None)) is None
+    assert retry_after_seconds(response("soon")) is None
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < retry_after_seconds(response(later)) <= 30
+
+class RecordingLimiter:
+    def __init__(self):
+        self.acquired, self.pauses = 0, []
+
+    async def acquire(self):
+        self.acquired += 1
+
+    def pause(self, seconds):
+        self.pauses.append(seconds)
+
+def test_page_429_pauses_the_shared_limiter_then_retries(server, monkeypatch):
+    server.replies.append((429, {"Retry-After": "2"}))
+    monkeypatch.setattr(jsearch_client, "page_client", JSearchClient(retry_statuses=(503,), backoff_factor=0))
+    limiter = RecordingLimiter()
+
+    result = asyncio.run(jsearch_client._request_page(server.url, {}, {}, limiter))
+    assert result == [{"job_id": "1"}]
+    assert limiter.acquired == 2
+    assert len(limiter.pauses) == 1 and 2 <= limiter.pauses[0] <= 2 + jsearch_client.BACKOFF_BASE_SECONDS
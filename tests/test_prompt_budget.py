@@ -0,0 +1,60 @@
+from utils.metrics import get_metric_samples
+from utils.prompt_budget import (
+    budget_job_description,
+    compact_job_description,
+    estimate_tokens,
+    strip_boilerplate,
+)
+
+JOB_DESCRIPTION = """Senior Data Engineer
+
+Acme is a fast-growing company on a mission to make data useful. We value curiosity.
+
+Requirements:
+- 5+ years of experience building pipelines with Python and Spark
+- Hands-on experience with Kafka and Airflow
+- Strong SQL skills
+
+We offer competitive salary, health insurance and a 401(k) match.
+Acme is an equal opportunity employer and does not discriminate.
+- Strong SQL skills
+"""
+
+def test_strip_boilerplate_drops_benefits_eeo_and_repeats():
+    text, removed = strip_boilerplate(JOB_DESCRIPTION)
+
+    assert removed == 3
+    assert "401(k)" not in text and "equal opportunity" not in text
+    assert text.count("Strong SQL skills") == 1
+    assert "Kafka and Airflow" in text
+
+def test_repeated_sentences_inside_paragraphs_are_dropped():
+    text, _ = strip_boilerplate("We build data tools. You will own pipelines.\nYou will own pipelines. Python is a must.")
+
+    assert text.count("You will own pipelines.") == 1
+    assert "Python is a must." in text
+
+def test_compaction_keeps_requirements_within_budget():
+    padding = " ".join(f"Our office number {i} has a lovely view of the river." for i in range(60))
+    text, stats = compact_job_description(f"{padding}\n{JOB_DESCRIPTION}", budget_tokens=60)
+
+    assert estimate_tokens(text) <= 60
+    assert stats["compacted_tokens"] < stats["original_tokens"]
+    assert stats["dropped_units"] > 0
+    assert "Kafka" in text
+
+def test_compaction_never_empties_a_long_single_paragraph():
+    paragraph = "responsibilities " * 500
+    text, _ = compact_job_description(paragraph, budget_tokens=50)
+
+    assert text.strip()
+    assert estimate_tokens(text) <= 50
+
+def test_zero_budget_leaves_the_text_unchanged():
+    assert compact_job_description(JOB_DESCRIPTION, budget_tokens=0)[0] == JOB_DESCRIPTION
+
+def test_budget_records_tokens_saved():
+    budget_job_description(JOB_DESCRIPTION, "test_analysis")
+
+    sample = get_metric_samples("jd_budget.test_analysis")[-1]
+    assert sample["tokens_saved"] == sample["original_tokens"] - sample["compacted_tokens"] > 0
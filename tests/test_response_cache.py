@@ -0,0 +1,111 @@
+import threading
+import time
+from utils import response_cache
+from utils.response_cache import ResponseCache, make_cache_key
+
+def test_make_cache_key_separates_parts():
+    assert make_cache_key("ab", "c") != make_cache_key("a", "bc")
+    assert make_cache_key({"a": 1, "b": 2}) == make_cache_key({"b": 2, "a": 1})
+
+def test_values_survive_a_new_process_on_disk(tmp_path):
+    ResponseCache("gemini", cache_dir=tmp_path).set("key", {"text": "hello"})
+
+    reopened = ResponseCache("gemini", cache_dir=tmp_path)
+    assert reopened.get("key") == {"text": "hello"}
+    assert reopened.stats()["disk_hits"] == 1
+
+def test_expired_entries_are_misses(monkeypatch):
+    cache = ResponseCache("ttl", cache_dir=None, ttl_seconds=10)
+    now = time.time()
+    monkeypatch.setattr(response_cache.time, "time", lambda: now)
+    cache.set("key", "value")
+
+    monkeypatch.setattr(response_cache.time, "time", lambda: now + 11)
+    assert cache.lookup("key") == (None, "miss")
+
+def test_stale_entry_is_served_while_it_refreshes(monkeypatch):
+    cache = ResponseCache("stale", cache_dir=None, ttl_seconds=10, stale_seconds=100)
+    now = time.time()
+    monkeypatch.setattr(response_cache.time, "time", lambda: now)
+    cache.set("key", "old")
+    monkeypatch.setattr(response_cache.time, "time", lambda: now + 50)
+
+    refreshed = threading.Event()
+
+    def fetch():
+        refreshed.set()
+        return "new"
+
+    assert cache.get("key") is None
+    assert cache.get_or_fetch("key", fetch) == "old"
+    assert refreshed.wait(5)
+    for _ in range(100):
+        if cache.get("key") == "new":
+            break
+        time.sleep(0.01)
+    assert cache.get("key") == "new"
+    assert cache.stats()["refreshes"] == 1
+
+def test_concurrent_misses_share_one_fetch():
+    cache = ResponseCache("single_flight", cache_dir=None)
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("key", fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # Every other caller has joined the owner's fetch before it is released
+    for _ in range(500):
+        if cache.stats()["coalesced"] == 7:
+            break
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+
+def test_rejected_values_are_returned_but_not_stored():
+    cache = ResponseCache("cacheable", cache_dir=None)
+    error = {"error": "rate limited"}
+
+    assert cache.get_or_fetch("key", lambda: error, cacheable=lambda value: "error" not in value) == error
+    assert cache.get("key") is None
+
+def test_waiters_fetch_for_themselves_when_the_owner_abandons():
+    cache = ResponseCache("abandon", cache_dir=None)
+    future, owner = cache.claim("key")
+    assert owner
+    assert cache.claim("key") == (future, False)
+
+    cache.abandon("key", future)
+    assert cache.wait(future, lambda: "fallback") == "fallback"
+    # The key is free again for the next caller
+    assert cache.claim("key")[1]
+
+def test_slow_owner_times_out_to_a_fetch(monkeypatch):
+    monkeypatch.setattr(response_cache, "INFLIGHT_WAIT_SECONDS", 0.05)
+    cache = ResponseCache("timeout", cache_dir=None)
+    cache.claim("key")
+    future, _ = cache.claim("key")
+
+    assert cache.wait(future, lambda: "fallback") == "fallback"
+    assert cache.stats()["wait_timeouts"] == 1
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache("evict", cache_dir=tmp_path, memory_items=1, disk_max_items=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
@@ -0,0 +1,27 @@
+from utils.skill_extractor import SkillExtractor, extract_skills_locally, merge_skill_lists, tokenize
+from utils.skills import normalize_skill, split_skills
+
+def test_tokenize_keeps_symbols_of_skill_names():
+    assert tokenize("C++, C#, Node.js and .NET.") == ["c++", "c#", "node.js", "and", ".net"]
+    assert tokenize("I know Python. Next sentence") == ["i", "know", "python", "next", "sentence"]
+
+def test_dotnet_is_tokenized_like_it_is_normalized():
+    assert normalize_skill(" .NET ") == ".net"
+    assert tokenize(".NET") == [normalize_skill(".NET")]
+    assert split_skills("C#, .NET, SQL Server") == ["c#", ".net", "sql server"]
+
+def test_dotnet_does_not_match_a_net_skill():
+    extractor = SkillExtractor({".net": ".net", "net": "net"})
+    assert extractor.extract("Built services in C# and .NET") == [".net"]
+    assert extractor.extract("Grew net revenue") == ["net"]
+
+def test_longest_skill_wins():
+    extractor = SkillExtractor({"machine learning": "machine learning", "machine": "machine"})
+    assert extractor.extract("Machine learning engineer") == ["machine learning"]
+
+def test_extracts_skills_from_the_job_vocabulary():
+    skills = extract_skills_locally("Backend work in C# on .NET with SQL; some Python and Kafka.")
+    assert {".net", "c#", "python", "kafka"} <= set(skills)
+
+def test_merge_skill_lists_deduplicates_on_the_normalized_name():
+    assert merge_skill_lists(["Python", "SQL"], ["python ", "Kafka"]) == ["Python", "SQL", "Kafka"]
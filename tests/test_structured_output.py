@@ -0,0 +1,99 @@
+import json
+import pytest
+from utils import structured_output
+from utils.structured_output import (
+    ATSReport,
+    MatchPercentage,
+    StructuredOutputError,
+    get_structured_response,
+    parse_structured_response,
+    record_from_dict,
+    record_to_dict,
+    record_to_markdown,
+    schema_instructions,
+)
+
+MATCH = {"match_percentage": 78, "missing_keywords": ["Kafka", "Airflow"], "final_thoughts": "Solid fit."}
+
+def test_parses_a_fenced_reply_with_surrounding_text():
+    reply = f"Here is the result:\n```json\n{json.dumps(MATCH)}\n```\nLet me know if you need more."
+
+    record = parse_structured_response("match_percentage", reply)
+    assert record == MatchPercentage(78, ("Kafka", "Airflow"), "Solid fit.")
+
+def test_scores_given_as_strings_are_accepted():
+    record = parse_structured_response("match_percentage", {**MATCH, "match_percentage": "78%"})
+    assert record.match_percentage == 78
+
+    report = parse_structured_response("ats_score", {
+        "overall_score": 71.6, "keyword_match": "18/25", "skills_relevance": 20,
+        "experience_match": 15, "education": 18.4, "improvements": "Add Kafka",
+    })
+    assert report == ATSReport(72, 18, 20, 15, 18, ("Add Kafka",))
+
+@pytest.mark.parametrize("reply, error", [
+    ("I could not analyze this resume.", "no JSON object"),
+    ('{"match_percentage": 78,}', "invalid JSON"),
+    (json.dumps({"match_percentage": 78, "final_thoughts": "ok"}), "missing keys: missing_keywords"),
+    (json.dumps({**MATCH, "match_percentage": 140}), "between 0 and 100"),
+    (json.dumps({**MATCH, "match_percentage": "high"}), "must be a number"),
+    (json.dumps({**MATCH, "match_percentage": True}), "must be a number"),
+    (json.dumps({**MATCH, "missing_keywords": {"a": 1}}), "must be a list"),
+    (json.dumps({**MATCH, "final_thoughts": ["a"]}), "must be a string"),
+])
+def test_invalid_replies_are_rejected(reply, error):
+    with pytest.raises(StructuredOutputError, match=error):
+        parse_structured_response("match_percentage", reply)
+
+def test_extra_keys_are_dropped_and_records_round_trip():
+    record = parse_structured_response("match_percentage", {**MATCH, "confidence": "high"})
+
+    data = record_to_dict(record)
+    assert data == {"analysis_type": "match_percentage", **MATCH}
+    assert record_from_dict(json.loads(json.dumps(data))) == record
+    assert "**Match percentage:** 78/100" in record_to_markdown(record)
+
+def test_schema_instructions_list_every_key():
+    instructions = schema_instructions("ats_score")
+    for key in ("overall_score", "keyword_match", "skills_relevance", "experience_match", "education", "improvements"):
+        assert f'"{key}"' in instructions
+    assert "integer from 0 to 25" in instructions
+
+def fake_gemini(monkeypatch, replies):
+    prompts = []
+
+    def get_gemini_response(prompt, pdf_content, job_description, **kwargs):
+        prompts.append(prompt)
+        return replies[len(prompts) - 1]
+
+    monkeypatch.setattr(structured_output, "get_gemini_response", get_gemini_response)
+    return prompts
+
+def test_invalid_reply_is_retried_with_the_error(monkeypatch):
+    prompts = fake_gemini(monkeypatch, ["Sure! The match is about 78%.", json.dumps(MATCH)])
+
+    record = get_structured_response("match_percentage", "Compare.", "resume", "job", use_cache=False)
+    assert record.match_percentage == 78
+    assert len(prompts) == 2
+    assert "could not be used (no JSON object in the reply)" in prompts[1]
+
+def test_gives_up_after_the_last_attempt(monkeypatch):
+    monkeypatch.setattr(structured_output, "STRUCTURED_MAX_ATTEMPTS", 2)
+    prompts = fake_gemini(monkeypatch, ["no", "still no", json.dumps(MATCH)])
+
+    with pytest.raises(StructuredOutputError):
+        get_structured_response("match_percentage", "Compare.", "resume", "job", use_cache=False)
+    assert len(prompts) == 2
+
+def test_only_valid_records_are_cached(monkeypatch):
+    prompts = fake_gemini(monkeypatch, ["not json", json.dumps(MATCH)])
+    monkeypatch.setattr(structured_output, "STRUCTURED_MAX_ATTEMPTS", 1)
+
+    with pytest.raises(StructuredOutputError):
+        get_structured_response("match_percentage", "Cache me.", "resume", "job")
+    monkeypatch.setattr(structured_output, "STRUCTURED_MAX_ATTEMPTS", 2)
+    first = get_structured_response("match_percentage", "Cache me.", "resume", "job")
+    again = get_structured_response("match_percentage", "Cache me.", "resume", "job")
+
+    assert first == again == MatchPercentage(78, ("Kafka", "Airflow"), "Solid fit.")
+    assert len(prompts) == 2
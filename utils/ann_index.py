@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+
+ANN_DIR = "ann"
+
+# Recall/latency knobs for the random-projection LSH backend
+#   n_components: Gaussian random projection dimensions the hyperplanes are drawn in
+#   n_tables:     independent hash tables; more tables -> higher recall, more candidates
+#   n_bits:       hyperplanes per table; more bits -> smaller buckets, lower recall
+#   multiprobe:   also probe buckets one bit away from the query's bucket
+#   max_candidates: cap on rows passed to the exact rerank
+#
+# The defaults target recall@5 >= 0.9 against the exact path. On 20k postings
+# (python -m benchmarks.ann_benchmark) they reach about 0.94 while reranking
+# roughly 40% of the corpus; a skill query's true top matches often have a
+# cosine of only 0.3-0.4, so fewer tables or more bits lose matches quickly.
+LSH_RECALL_TARGET = 0.9
+DEFAULT_LSH_PARAMS = {
+    "n_components": 128,
+    "n_tables": 40,
+    "n_bits": 10,
+    "multiprobe": True,
+    "max_candidates": 20000,
+    "seed": 42,
+}
+
+# Rows projected and hashed per step while building
+BUILD_CHUNK_ROWS = 50000
+
+_loaded_backends = {}
+_backend_lock = threading.Lock()
+
+class LSHJobIndex:
+    """
+    Random-hyperplane LSH (SimHash) over randomly projected job vectors
+
+    The projection is Gaussian rather than fitted, so hash collisions track the
+    TF-IDF cosine itself; an SVD keeps only the dominant topics and drops the
+    rarer skills that separate close matches.
+
+    Candidates come from the query's bucket in every table (plus neighbouring
+    buckets when multiprobe is on) and are then reranked with the exact TF-IDF
+    cosine, so the returned scores are exact even though recall is not.
+    Exposes the same score_candidates interface as JobIndex.
+    """
+
+    def __init__(self, job_index, components, planes, sorted_codes, sorted_rows, params):
+        self.job_index = job_index
+        self.components = components
+        self.planes = planes
+        self.sorted_codes = sorted_codes
+        self.sorted_rows = sorted_rows
+        self.params = params
+        self._bit_values = np.left_shift(np.int64(1), np.arange(params["n_bits"], dtype=np.int64))
+
+    def _hash(self, reduced):
+        # reduced: (n, n_components) -> codes: (n_tables, n)
+        bits = np.einsum("nd,tdb->tnb", reduced, self.planes) > 0
+        return bits.astype(np.int64) @ self._bit_values
+
+    def _project(self, vectors):
+        reduced = np.asarray(vectors @ self.components.T, dtype=np.float32)
+        norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+        return reduced / np.maximum(norms, 1e-12)
+
+    def candidate_rows(self, user_vector):
+        """
+        Job rows colliding with the query in at least one hash table
+
+        Args:
+            user_vector: Sparse TF-IDF vector of the query (1 x terms)
+
+        Returns:
+            Numpy array of job row positions, at most max_candidates long
+        """
+        codes = self._hash(self._project(user_vector))[:, 0]
+        found = []
+        for table, code in enumerate(codes):
+            keys = [code]
+            if self.params["multiprobe"]:
+                keys.extend(code ^ self._bit_values)
+            keys = np.asarray(keys, dtype=np.int64)
+            table_codes = self.sorted_codes[table]
+            starts = np.searchsorted(table_codes, keys, side="left")
+            ends = np.searchsorted(table_codes, keys, side="right")
+            for start, end in zip(starts, ends):
+                if end > start:
+                    found.append(self.sorted_rows[table][start:end])
+
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        rows, hits = np.unique(np.concatenate(found), return_counts=True)
+        max_candidates = self.params["max_candidates"]
+        if len(rows) > max_candidates:
+            # Prefer rows that collided with the query in the most tables
+            rows = np.sort(rows[np.argpartition(-hits, max_candidates)[:max_candidates]])
+        return rows
+
+    def score_candidates(self, user_skills):
+        """
+        Approximate candidate retrieval followed by an exact cosine rerank
+
+        Args:
+            user_skills: Comma-separated string of user skills
+
+        Returns:
+            Tuple (rows, scores) of numpy arrays
+        """
+        user_vector = self.job_index.transform([user_skills])
+        if not user_vector.nnz:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+        rows = self.candidate_rows(user_vector)
+        if not len(rows):
+            return rows, np.zeros(0, dtype=np.float64)
+        scores = (self.job_index.matrix[rows] @ user_vector.T).toarray().ravel()
+        return rows, scores
+
+def _params_key(job_index, params):
+    # The ANN files are only valid for one corpus and one set of build params
+    build_params = {k: params[k] for k in ("n_components", "n_tables", "n_bits", "seed")}
+    payload = json.dumps({"csv": job_index.manifest["csv"]["sha256"], "projection": "gaussian", "params": build_params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def build_lsh_index(job_index, params=None):
+    """
+    Draw the random projection and hash every job into the LSH tables
+
+    Args:
+        job_index: Loaded JobIndex
+        params: Overrides for DEFAULT_LSH_PARAMS
+
+    Returns:
+        LSHJobIndex instance
+    """
+    params = {**DEFAULT_LSH_PARAMS, **(params or {})}
+    rng = np.random.default_rng(params["seed"])
+    matrix = job_index.matrix
+    num_jobs = matrix.shape[0]
+
+    n_components = params["n_components"]
+    components = rng.standard_normal((n_components, matrix.shape[1])).astype(np.float32)
+    planes = rng.standard_normal((params["n_tables"], n_components, params["n_bits"])).astype(np.float32)
+
+    lsh = LSHJobIndex(job_index, components, planes, None, None, params)
+    codes = np.empty((params["n_tables"], num_jobs), dtype=np.int64)
+    for start in range(0, num_jobs, BUILD_CHUNK_ROWS):
+        chunk = matrix[start:start + BUILD_CHUNK_ROWS]
+        codes[:, start:start + chunk.shape[0]] = lsh._hash(lsh._project(chunk))
+
+    order = np.argsort(codes, axis=1, kind="stable")
+    lsh.sorted_codes = np.take_along_axis(codes, order, axis=1)
+    lsh.sorted_rows = order
+    return lsh
+
+def save_lsh_index(lsh, ann_dir):
+    """Persist an LSHJobIndex so it can be reloaded without refitting"""
+    os.makedirs(ann_dir, exist_ok=True)
+    np.save(os.path.join(ann_dir, "components.npy"), lsh.components)
+    np.save(os.path.join(ann_dir, "planes.npy"), lsh.planes)
+    np.save(os.path.join(ann_dir, "sorted_codes.npy"), lsh.sorted_codes)
+    np.save(os.path.join(ann_dir, "sorted_rows.npy"), lsh.sorted_rows)
+    with open(os.path.join(ann_dir, "params.json"), "w", encoding="utf-8") as f:
+        json.dump(lsh.params, f)
+
+def load_lsh_index(job_index, ann_dir, params):
+    """Load a saved LSHJobIndex, memory-mapping the hash tables"""
+    components = np.load(os.path.join(ann_dir, "components.npy"))
+    planes = np.load(os.path.join(ann_dir, "planes.npy"))
+    sorted_codes = np.load(os.path.join(ann_dir, "sorted_codes.npy"), mmap_mode="r")
+    sorted_rows = np.load(os.path.join(ann_dir, "sorted_rows.npy"), mmap_mode="r")
+    if sorted_rows.shape[1] != len(job_index):
+        raise ValueError("LSH tables do not match the job index, rebuild required")
+    return LSHJobIndex(job_index, components, planes, sorted_codes, sorted_rows, params)
+
+def get_lsh_index(job_index, params=None):
+    """
+    Return the process-wide LSH backend for a job index, building it if needed
+
+    Args:
+        job_index: Loaded JobIndex
+        params: Overrides for DEFAULT_LSH_PARAMS
+
+    Returns:
+        LSHJobIndex instance
+    """
+    params = {**DEFAULT_LSH_PARAMS, **(params or {})}
+    ann_dir = os.path.join(job_index.index_dir, ANN_DIR, f"lsh_{_params_key(job_index, params)}")
+    with _backend_lock:
+        lsh = _loaded_backends.get(ann_dir)
+        if lsh is not None and lsh.job_index is job_index:
+            if lsh.params != params:
+                # Query-time knobs (multiprobe, max_candidates) change without a rebuild
+                lsh = LSHJobIndex(job_index, lsh.components, lsh.planes, lsh.sorted_codes, lsh.sorted_rows, params)
+                _loaded_backends[ann_dir] = lsh
+            return lsh
+        try:
+            lsh = load_lsh_index(job_index, ann_dir, params)
+        except (OSError, ValueError):
+            lsh = build_lsh_index(job_index, params)
+            save_lsh_index(lsh, ann_dir)
+        _loaded_backends[ann_dir] = lsh
+        return lsh
+
+def get_match_backend(job_index, backend=None, params=None):
+    """
+    Pick the candidate retrieval backend used by find_job_matches
+
+    Args:
+        job_index: Loaded JobIndex
+        backend: "exact" (inverted index) or "lsh"; defaults to the
+            JOB_MATCH_BACKEND environment variable, then "exact"
+        params: LSH overrides for DEFAULT_LSH_PARAMS
+
+    Returns:
+        Object with a score_candidates(user_skills) method
+    """
+    backend = backend or os.getenv("JOB_MATCH_BACKEND", "exact")
+    if backend == "exact":
+        return job_index
+    if backend == "lsh":
+        return get_lsh_index(job_index, params)
+    raise ValueError(f"Unknown job match backend: {backend}")
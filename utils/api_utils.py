@@ -1,27 +1,390 @@
 import os
 import requests
 import json
-import google.generativeai as genai
+import threading
+import time
+from collections import defaultdict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.response_cache import ResponseCache, make_cache_key
+from utils.gemini_client import get_gemini_model, get_gemini_model_name
+from utils.metrics import record_metric
 
-def get_gemini_response(input_prompt, pdf_content, job_description):
+JSEARCH_HOST = "jsearch.p.rapidapi.com"
+# Overridable so the client can be pointed at a local mock server
+JSEARCH_BASE_URL = os.getenv("JSEARCH_BASE_URL", f"https://{JSEARCH_HOST}")
+# Seconds to establish a connection and to wait for the response body
+JSEARCH_CONNECT_TIMEOUT = float(os.getenv("JSEARCH_CONNECT_TIMEOUT", "5"))
+JSEARCH_READ_TIMEOUT = float(os.getenv("JSEARCH_READ_TIMEOUT", "30"))
+JSEARCH_MAX_RETRIES = int(os.getenv("JSEARCH_MAX_RETRIES", "3"))
+# Longest single wait between retries, whatever Retry-After asks for (retries block the caller)
+JSEARCH_MAX_RETRY_WAIT = float(os.getenv("JSEARCH_MAX_RETRY_WAIT", "10"))
+SERVER_ERROR_STATUSES = (500, 502, 503, 504)
+# Listings change within the day, salary estimates rarely do
+JSEARCH_SEARCH_TTL_MINUTES = float(os.getenv("JSEARCH_SEARCH_TTL_MINUTES", "30"))
+JSEARCH_SALARY_TTL_HOURS = float(os.getenv("JSEARCH_SALARY_TTL_HOURS", "72"))
+
+_jsearch_client = None
+_jsearch_client_lock = threading.Lock()
+_jsearch_caches = {}
+_jsearch_caches_lock = threading.Lock()
+
+_gemini_cache = None
+_gemini_cache_lock = threading.Lock()
+
+def get_gemini_cache():
+    """
+    Shared cache of Gemini responses, created on first use
+    
+    Returns:
+        ResponseCache keyed by model, prompt, resume content and job description
+    """
+    global _gemini_cache
+    with _gemini_cache_lock:
+        if _gemini_cache is None:
+            ttl_hours = float(os.getenv("GEMINI_CACHE_TTL_HOURS", "168"))
+            _gemini_cache = ResponseCache("gemini_responses", ttl_seconds=ttl_hours * 3600)
+        return _gemini_cache
+
+def describe_payload(pdf_content):
+    """
+    Size and kind of the resume parts sent to Gemini
+    
+    Args:
+        pdf_content: List of text strings and/or mime_type/data dicts
+        
+    Returns:
+        Tuple (payload_bytes, payload_mode) where payload_mode is "text",
+        "image" or "both"; dict parts count as text unless their mime_type is an image
+    """
+    text_bytes, blob_bytes = 0, 0
+    for part in pdf_content:
+        if isinstance(part, str):
+            text_bytes += len(part.encode("utf-8"))
+        elif isinstance(part, dict):
+            if str(part.get("mime_type", "")).startswith("image/"):
+                blob_bytes += len(part.get("data", ""))
+            else:
+                # e.g. the base64 text/plain part used for Gemini skill extraction
+                text_bytes += len(part.get("data", ""))
+    if text_bytes and blob_bytes:
+        mode = "both"
+    elif blob_bytes:
+        mode = "image"
+    else:
+        mode = "text"
+    return text_bytes + blob_bytes, mode
+
+def _record_call(metric_name, timing, metric_fields, **values):
+    record_metric(metric_name, **values, **(metric_fields or {}))
+    if timing is not None:
+        timing.update(values)
+
+def get_gemini_response(input_prompt, pdf_content, job_description, use_cache=True, stream=False, metric_name="gemini",
+                        generation_config=None, metric_fields=None, timing=None):
     """
     Get response from Google Gemini API
     
+    Identical requests (same model, prompt, resume content and job description)
+    are answered from the response cache without calling the model.
+    
     Args:
         input_prompt: The prompt for Gemini
-        pdf_content: The processed PDF content
+        pdf_content: The processed PDF content (one part per page)
         job_description: The job description text
+        use_cache: Whether to read and write the response cache
+        stream: Return a generator of text chunks instead of the full text
+        metric_name: Name the call's timings are recorded under
+        generation_config: Optional Gemini generation config, e.g. a response MIME type
+        metric_fields: Extra fields recorded with the call's timings
+        timing: Optional dict filled with this call's recorded timings (see stream_gemini_response)
         
     Returns:
-        Text response from Gemini
+        Text response from Gemini, or a generator of text chunks if stream is True
     """
-    model = genai.GenerativeModel('gemini-pro')
-    response = model.generate_content(contents=[input_prompt, pdf_content[0], job_description])
-    return response.text
+    chunks = stream_gemini_response(
+        input_prompt, pdf_content, job_description, use_cache, metric_name, generation_config, metric_fields, timing
+    )
+    if stream:
+        return chunks
+    return "".join(chunks)
 
-def fetch_jobs_api(job_role, location, remote_only=False, page=1, api_key=None):
+def stream_gemini_response(input_prompt, pdf_content, job_description, use_cache=True, metric_name="gemini",
+                           generation_config=None, metric_fields=None, timing=None):
     """
-    Fetch jobs from JSearch API
+    Stream a Gemini response chunk by chunk
+    
+    Time to first chunk and total time are recorded under metric_name once
+    the stream is exhausted, and copied into timing if given, so a caller can
+    show its own call's numbers rather than the latest sample of the shared
+    metric. A cached response is yielded as a single chunk.
+    
+    Args:
+        input_prompt: The prompt for Gemini
+        pdf_content: The processed PDF content (one part per page)
+        job_description: The job description text
+        use_cache: Whether to read and write the response cache
+        metric_name: Name the call's timings are recorded under
+        generation_config: Optional Gemini generation config, e.g. a response MIME type
+        metric_fields: Extra fields recorded with the call's timings
+        timing: Optional dict updated with the recorded sample (ttft_seconds,
+            total_seconds, cached, payload_bytes, payload_mode)
+        
+    Yields:
+        Text chunks as the model generates them
+    """
+    start = time.perf_counter()
+    payload_bytes, payload_mode = describe_payload(pdf_content)
+    model_name = get_gemini_model_name()
+    cache_key = make_cache_key(model_name, input_prompt, pdf_content, job_description)
+    if generation_config:
+        cache_key = make_cache_key(cache_key, generation_config)
+    if use_cache:
+        cached = get_gemini_cache().get(cache_key)
+        if cached is not None:
+            elapsed = time.perf_counter() - start
+            _record_call(metric_name, timing, metric_fields, ttft_seconds=elapsed, total_seconds=elapsed,
+                         cached=True, payload_bytes=0, payload_mode=payload_mode)
+            yield cached
+            return
+    
+    model = get_gemini_model(model_name)
+    response = model.generate_content(
+        contents=[input_prompt, *pdf_content, job_description], generation_config=generation_config, stream=True
+    )
+    
+    parts = []
+    first_chunk_seconds = None
+    for chunk in response:
+        try:
+            text = chunk.text
+        except ValueError:
+            # Chunks without text parts (e.g. only safety metadata)
+            continue
+        if not text:
+            continue
+        if first_chunk_seconds is None:
+            first_chunk_seconds = time.perf_counter() - start
+        parts.append(text)
+        yield text
+    
+    full_text = "".join(parts)
+    _record_call(metric_name, timing, metric_fields, ttft_seconds=first_chunk_seconds,
+                 total_seconds=time.perf_counter() - start, cached=False, payload_bytes=payload_bytes,
+                 payload_mode=payload_mode)
+    if use_cache and full_text:
+        get_gemini_cache().set(cache_key, full_text)
+
+class _ReportingRetry(Retry):
+    """
+    urllib3 Retry that caps Retry-After and backoff waits at max_wait and reports retried attempts
+
+    on_retry(response, error) is called for every attempt that is about to be
+    retried. urllib3 makes a new Retry per attempt, so new() carries both over.
+    """
+
+    def __init__(self, *args, max_wait=JSEARCH_MAX_RETRY_WAIT, on_retry=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_wait = max_wait
+        self.on_retry = on_retry
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.max_wait = self.max_wait
+        retry.on_retry = self.on_retry
+        return retry
+
+    def get_backoff_time(self):
+        # Clamped here rather than with backoff_max, which urllib3 1.26 does not accept
+        return min(super().get_backoff_time(), self.max_wait)
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        # urllib3 also retries any 413/429/503 carrying Retry-After; only retry what status_forcelist lists
+        if self.status_forcelist is not None and status_code not in self.status_forcelist:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def get_retry_after(self, response):
+        seconds = super().get_retry_after(response)
+        return None if seconds is None else min(seconds, self.max_wait)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        # Raises MaxRetryError when exhausted; that last attempt is recorded by the caller
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        if self.on_retry is not None:
+            self.on_retry(response, error)
+        return retry
+
+class JSearchClient:
+    """
+    Pooled HTTP session for the JSearch API
+
+    Connections are kept alive and reused across pages, lookups and threads.
+    GET requests are retried with exponential backoff on connection errors and
+    on retry_statuses, honouring Retry-After up to max_retry_wait seconds.
+    Every request is recorded as a "jsearch.<endpoint>" metric (latency
+    including retries) and every attempt, retried ones included, is counted
+    per endpoint.
+    """
+
+    def __init__(self, retry_statuses=(429, *SERVER_ERROR_STATUSES), max_retries=JSEARCH_MAX_RETRIES,
+                 backoff_factor=0.5, pool_size=10,
+                 timeout=(JSEARCH_CONNECT_TIMEOUT, JSEARCH_READ_TIMEOUT), max_retry_wait=JSEARCH_MAX_RETRY_WAIT):
+        retry = _ReportingRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=retry_statuses,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+            max_wait=max_retry_wait,
+            on_retry=self._record_retry,
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.timeout = timeout
+        self._counters = defaultdict(lambda: {"requests": 0, "attempts": 0, "errors": 0, "total_seconds": 0.0})
+        self._lock = threading.Lock()
+        # Endpoint of the request running on each thread, for retries reported by urllib3
+        self._local = threading.local()
+
+    def get(self, endpoint, url, headers=None, params=None):
+        """
+        Send a GET request
+
+        Args:
+            endpoint: Short endpoint name used for metrics, e.g. "search"
+            url: Full request URL
+            headers: Request headers
+            params: Query parameters
+
+        Returns:
+            requests.Response (after retries); network errors are re-raised
+        """
+        self._local.endpoint = endpoint
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            self._record(endpoint, time.perf_counter() - start, None)
+            raise
+        self._record(endpoint, time.perf_counter() - start, response.status_code)
+        return response
+
+    def _record(self, endpoint, seconds, status):
+        error = status is None or status >= 400
+        record_metric(f"jsearch.{endpoint}", latency_seconds=seconds, status=status, error=error)
+        with self._lock:
+            counter = self._counters[endpoint]
+            counter["requests"] += 1
+            counter["attempts"] += 1
+            counter["errors"] += int(error)
+            counter["total_seconds"] += seconds
+
+    def _record_retry(self, response, error):
+        # An attempt that failed and is being retried
+        endpoint = getattr(self._local, "endpoint", "unknown")
+        status = response.status if response is not None else None
+        record_metric(f"jsearch.{endpoint}.retry", status=status, error=type(error).__name__ if error else None)
+        with self._lock:
+            counter = self._counters[endpoint]
+            counter["attempts"] += 1
+            counter["errors"] += 1
+
+    def stats(self):
+        """
+        Request counters per endpoint
+
+        Returns:
+            Dict of endpoint -> requests, attempts (retries included), errors
+            (failed attempts), error_rate (per attempt) and mean_latency_seconds
+            (per request, retries included)
+        """
+        with self._lock:
+            return {
+                endpoint: {
+                    "requests": c["requests"],
+                    "attempts": c["attempts"],
+                    "errors": c["errors"],
+                    "error_rate": c["errors"] / c["attempts"],
+                    "mean_latency_seconds": c["total_seconds"] / max(c["requests"], 1),
+                }
+                for endpoint, c in self._counters.items()
+            }
+
+def get_jsearch_client():
+    """
+    Shared JSearch client, created on first use
+
+    Returns:
+        JSearchClient used by fetch_jobs_api and fetch_salary_estimate
+    """
+    global _jsearch_client
+    with _jsearch_client_lock:
+        if _jsearch_client is None:
+            _jsearch_client = JSearchClient()
+        return _jsearch_client
+
+def get_jsearch_cache(endpoint):
+    """
+    Shared cache of JSearch results for one endpoint, created on first use
+
+    Entries past their TTL are still served for one more TTL while a
+    background refresh runs.
+
+    Args:
+        endpoint: "search" or "estimated-salary"
+
+    Returns:
+        ResponseCache keyed by jsearch_cache_key
+    """
+    with _jsearch_caches_lock:
+        cache = _jsearch_caches.get(endpoint)
+        if cache is None:
+            if endpoint == "search":
+                ttl_seconds = JSEARCH_SEARCH_TTL_MINUTES * 60
+                cache = ResponseCache("jsearch_search", ttl_seconds=ttl_seconds, stale_seconds=ttl_seconds, memory_items=1024)
+            else:
+                ttl_seconds = JSEARCH_SALARY_TTL_HOURS * 3600
+                cache = ResponseCache("jsearch_salary", ttl_seconds=ttl_seconds, stale_seconds=ttl_seconds)
+            _jsearch_caches[endpoint] = cache
+        return cache
+
+def jsearch_cache_key(url, querystring):
+    """
+    Cache key for a JSearch request, shared by every user and API key
+
+    Values are lowercased with whitespace collapsed, so "Software  Engineer in
+    India" and "software engineer in india" share an entry.
+
+    Args:
+        url: Request URL (includes the base URL, so a mock server never shares entries with RapidAPI)
+        querystring: Query parameters
+
+    Returns:
+        Hex digest string
+    """
+    normalized = {name: " ".join(str(value).lower().split()) for name, value in querystring.items()}
+    return make_cache_key("jsearch", url, normalized)
+
+def is_cacheable_result(result):
+    """Whether a JSearch result may be cached (error dicts are not)"""
+    return not (isinstance(result, dict) and "error" in result)
+
+def _jsearch_api_key(api_key=None):
+    return api_key or os.getenv("JSEARCH_API_KEY", "e534334fbdmsh2a9700703dd7a6bp1ce194jsn0066e50a0a44")
+
+def _jsearch_headers(api_key):
+    return {
+        "X-RapidAPI-Key": api_key,
+        "X-RapidAPI-Host": JSEARCH_HOST
+    }
+
+def build_jobs_request(job_role, location, remote_only=False, page=1, api_key=None):
+    """
+    URL, headers and query parameters for one JSearch results page
     
     Args:
         job_role: Job title to search for
@@ -31,12 +394,9 @@ def fetch_jobs_api(job_role, location, remote_only=False, page=1, api_key=None):
         api_key: RapidAPI key for JSearch
         
     Returns:
-        List of job postings or empty list if error
+        Tuple (url, headers, querystring)
     """
-    if not api_key:
-        api_key = os.getenv("JSEARCH_API_KEY", "e534334fbdmsh2a9700703dd7a6bp1ce194jsn0066e50a0a44")
-    
-    url = "https://jsearch.p.rapidapi.com/search"
+    url = f"{JSEARCH_BASE_URL}/search"
     
     # Prepare query parameters
     query = f"{job_role} in {location}"
@@ -52,35 +412,65 @@ def fetch_jobs_api(job_role, location, remote_only=False, page=1, api_key=None):
         "employment_types": "FULLTIME,CONTRACTOR,PARTTIME,INTERN"
     }
     
-    headers = {
-        "X-RapidAPI-Key": api_key,
-        "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
-    }
+    return url, _jsearch_headers(_jsearch_api_key(api_key)), querystring
+
+def parse_jobs_response(response):
+    """
+    Turn a JSearch /search response into job postings
     
-    try:
-        response = requests.get(url, headers=headers, params=querystring, timeout=30)
-        
-        # Check for rate limiting or other errors
-        if response.status_code == 429:
-            return {"error": "API Rate limit exceeded. Please try again later."}
-        
-        # Check for any other non-200 responses
-        if response.status_code != 200:
-            return {"error": f"API Error: Status code {response.status_code}"}
+    Args:
+        response: requests.Response
         
-        # Process successful response
+    Returns:
+        List of job postings, or dict with an error message
+    """
+    # Check for rate limiting or other errors
+    if response.status_code == 429:
+        return {"error": "API Rate limit exceeded. Please try again later."}
+    
+    # Check for any other non-200 responses
+    if response.status_code != 200:
+        return {"error": f"API Error: Status code {response.status_code}"}
+    
+    # Process successful response
+    try:
         data = response.json()
-        if "data" in data:
-            return data["data"]
-        else:
-            return {"error": "No jobs found or invalid response format."}
-                
-    except requests.exceptions.RequestException as e:
-        return {"error": f"Network error: {str(e)}"}
     except json.JSONDecodeError:
         return {"error": "Error: Invalid JSON response from API"}
+    if "data" in data:
+        return data["data"]
+    else:
+        return {"error": "No jobs found or invalid response format."}
+
+def fetch_jobs_api(job_role, location, remote_only=False, page=1, api_key=None, use_cache=True):
+    """
+    Fetch jobs from JSearch API
+    
+    Args:
+        job_role: Job title to search for
+        location: Location to search in
+        remote_only: Whether to search for remote jobs only
+        page: Page number for pagination
+        api_key: RapidAPI key for JSearch
+        use_cache: Whether to use the shared search cache
+        
+    Returns:
+        List of job postings or empty list if error
+    """
+    url, headers, querystring = build_jobs_request(job_role, location, remote_only, page, api_key)
+    
+    def fetch():
+        try:
+            response = get_jsearch_client().get("search", url, headers=headers, params=querystring)
+            return parse_jobs_response(response)
+        except requests.exceptions.RequestException as e:
+            return {"error": f"Network error: {str(e)}"}
+    
+    if not use_cache:
+        return fetch()
+    return get_jsearch_cache("search").get_or_fetch(jsearch_cache_key(url, querystring), fetch, is_cacheable_result)
 
-def fetch_salary_estimate(job_title, location, experience="ALL", api_key=None):
+def fetch_salary_estimate(job_title, location, experience="ALL", api_key=None, use_cache=True):
     """
     Fetch salary estimate from JSearch API
     
@@ -89,14 +479,12 @@ def fetch_salary_estimate(job_title, location, experience="ALL", api_key=None):
         location: Location to get salary for
         experience: Experience level
         api_key: RapidAPI key for JSearch
+        use_cache: Whether to use the shared salary cache
         
     Returns:
         Salary data or error message
     """
-    if not api_key:
-        api_key = os.getenv("JSEARCH_API_KEY", "e534334fbdmsh2a9700703dd7a6bp1ce194jsn0066e50a0a44")
-    
-    url = "https://jsearch.p.rapidapi.com/estimated-salary"
+    url = f"{JSEARCH_BASE_URL}/estimated-salary"
     
     querystring = {
         "job_title": job_title,
@@ -106,13 +494,19 @@ def fetch_salary_estimate(job_title, location, experience="ALL", api_key=None):
         "years_of_experience": experience
     }
     
-    headers = {
-        "X-RapidAPI-Key": api_key,
-        "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
-    }
+    headers = _jsearch_headers(_jsearch_api_key(api_key))
     
+    if not use_cache:
+        return _request_salary_estimate(url, headers, querystring)
+    return get_jsearch_cache("estimated-salary").get_or_fetch(
+        jsearch_cache_key(url, querystring),
+        lambda: _request_salary_estimate(url, headers, querystring),
+        is_cacheable_result,
+    )
+
+def _request_salary_estimate(url, headers, querystring):
     try:
-        response = requests.get(url, headers=headers, params=querystring, timeout=30)
+        response = get_jsearch_client().get("estimated-salary", url, headers=headers, params=querystring)
         
         # Handle rate limiting
         if response.status_code == 429:
@@ -0,0 +1,314 @@
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from utils.prompt_budget import strip_boilerplate
+from utils.skill_extractor import extract_skills_locally, tokenize
+
+# Points per category, mirroring PROMPT_TEMPLATES["ats_score"]
+CATEGORY_POINTS = 25
+CATEGORIES = {
+    "keyword_match": "Keyword match",
+    "skills_relevance": "Skills relevance",
+    "experience_match": "Experience match",
+    "education": "Education & certifications",
+}
+
+# Frequent job description terms kept as keywords on top of the recognized skills
+MAX_JD_TERMS = 20
+# Job descriptions analyzed per process; bulk screening reuses a handful of them
+JD_CACHE_SIZE = 64
+
+# Words that are frequent in job descriptions but say nothing about the role (degrees and
+# certifications are scored by the education category instead)
+STOPWORDS = set("""
+a about above across after again against all also an and any are as at be been before being below between both
+but by can could did do does doing during each either etc few for from further had has have having here how i if
+in into is it its itself just may more most must no nor not of off on once only or other our ours out over own
+per plus same shall should so some such than that the their them then there these they this those through to
+too under until up upon us very via was we well were what when where which while who whom why will with within
+without would you your yours
+ability able apply applicant applicants candidate candidates company description duties employer environment
+etc excellent experience experienced full good great help ideal including job join key knowledge looking new
+opportunity plus position preferred required requirement requirements responsibilities responsible role
+skills strong team teams time using work working year years
+bachelor bachelors benefits certificate certification certifications certified degree diploma equal master masters
+salary
+""".split())
+
+# Section headings recognized in resumes, by section
+SECTION_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "objective", "about me", "career objective"),
+    "experience": ("experience", "work experience", "professional experience", "employment", "employment history",
+                   "work history", "relevant experience"),
+    "education": ("education", "academic background", "academics", "education and training", "qualifications"),
+    "skills": ("skills", "technical skills", "core competencies", "key skills", "competencies", "tech stack"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects"),
+    "certifications": ("certifications", "certification", "certificates", "licenses", "licenses and certifications",
+                       "courses"),
+}
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+MAX_HEADING_CHARS = 40
+
+# Degree levels, lowest first; a resume meets a requirement at the same level or above
+# Short forms need their dots ("b.s.", "m.a."), otherwise "be", "ms" or "ma" would match ordinary words
+DEGREE_PATTERNS = [
+    (1, re.compile(r"\b(associate'?s? degree|diploma)\b")),
+    (2, re.compile(r"\b(bachelor'?s?|b\.[sae]\.|bsc|b\.sc|btech|b\.tech|undergraduate degree)")),
+    (3, re.compile(r"\b(master'?s?|m\.[sae]\.|msc|m\.sc|mtech|m\.tech|mba|graduate degree)")),
+    (4, re.compile(r"\b(ph\.?d|doctorate|doctoral)")),
+]
+CERTIFICATION_PATTERN = re.compile(r"\b(certified|certification|certifications|certificate|licen[sc]e[ds]?)\b")
+
+_REQUIRED_YEARS = re.compile(
+    r"(\d{1,2})\s*\+?\s*(?:(?:-|–|to)\s*\d{1,2}\s*)?\+?\s*years?(?:\s+of)?(?:\s+[a-z/+#.-]+){0,3}?\s+experience"
+)
+_STATED_YEARS = re.compile(r"(\d{1,2})\s*\+?\s*years?\s+(?:of\s+)?(?:professional\s+|industry\s+|work\s+)?experience")
+_DATE_RANGE = re.compile(
+    r"\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now|today)\b"
+)
+
+_jd_cache = OrderedDict()
+_jd_cache_lock = threading.Lock()
+
+@dataclass(frozen=True, slots=True)
+class JobRequirements:
+    """What a job description asks for, extracted once per distinct text"""
+    skills: tuple
+    terms: tuple
+    required_years: int
+    degree_level: int
+    wants_certification: bool
+
+@dataclass(frozen=True, slots=True)
+class ATSScore:
+    """Deterministic ATS breakdown of one resume against one job description"""
+    total: int
+    keyword_match: int
+    skills_relevance: int
+    experience_match: int
+    education: int
+    matched_keywords: tuple
+    missing_keywords: tuple
+    matched_skills: tuple
+    missing_skills: tuple
+    sections: tuple
+    resume_years: int
+    required_years: int
+
+    def categories(self):
+        """Category label -> points, in the order of the ats_score prompt"""
+        return {label: getattr(self, field) for field, label in CATEGORIES.items()}
+
+    def to_dict(self):
+        return {key: list(value) if isinstance(value, tuple) else value for key, value in asdict(self).items()}
+
+    def summary(self):
+        """
+        Plain text breakdown, as handed to Gemini for the narrative
+
+        Returns:
+            Multi-line string
+        """
+        lines = [f"Overall ATS score: {self.total}/100"]
+        lines += [f"- {label}: {points}/{CATEGORY_POINTS}" for label, points in self.categories().items()]
+        if self.missing_skills:
+            lines.append(f"Required skills not found in the resume: {', '.join(self.missing_skills)}")
+        if self.missing_keywords:
+            lines.append(f"Job keywords not found in the resume: {', '.join(self.missing_keywords)}")
+        lines.append(f"Resume sections found: {', '.join(self.sections) or 'none'}")
+        if self.required_years:
+            lines.append(f"Years of experience: {self.resume_years} (job asks for {self.required_years})")
+        return "\n".join(lines)
+
+def _phrase(tokens):
+    return " " + " ".join(tokens) + " "
+
+def degree_level(text):
+    """
+    Highest degree level mentioned in a text
+
+    Args:
+        text: Lowercased text
+
+    Returns:
+        0 (none), 1 (associate/diploma), 2 (bachelor), 3 (master) or 4 (doctorate)
+    """
+    level = 0
+    for candidate, pattern in DEGREE_PATTERNS:
+        if pattern.search(text):
+            level = candidate
+    return level
+
+def detect_sections(resume_text):
+    """
+    Standard resume sections present, found from their heading lines
+
+    Args:
+        resume_text: Plain text extracted from resume
+
+    Returns:
+        Tuple of section names, in SECTION_HEADINGS order
+    """
+    found = set()
+    for line in resume_text.splitlines():
+        line = line.strip()
+        if not line or len(line) > MAX_HEADING_CHARS:
+            continue
+        heading = re.sub(r"[^a-z& ]+", " ", line.lower()).replace("&", "and")
+        section = _HEADING_LOOKUP.get(" ".join(heading.split()))
+        if section:
+            found.add(section)
+    return tuple(section for section in SECTION_HEADINGS if section in found)
+
+def experience_years(resume_text, now=None):
+    """
+    Years of experience claimed by a resume
+
+    The larger of an explicit "N years of experience" and the span covered
+    by year ranges such as "2018 - 2022" or "2020 – Present" (overlapping
+    ranges are counted once).
+
+    Args:
+        resume_text: Plain text extracted from resume
+        now: Reference date for open-ended ranges
+
+    Returns:
+        Whole years
+    """
+    text = resume_text.lower()
+    current_year = (now or datetime.now()).year
+    stated = max((int(years) for years in _STATED_YEARS.findall(text)), default=0)
+
+    spans = []
+    for start, end in _DATE_RANGE.findall(text):
+        end = current_year if not end.isdigit() else int(end)
+        start = int(start)
+        if start <= end <= current_year:
+            spans.append((start, end))
+    covered, last_end = 0, None
+    for start, end in sorted(spans):
+        if last_end is not None and start < last_end:
+            start = last_end
+        if end > start:
+            covered += end - start
+        last_end = end if last_end is None else max(last_end, end)
+    return max(stated, covered)
+
+def analyze_job_description(job_description):
+    """
+    Skills, keywords and requirements of a job description, memoized per text
+
+    EEO statements, benefits and application instructions are removed first,
+    so they never become required keywords.
+
+    Args:
+        job_description: Job description text
+
+    Returns:
+        JobRequirements instance
+    """
+    with _jd_cache_lock:
+        requirements = _jd_cache.get(job_description)
+        if requirements is not None:
+            _jd_cache.move_to_end(job_description)
+            return requirements
+
+    cleaned, _ = strip_boilerplate(job_description)
+    text = cleaned.lower()
+    skills = tuple(extract_skills_locally(cleaned))
+    skill_tokens = {token for skill in skills for token in tokenize(skill)}
+    counts = Counter(
+        token for token in tokenize(text)
+        if len(token) > 2 and token not in STOPWORDS and token not in skill_tokens and not token[0].isdigit()
+    )
+    terms = tuple(term for term, _ in counts.most_common(MAX_JD_TERMS))
+    # The strictest stated requirement, e.g. 5 for "3+ years of SQL and 5 years of Python experience"
+    required_years = max((int(years) for years in _REQUIRED_YEARS.findall(text) if int(years) <= 30), default=0)
+    requirements = JobRequirements(
+        skills=skills,
+        terms=terms,
+        required_years=required_years,
+        degree_level=degree_level(text),
+        wants_certification=bool(CERTIFICATION_PATTERN.search(text)),
+    )
+
+    with _jd_cache_lock:
+        _jd_cache[job_description] = requirements
+        while len(_jd_cache) > JD_CACHE_SIZE:
+            _jd_cache.popitem(last=False)
+    return requirements
+
+def score_resume_locally(resume_text, job_description, resume_skills=None, now=None):
+    """
+    ATS score of a resume against a job description, without any network call
+
+    Uses the four 25-point categories of the ats_score prompt:
+    - Keyword match: share of job skills (counted twice) and frequent job
+      terms that appear in the resume
+    - Skills relevance: share of the job's skills found among the resume's skills
+    - Experience match: years of experience against the years asked for,
+      plus an experience section
+    - Education & certifications: degree level against the level asked for,
+      plus certifications when the job mentions them
+
+    Args:
+        resume_text: Plain text extracted from resume
+        job_description: Job description text
+        resume_skills: Skills already extracted from the resume, to skip extraction
+        now: Reference date for open-ended experience ranges
+
+    Returns:
+        ATSScore instance
+    """
+    requirements = analyze_job_description(job_description)
+    text = resume_text.lower()
+    resume_phrase = _phrase(tokenize(text))
+    sections = detect_sections(resume_text)
+
+    if resume_skills is None:
+        resume_skills = extract_skills_locally(resume_text)
+    resume_skill_set = {skill.lower() for skill in resume_skills}
+    matched_skills = tuple(
+        skill for skill in requirements.skills
+        if skill in resume_skill_set or _phrase(tokenize(skill)) in resume_phrase
+    )
+    missing_skills = tuple(skill for skill in requirements.skills if skill not in matched_skills)
+    matched_terms = tuple(term for term in requirements.terms if _phrase([term]) in resume_phrase)
+    missing_terms = tuple(term for term in requirements.terms if term not in matched_terms)
+
+    keyword_weight = 2 * len(requirements.skills) + len(requirements.terms)
+    keyword_ratio = (2 * len(matched_skills) + len(matched_terms)) / keyword_weight if keyword_weight else 0.0
+    skills_ratio = len(matched_skills) / len(requirements.skills) if requirements.skills else keyword_ratio
+
+    resume_years = experience_years(resume_text, now)
+    has_experience = "experience" in sections
+    if requirements.required_years:
+        years_ratio = min(1.0, resume_years / requirements.required_years)
+    else:
+        years_ratio = 1.0 if resume_years or has_experience else 0.0
+    experience_ratio = 0.8 * years_ratio + 0.2 * has_experience
+
+    resume_degree = degree_level(text)
+    if requirements.degree_level:
+        degree_ratio = 1.0 if resume_degree >= requirements.degree_level else 0.5 if resume_degree else 0.0
+    else:
+        degree_ratio = 1.0 if resume_degree or "education" in sections else 0.5
+    if requirements.wants_certification:
+        certification_ratio = 1.0 if "certifications" in sections or CERTIFICATION_PATTERN.search(text) else 0.0
+    else:
+        certification_ratio = 1.0
+    education_ratio = 0.7 * degree_ratio + 0.3 * certification_ratio
+
+    points = [round(CATEGORY_POINTS * ratio) for ratio in (keyword_ratio, skills_ratio, experience_ratio, education_ratio)]
+    return ATSScore(
+        sum(points), *points,
+        matched_keywords=matched_skills + matched_terms,
+        missing_keywords=missing_skills + missing_terms,
+        matched_skills=matched_skills,
+        missing_skills=missing_skills,
+        sections=sections,
+        resume_years=resume_years,
+        required_years=requirements.required_years,
+    )
@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+import google.generativeai as genai
+
+DEFAULT_GEMINI_MODEL = "gemini-pro"
+
+# Process-wide client state, shared by every Streamlit session and rerun
+_models = {}
+_configured_key = None
+_warmed_up = set()
+_client_lock = threading.Lock()
+
+def get_gemini_model_name():
+    """
+    Name of the Gemini model to use
+
+    Returns:
+        The GEMINI_MODEL environment variable, or DEFAULT_GEMINI_MODEL
+    """
+    return os.getenv("GEMINI_MODEL", DEFAULT_GEMINI_MODEL)
+
+def configure_gemini(api_key=None):
+    """
+    Configure the Gemini SDK once per process
+
+    Calling it again with the same key (e.g. on every Streamlit rerun) is a no-op.
+
+    Args:
+        api_key: Google API key, defaults to GOOGLE_API_KEY from the environment
+
+    Returns:
+        True if a key is configured, False if none is available
+    """
+    global _configured_key
+    api_key = api_key or os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        return False
+    with _client_lock:
+        if api_key != _configured_key:
+            genai.configure(api_key=api_key)
+            _configured_key = api_key
+            # Models built with the old key must not be reused
+            _models.clear()
+            _warmed_up.clear()
+    return True
+
+def get_gemini_model(model_name=None):
+    """
+    Return the shared GenerativeModel for a model name, creating it on first use
+
+    Args:
+        model_name: Gemini model name, defaults to get_gemini_model_name()
+
+    Returns:
+        genai.GenerativeModel instance
+    """
+    model_name = model_name or get_gemini_model_name()
+    if _configured_key is None:
+        # Headless callers (scripts, batch jobs) may not have configured the SDK yet
+        configure_gemini()
+    with _client_lock:
+        model = _models.get(model_name)
+        if model is None:
+            model = genai.GenerativeModel(model_name)
+            _models[model_name] = model
+        return model
+
+def check_gemini_health(model_name=None):
+    """
+    Cheap round-trip to the model (a token count, no generation)
+
+    Args:
+        model_name: Gemini model name, defaults to get_gemini_model_name()
+
+    Returns:
+        Dict with model, ok, latency_ms and error keys
+    """
+    model_name = model_name or get_gemini_model_name()
+    start = time.perf_counter()
+    try:
+        get_gemini_model(model_name).count_tokens("ping")
+        error = None
+    except Exception as e:
+        error = str(e)
+    return {
+        "model": model_name,
+        "ok": error is None,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+        "error": error,
+    }
+
+def warm_up_gemini(model_name=None, background=True):
+    """
+    Build the model client and open its connection before the first request
+
+    Runs at most once per model per process.
+
+    Args:
+        model_name: Gemini model name, defaults to get_gemini_model_name()
+        background: Run the warm-up call in a daemon thread
+
+    Returns:
+        Health dict when run in the foreground, otherwise None
+    """
+    model_name = model_name or get_gemini_model_name()
+    with _client_lock:
+        if model_name in _warmed_up:
+            return None
+        _warmed_up.add(model_name)
+
+    if background:
+        threading.Thread(target=check_gemini_health, args=(model_name,), daemon=True).start()
+        return None
+    return check_gemini_health(model_name)
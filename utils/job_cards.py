@@ -0,0 +1,187 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from dateutil import parser
+
+SALARY_PERIODS = {"YEAR": "/year", "MONTH": "/month", "HOUR": "/hour"}
+DESCRIPTION_PREVIEW_CHARS = 500
+
+# JSearch fields the cards are built from
+CARD_FIELDS = [
+    "job_id", "job_title", "employer_name", "job_city", "job_state", "job_country",
+    "job_employment_type", "job_posted_at_datetime_utc", "job_apply_link", "job_description",
+    "job_min_salary", "job_max_salary", "job_salary_currency", "job_salary_period",
+]
+
+@dataclass(frozen=True, slots=True)
+class JobCard:
+    """Display-ready job posting; every field is formatted once, at fetch time"""
+    job_id: str
+    title: str
+    company: str
+    location: str
+    job_type: str
+    posted_label: str
+    posted_timestamp: float
+    salary_text: str
+    salary_min: float
+    salary_max: float
+    description: str
+    apply_link: str
+
+def parse_posted_dates(values):
+    """
+    Parse posting dates, ISO 8601 first and dateutil only for the leftovers
+
+    JSearch sends "2024-05-01T08:00:00.000Z", which the ISO fast path
+    converts in one vectorized call; anything else is parsed row by row.
+
+    Args:
+        values: Series of date strings (None allowed)
+
+    Returns:
+        Series of UTC timestamps, NaT where the date is missing or invalid
+    """
+    dates = pd.to_datetime(values, format="ISO8601", utc=True, errors="coerce")
+    leftovers = dates.isna() & values.notna()
+    for position in np.flatnonzero(leftovers.to_numpy()):
+        try:
+            parsed = pd.Timestamp(parser.parse(str(values.iloc[position])))
+            # Dates without a timezone are taken as UTC, like the API's own
+            dates.iloc[position] = parsed.tz_localize("UTC") if parsed.tzinfo is None else parsed.tz_convert("UTC")
+        except (ValueError, TypeError, OverflowError):
+            pass
+    return dates
+
+def posted_labels(dates, now=None):
+    """
+    "Today", "Yesterday", "N days ago" or "Recently" for each date
+
+    Args:
+        dates: Series of UTC timestamps from parse_posted_dates
+        now: Reference time, defaults to the current UTC time
+
+    Returns:
+        Numpy array of labels
+    """
+    now = pd.Timestamp(now or datetime.now(timezone.utc))
+    days_ago = (now - dates).dt.days
+    labels = np.where(days_ago.isna(), "Recently", days_ago.fillna(0).astype(int).astype(str) + " days ago")
+    labels = np.where(days_ago == 0, "Today", labels)
+    return np.where(days_ago == 1, "Yesterday", labels)
+
+def _money(values):
+    return values.fillna(0).astype(np.int64).map("{:,}".format)
+
+def salary_texts(jobs):
+    """
+    Salary range text per posting, "" when no salary is listed
+
+    Args:
+        jobs: DataFrame with job_min_salary, job_max_salary, job_salary_currency and job_salary_period
+
+    Returns:
+        Tuple (texts, salary_min, salary_max) of numpy arrays
+    """
+    salary_min = pd.to_numeric(jobs["job_min_salary"], errors="coerce")
+    salary_max = pd.to_numeric(jobs["job_max_salary"], errors="coerce")
+    currency = jobs["job_salary_currency"].fillna("$").astype(str)
+    period = jobs["job_salary_period"].map(SALARY_PERIODS).fillna("")
+    # Zero means "not listed", as in the API
+    has_min = salary_min.fillna(0) != 0
+    has_max = salary_max.fillna(0) != 0
+
+    low = currency + _money(salary_min)
+    high = currency + _money(salary_max)
+    texts = np.select(
+        [has_min & has_max, has_min, has_max],
+        [low + " - " + high + period, "From " + low + period, "Up to " + high + period],
+        default="",
+    )
+    return texts, salary_min.to_numpy(dtype=float), salary_max.to_numpy(dtype=float)
+
+def locations(jobs):
+    """
+    "City, State" per posting, falling back to the country (or "Remote")
+
+    Args:
+        jobs: DataFrame with job_city, job_state and job_country
+
+    Returns:
+        Numpy array of location strings
+    """
+    city = jobs["job_city"].fillna("").astype(str)
+    state = jobs["job_state"].fillna("").astype(str)
+    city_state = (city + ", " + state).str.strip().str.rstrip(",").str.lstrip(",")
+    country = jobs["job_country"].fillna("Remote").astype(str)
+    return np.where((city != "") | (state != ""), city_state, country)
+
+def build_job_cards(jobs, now=None):
+    """
+    Normalize raw JSearch postings into display-ready JobCard records
+
+    All formatting runs column-wise over the whole result set, so rendering
+    (and re-sorting) only reads attributes.
+
+    Args:
+        jobs: List of job posting dicts from the JSearch API
+        now: Reference time for "days ago" labels
+
+    Returns:
+        List of JobCard, in the order given
+    """
+    if not jobs:
+        return []
+    df = pd.DataFrame.from_records(jobs, columns=CARD_FIELDS)
+
+    dates = parse_posted_dates(df["job_posted_at_datetime_utc"])
+    timestamps = (dates - pd.Timestamp(0, tz="UTC")).dt.total_seconds().fillna(0.0)
+    salary, salary_min, salary_max = salary_texts(df)
+
+    description = df["job_description"].fillna("No description available.").astype(str)
+    long_description = description.str.len() > DESCRIPTION_PREVIEW_CHARS
+    description = description.where(~long_description, description.str.slice(0, DESCRIPTION_PREVIEW_CHARS) + "...")
+
+    columns = zip(
+        df["job_id"].fillna("").astype(str),
+        df["job_title"].fillna("Unknown Position").astype(str),
+        df["employer_name"].fillna("Unknown Company").astype(str),
+        locations(df),
+        df["job_employment_type"].fillna("Full-time").astype(str),
+        posted_labels(dates, now),
+        timestamps.to_numpy(),
+        salary,
+        salary_min,
+        salary_max,
+        description,
+        df["job_apply_link"].fillna("").astype(str),
+    )
+    return [JobCard(*values) for values in columns]
+
+# Orderings offered for a result set; "Relevance" keeps the API's order
+SORT_OPTIONS = ("Relevance", "Newest", "Highest salary")
+
+def sort_job_cards(cards, sort_by):
+    """
+    Reorder cards using their precomputed sort fields
+
+    Args:
+        cards: List of JobCard
+        sort_by: One of SORT_OPTIONS
+
+    Returns:
+        New list of JobCard; ties keep their original order
+    """
+    if sort_by == "Newest":
+        keys = np.array([card.posted_timestamp for card in cards], dtype=float)
+    elif sort_by == "Highest salary":
+        keys = np.fmax(
+            np.array([card.salary_min for card in cards], dtype=float),
+            np.array([card.salary_max for card in cards], dtype=float),
+        )
+    else:
+        return list(cards)
+    # Missing dates or salaries go last
+    keys = np.nan_to_num(keys, nan=-np.inf)
+    return [cards[i] for i in np.argsort(-keys, kind="stable")]
@@ -0,0 +1,359 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from utils.job_store import JobStore, write_job_store
+from utils.skills import split_skills
+
+DEFAULT_CSV_PATH = "data/cleaned_job_skills.csv"
+DEFAULT_INDEX_DIR = "data/job_index"
+
+INDEX_VERSION = 4
+MANIFEST_FILE = "manifest.json"
+# CSR components are kept as plain .npy files (not .npz) so they can be memory-mapped
+MATRIX_FILES = ("data", "indices", "indptr")
+# Inverted index: job rows for skill id i are postings_indices[postings_indptr[i]:postings_indptr[i + 1]]
+POSTINGS_FILES = ("indices", "indptr")
+IDF_FILE = "idf.npy"
+STORE_DIR = "store"
+
+# Rows of the job matrix scored per step, and queries scored together, when
+# searching in batch; peak memory is about QUERY_BLOCK * CHUNK_ROWS floats
+DEFAULT_CHUNK_ROWS = 20000
+DEFAULT_QUERY_BLOCK = 256
+
+# One loaded index per (csv, index dir) for the lifetime of the process
+_loaded_indexes = {}
+_load_lock = threading.Lock()
+
+class JobIndex:
+    """
+    Prebuilt TF-IDF index over the job skills corpus
+
+    Holds the fitted vectorizer, the L2-normalized job skill matrix (CSR),
+    the inverted index from skill id to job rows and a memory-mapped
+    JobStore with the rows the matrix was built from, in the same order.
+    Tokens are whole normalized skills (see utils.skills.split_skills).
+    """
+
+    def __init__(self, vectorizer, matrix, postings, jobs, manifest, index_dir):
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        self.postings_indices, self.postings_indptr = postings
+        self.jobs = jobs
+        self.manifest = manifest
+        self.index_dir = index_dir
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def transform(self, texts):
+        """Vectorize query texts with the stored vocabulary and IDF weights"""
+        return self.vectorizer.transform(texts)
+
+    def score(self, user_skills):
+        """
+        Cosine similarity of a skills string against every job
+
+        Args:
+            user_skills: Comma-separated string of user skills
+
+        Returns:
+            1-D numpy array of similarities, one per job row
+        """
+        user_vector = self.transform([user_skills])
+        # Rows are L2-normalized by TfidfVectorizer, so the dot product is the cosine
+        return (self.matrix @ user_vector.T).toarray().ravel()
+
+    def candidate_rows(self, skill_ids):
+        """
+        Job rows that share at least one skill with the query
+
+        Args:
+            skill_ids: Vocabulary ids of the query skills
+
+        Returns:
+            Sorted numpy array of unique job row positions
+        """
+        postings = [
+            self.postings_indices[self.postings_indptr[i]:self.postings_indptr[i + 1]] for i in skill_ids
+        ]
+        if not postings:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(postings))
+
+    def score_candidates(self, user_skills):
+        """
+        Score only the jobs reachable from the query skills in the inverted index
+
+        Jobs sharing no skill with the query have a cosine of zero, so they are
+        skipped entirely and latency follows the size of the query's postings
+        instead of the size of the corpus.
+
+        Args:
+            user_skills: Comma-separated string of user skills
+
+        Returns:
+            Tuple (rows, scores) of numpy arrays
+        """
+        user_vector = self.transform([user_skills])
+        rows = self.candidate_rows(user_vector.indices)
+        if not len(rows):
+            return rows, np.zeros(0, dtype=np.float64)
+        scores = (self.matrix[rows] @ user_vector.T).toarray().ravel()
+        return rows, scores
+
+    def search(self, queries, top_n=5, chunk_rows=DEFAULT_CHUNK_ROWS, query_block=DEFAULT_QUERY_BLOCK):
+        """
+        Top-N jobs for many skill strings in one pass over the job matrix
+
+        Queries are vectorized into one sparse matrix and the job matrix is
+        streamed in row chunks, keeping a running top-N per query with
+        argpartition instead of sorting every score.
+
+        Args:
+            queries: List of skill strings
+            top_n: Number of matches to keep per query
+            chunk_rows: Job rows scored per step
+            query_block: Queries scored together per step
+
+        Returns:
+            Tuple (indices, scores) of arrays shaped (len(queries), top_n),
+            best match first
+        """
+        top_n = min(top_n, len(self))
+        all_indices = np.zeros((len(queries), top_n), dtype=np.int64)
+        all_scores = np.zeros((len(queries), top_n), dtype=np.float64)
+        if top_n <= 0 or not len(queries):
+            return all_indices, all_scores
+
+        query_vectors = self.transform(queries).tocsr()
+        for q_start in range(0, query_vectors.shape[0], query_block):
+            block = query_vectors[q_start:q_start + query_block]
+            best_scores = np.full((block.shape[0], 0), -np.inf)
+            best_indices = np.zeros((block.shape[0], 0), dtype=np.int64)
+
+            for start in range(0, len(self), chunk_rows):
+                chunk = self.matrix[start:start + chunk_rows]
+                chunk_scores = (block @ chunk.T).toarray()
+                chunk_indices = np.broadcast_to(
+                    np.arange(start, start + chunk.shape[0], dtype=np.int64), chunk_scores.shape
+                )
+                candidate_scores = np.hstack([best_scores, chunk_scores])
+                candidate_indices = np.hstack([best_indices, chunk_indices])
+                if candidate_scores.shape[1] > top_n:
+                    keep = np.argpartition(candidate_scores, -top_n, axis=1)[:, -top_n:]
+                    candidate_scores = np.take_along_axis(candidate_scores, keep, axis=1)
+                    candidate_indices = np.take_along_axis(candidate_indices, keep, axis=1)
+                best_scores, best_indices = candidate_scores, candidate_indices
+
+            # Only top_n columns are left, so ordering them is cheap
+            order = np.argsort(-best_scores, axis=1, kind="stable")
+            q_end = q_start + block.shape[0]
+            all_scores[q_start:q_end] = np.take_along_axis(best_scores, order, axis=1)
+            all_indices[q_start:q_end] = np.take_along_axis(best_indices, order, axis=1)
+
+        return all_indices, all_scores
+
+def top_n_indices(scores, top_n):
+    """
+    Positions of the top_n largest scores, best first, without a full sort
+
+    Args:
+        scores: 1-D numpy array of scores
+        top_n: Number of positions to return
+
+    Returns:
+        Numpy array of at most top_n positions
+    """
+    top_n = min(top_n, len(scores))
+    if top_n <= 0:
+        return np.zeros(0, dtype=np.int64)
+    candidates = np.argpartition(scores, -top_n)[-top_n:]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+def file_fingerprint(path, with_hash=True):
+    """
+    Describe a file by size, mtime and (optionally) SHA-256 of its content
+
+    Args:
+        path: Path to the file
+        with_hash: Whether to hash the file content
+
+    Returns:
+        Dict with size, mtime_ns and sha256 keys
+    """
+    stat = os.stat(path)
+    fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": None}
+    if with_hash:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        fingerprint["sha256"] = digest.hexdigest()
+    return fingerprint
+
+def load_job_rows(csv_path=DEFAULT_CSV_PATH):
+    """
+    Read the job corpus rows that the index is built over
+
+    Args:
+        csv_path: Path to the cleaned job skills CSV
+
+    Returns:
+        DataFrame with job_link and job_skills, NaN skills dropped
+    """
+    df = pd.read_csv(csv_path, usecols=["job_link", "job_skills"])
+    return df.dropna(subset=["job_skills"]).reset_index(drop=True)
+
+def _read_manifest(index_dir):
+    manifest_path = os.path.join(index_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def _write_manifest(index_dir, manifest):
+    # Write then rename so a concurrent reader never sees a half-written manifest
+    manifest_path = os.path.join(index_dir, MANIFEST_FILE)
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+
+def build_job_index(csv_path=DEFAULT_CSV_PATH, index_dir=DEFAULT_INDEX_DIR):
+    """
+    Fit the TF-IDF vectorizer once and save vocabulary, IDF weights and matrix
+
+    Args:
+        csv_path: Path to the cleaned job skills CSV
+        index_dir: Directory the index files are written to
+
+    Returns:
+        The manifest dict describing the saved index
+    """
+    start = time.perf_counter()
+    os.makedirs(index_dir, exist_ok=True)
+    fingerprint = file_fingerprint(csv_path)
+
+    jobs = load_job_rows(csv_path)
+    vectorizer = TfidfVectorizer(analyzer=split_skills)
+    job_skill_vectors = vectorizer.fit_transform(jobs["job_skills"]).tocsr()
+    postings = job_skill_vectors.tocsc()
+
+    for name in MATRIX_FILES:
+        np.save(os.path.join(index_dir, f"matrix_{name}.npy"), getattr(job_skill_vectors, name))
+    for name in POSTINGS_FILES:
+        np.save(os.path.join(index_dir, f"postings_{name}.npy"), getattr(postings, name))
+    write_job_store(jobs, os.path.join(index_dir, STORE_DIR))
+    np.save(os.path.join(index_dir, IDF_FILE), vectorizer.idf_)
+
+    manifest = {
+        "version": INDEX_VERSION,
+        "csv_path": os.path.abspath(csv_path),
+        "csv": fingerprint,
+        "num_jobs": int(job_skill_vectors.shape[0]),
+        "num_terms": int(job_skill_vectors.shape[1]),
+        # Plain ints so the vocabulary is JSON serializable
+        "vocabulary": {term: int(i) for term, i in vectorizer.vocabulary_.items()},
+        "built_at": time.time(),
+        "build_seconds": round(time.perf_counter() - start, 3),
+    }
+    _write_manifest(index_dir, manifest)
+    return manifest
+
+def is_index_fresh(csv_path=DEFAULT_CSV_PATH, index_dir=DEFAULT_INDEX_DIR, manifest=None):
+    """
+    Check whether the saved index still matches the CSV it was built from
+
+    Size and mtime are compared first; the content hash is only computed
+    when they differ, so an unchanged CSV costs a single stat call.
+
+    Args:
+        csv_path: Path to the cleaned job skills CSV
+        index_dir: Directory holding the index files
+        manifest: Already loaded manifest, read from disk if omitted
+
+    Returns:
+        True if the index can be reused as-is
+    """
+    manifest = manifest or _read_manifest(index_dir)
+    if not manifest or manifest.get("version") != INDEX_VERSION:
+        return False
+    if not os.path.exists(os.path.join(index_dir, f"matrix_{MATRIX_FILES[-1]}.npy")):
+        return False
+
+    saved = manifest["csv"]
+    current = file_fingerprint(csv_path, with_hash=False)
+    if current["size"] == saved["size"] and current["mtime_ns"] == saved["mtime_ns"]:
+        return True
+
+    # The file was touched; only rebuild if its content actually changed
+    current = file_fingerprint(csv_path)
+    if current["sha256"] != saved["sha256"]:
+        return False
+    manifest["csv"] = current
+    _write_manifest(index_dir, manifest)
+    return True
+
+def _load_from_disk(index_dir, manifest):
+    vectorizer = TfidfVectorizer(analyzer=split_skills, vocabulary=manifest["vocabulary"])
+    vectorizer.idf_ = np.load(os.path.join(index_dir, IDF_FILE))
+    data, indices, indptr = (
+        np.load(os.path.join(index_dir, f"matrix_{name}.npy"), mmap_mode="r") for name in MATRIX_FILES
+    )
+    shape = (manifest["num_jobs"], manifest["num_terms"])
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+    postings = tuple(
+        np.load(os.path.join(index_dir, f"postings_{name}.npy"), mmap_mode="r") for name in POSTINGS_FILES
+    )
+    jobs = JobStore(os.path.join(index_dir, STORE_DIR))
+    if len(jobs) != matrix.shape[0]:
+        raise ValueError("Job index does not match the job corpus, rebuild required")
+    return JobIndex(vectorizer, matrix, postings, jobs, manifest, index_dir)
+
+def get_job_index(csv_path=DEFAULT_CSV_PATH, index_dir=DEFAULT_INDEX_DIR):
+    """
+    Return the process-wide job index, building or rebuilding it if stale
+
+    Args:
+        csv_path: Path to the cleaned job skills CSV
+        index_dir: Directory holding the index files
+
+    Returns:
+        JobIndex instance
+    """
+    key = (os.path.abspath(csv_path), os.path.abspath(index_dir))
+    with _load_lock:
+        index = _loaded_indexes.get(key)
+        if index is not None and is_index_fresh(csv_path, index_dir, index.manifest):
+            return index
+
+        manifest = _read_manifest(index_dir)
+        if not is_index_fresh(csv_path, index_dir, manifest):
+            manifest = build_job_index(csv_path, index_dir)
+        try:
+            index = _load_from_disk(index_dir, manifest)
+        except (OSError, ValueError):
+            # Missing or partial index files, e.g. an interrupted build
+            manifest = build_job_index(csv_path, index_dir)
+            index = _load_from_disk(index_dir, manifest)
+
+        _loaded_indexes[key] = index
+        return index
+
+if __name__ == "__main__":
+    # Offline build step: python -m utils.job_index [csv_path] [index_dir]
+    csv_arg = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CSV_PATH
+    dir_arg = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_INDEX_DIR
+    built = build_job_index(csv_arg, dir_arg)
+    print(f"✅ Indexed {built['num_jobs']} jobs ({built['num_terms']} terms) in {built['build_seconds']}s -> {dir_arg}")
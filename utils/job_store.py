@@ -0,0 +1,106 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+
+STORE_COLUMNS = ("job_link", "job_skills")
+STORE_META_FILE = "store.json"
+
+def _column_paths(store_dir, column):
+    return (
+        os.path.join(store_dir, f"{column}.bin"),
+        os.path.join(store_dir, f"{column}.offsets.npy"),
+    )
+
+def write_job_store(jobs, store_dir, columns=STORE_COLUMNS):
+    """
+    Write job rows to a columnar, offset-indexed on-disk store
+
+    Each column is saved as one UTF-8 blob of all values back to back plus an
+    int64 offsets array of length n + 1, so row i is blob[offsets[i]:offsets[i + 1]].
+
+    Args:
+        jobs: DataFrame holding the columns to store
+        store_dir: Directory the store files are written to
+        columns: Column names to store
+
+    Returns:
+        Number of rows written
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    for column in columns:
+        blob_path, offsets_path = _column_paths(store_dir, column)
+        values = jobs[column].fillna("").astype(str)
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        with open(blob_path, "wb") as f:
+            position = 0
+            for i, value in enumerate(values):
+                encoded = value.encode("utf-8")
+                f.write(encoded)
+                position += len(encoded)
+                offsets[i + 1] = position
+        np.save(offsets_path, offsets)
+
+    with open(os.path.join(store_dir, STORE_META_FILE), "w", encoding="utf-8") as f:
+        json.dump({"num_rows": len(jobs), "columns": list(columns)}, f)
+    return len(jobs)
+
+class JobStore:
+    """
+    Read-only, memory-mapped view of a job store written by write_job_store
+
+    Nothing is read up front; only the pages holding the requested rows are
+    touched, and the OS page cache is shared by every process that opens the
+    same store.
+    """
+
+    def __init__(self, store_dir):
+        with open(os.path.join(store_dir, STORE_META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.store_dir = store_dir
+        self.columns = tuple(meta["columns"])
+        self.num_rows = meta["num_rows"]
+        self._blobs = {}
+        self._offsets = {}
+        for column in self.columns:
+            blob_path, offsets_path = _column_paths(store_dir, column)
+            self._offsets[column] = np.load(offsets_path, mmap_mode="r")
+            # np.memmap refuses empty files, which happens for an all-empty column
+            if os.path.getsize(blob_path) > 0:
+                self._blobs[column] = np.memmap(blob_path, dtype=np.uint8, mode="r")
+            else:
+                self._blobs[column] = np.zeros(0, dtype=np.uint8)
+
+    def __len__(self):
+        return self.num_rows
+
+    def get(self, row, column):
+        """
+        Read a single value
+
+        Args:
+            row: Row position
+            column: Column name
+
+        Returns:
+            The stored string
+        """
+        offsets = self._offsets[column]
+        start, end = int(offsets[row]), int(offsets[row + 1])
+        return self._blobs[column][start:end].tobytes().decode("utf-8")
+
+    def take(self, rows, columns=None):
+        """
+        Read a handful of rows into a DataFrame
+
+        Args:
+            rows: Sequence of row positions
+            columns: Column names to read, all stored columns if omitted
+
+        Returns:
+            DataFrame indexed by row position
+        """
+        rows = [int(row) for row in rows]
+        columns = columns or self.columns
+        data = {column: [self.get(row, column) for row in rows] for column in columns}
+        return pd.DataFrame(data, index=rows)
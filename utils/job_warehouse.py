@@ -0,0 +1,314 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from utils.job_index import get_job_index
+from utils.skill_extractor import extract_skills_locally, merge_skill_lists
+
+DEFAULT_WAREHOUSE_PATH = "data/job_warehouse.sqlite"
+
+# One warehouse per path, and one live index per (warehouse, base index), per process
+_warehouses = {}
+_live_indexes = {}
+_live_lock = threading.Lock()
+
+def _posting_location(posting):
+    parts = [posting.get("job_city"), posting.get("job_state"), posting.get("job_country")]
+    return ", ".join(part for part in parts if part)
+
+def posting_skills(posting):
+    """
+    Skills of a JSearch posting, as a comma-separated string
+
+    Skills listed by the API are kept and merged with those found in the
+    title, description and qualifications by the local skill extractor.
+
+    Args:
+        posting: Job posting dict from the JSearch API
+
+    Returns:
+        Comma-separated skills string in the format of cleaned_job_skills.csv
+    """
+    highlights = posting.get("job_highlights") or {}
+    text = "\n".join(
+        [posting.get("job_title") or "", posting.get("job_description") or ""]
+        + list(highlights.get("Qualifications") or [])
+    )
+    listed = posting.get("job_required_skills") or []
+    return ", ".join(merge_skill_lists(listed, extract_skills_locally(text)))
+
+class JobWarehouse:
+    """
+    SQLite store of job postings fetched from JSearch
+
+    Postings are deduplicated by job_id and by apply link, and every row gets
+    an increasing id, so readers can pick up only what was added since they
+    last looked.
+    """
+
+    def __init__(self, path=DEFAULT_WAREHOUSE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS postings ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT NOT NULL UNIQUE, apply_link TEXT, "
+                "job_title TEXT, employer_name TEXT, location TEXT, posted_at TEXT, job_skills TEXT NOT NULL, "
+                "raw TEXT NOT NULL, ingested_at REAL NOT NULL, last_seen_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS postings_apply_link ON postings (apply_link)")
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per operation keeps the warehouse safe across Streamlit threads
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+    def ingest(self, postings):
+        """
+        Store new postings, skipping ones already in the warehouse
+
+        Skills are only extracted for postings that are actually new.
+
+        Args:
+            postings: List of job posting dicts from the JSearch API
+
+        Returns:
+            Dict with inserted and duplicates counts
+        """
+        now = time.time()
+        postings = [p for p in postings if p.get("job_id")]
+        with self._connect() as conn:
+            seen_ids = {
+                row[0] for row in conn.execute(
+                    f"SELECT job_id FROM postings WHERE job_id IN ({','.join('?' * len(postings))})",
+                    [p["job_id"] for p in postings],
+                )
+            } if postings else set()
+            links = [p.get("job_apply_link") for p in postings if p.get("job_apply_link")]
+            seen_links = {
+                row[0] for row in conn.execute(
+                    f"SELECT apply_link FROM postings WHERE apply_link IN ({','.join('?' * len(links))})", links
+                )
+            } if links else set()
+
+            rows, duplicates = [], []
+            for posting in postings:
+                link = posting.get("job_apply_link") or None
+                if posting["job_id"] in seen_ids or (link and link in seen_links):
+                    duplicates.append((now, posting["job_id"], link))
+                    continue
+                # Also dedupe within the batch
+                seen_ids.add(posting["job_id"])
+                if link:
+                    seen_links.add(link)
+                rows.append((
+                    posting["job_id"], link, posting.get("job_title"), posting.get("employer_name"),
+                    _posting_location(posting), posting.get("job_posted_at_datetime_utc"),
+                    posting_skills(posting), json.dumps(posting), now, now,
+                ))
+
+            conn.executemany(
+                "INSERT OR IGNORE INTO postings (job_id, apply_link, job_title, employer_name, location, posted_at, "
+                "job_skills, raw, ingested_at, last_seen_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany(
+                "UPDATE postings SET last_seen_at = ? WHERE job_id = ? OR apply_link = ?", duplicates
+            )
+        return {"inserted": len(rows), "duplicates": len(duplicates)}
+
+    def rows_after(self, last_id):
+        """
+        Postings added after a given row id, oldest first
+
+        Args:
+            last_id: Highest id already seen (0 for everything)
+
+        Returns:
+            List of (id, job_skills) tuples
+        """
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT id, job_skills FROM postings WHERE id > ? ORDER BY id", (last_id,)
+            ).fetchall()
+
+    def take(self, ids):
+        """
+        Read postings by id into a DataFrame
+
+        Args:
+            ids: Sequence of posting ids
+
+        Returns:
+            DataFrame indexed by id, in the order given
+        """
+        ids = [int(i) for i in ids]
+        columns = ["id", "job_apply_link", "job_skills", "job_title", "employer_name", "location", "posted_at"]
+        if not ids:
+            return pd.DataFrame(columns=columns[1:])
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, apply_link, job_skills, job_title, employer_name, location, posted_at FROM postings "
+                f"WHERE id IN ({','.join('?' * len(ids))})",
+                ids,
+            ).fetchall()
+        df = pd.DataFrame(rows, columns=columns).set_index("id")
+        return df.loc[[i for i in ids if i in df.index]]
+
+class LiveJobIndex:
+    """
+    TF-IDF matrix over warehouse postings that grows without a rebuild
+
+    New postings are vectorized with the base JobIndex vocabulary and IDF
+    weights and appended, so their scores are directly comparable with the
+    base index. Skills missing from the base vocabulary (which comes from
+    cleaned_job_skills.csv) do not contribute to scores.
+    """
+
+    def __init__(self, job_index, warehouse):
+        self.job_index = job_index
+        self.warehouse = warehouse
+        self.matrix = sparse.csr_matrix((0, len(job_index.vectorizer.vocabulary_)), dtype=np.float64)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.last_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def refresh(self):
+        """
+        Vectorize and append postings ingested since the last refresh
+
+        Returns:
+            Number of postings added
+        """
+        with self._lock:
+            rows = self.warehouse.rows_after(self.last_id)
+            if not rows:
+                return 0
+            ids, skills = zip(*rows)
+            vectors = self.job_index.transform(list(skills)).tocsr()
+            self.matrix = sparse.vstack([self.matrix, vectors], format="csr")
+            self.ids = np.concatenate([self.ids, np.asarray(ids, dtype=np.int64)])
+            self.last_id = ids[-1]
+            return len(rows)
+
+    def score_candidates(self, user_skills):
+        """
+        Score every live posting that shares a skill with the query
+
+        Args:
+            user_skills: Comma-separated string of user skills
+
+        Returns:
+            Tuple (positions, scores) of numpy arrays
+        """
+        with self._lock:
+            matrix = self.matrix
+        if not matrix.shape[0]:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+        scores = (matrix @ self.job_index.transform([user_skills]).T).toarray().ravel()
+        positions = np.flatnonzero(scores)
+        return positions, scores[positions]
+
+    def take(self, positions):
+        """
+        Posting rows for live matrix positions
+
+        Args:
+            positions: Sequence of positions in the live matrix
+
+        Returns:
+            DataFrame with job_link and job_skills (plus posting details), indexed by posting id
+        """
+        df = self.warehouse.take(self.ids[np.asarray(positions, dtype=np.int64)])
+        return df.rename(columns={"job_apply_link": "job_link"})
+
+def get_job_warehouse(path=DEFAULT_WAREHOUSE_PATH):
+    """Process-wide JobWarehouse for a path, created (with its table) on first use"""
+    key = os.path.abspath(path)
+    with _live_lock:
+        warehouse = _warehouses.get(key)
+        if warehouse is None:
+            warehouse = _warehouses[key] = JobWarehouse(path)
+        return warehouse
+
+def get_live_index(path=DEFAULT_WAREHOUSE_PATH):
+    """
+    Process-wide live index over the warehouse, caught up to its latest posting
+
+    Rebuilt from the warehouse only when the base job index is rebuilt;
+    otherwise each call appends just the postings ingested since the last one.
+
+    Args:
+        path: Warehouse SQLite path
+
+    Returns:
+        LiveJobIndex instance
+    """
+    job_index = get_job_index()
+    warehouse = get_job_warehouse(path)
+    key = (os.path.abspath(path), job_index.manifest["csv"]["sha256"])
+    with _live_lock:
+        live = _live_indexes.get(key)
+        if live is None or live.job_index is not job_index:
+            _live_indexes.pop(key, None)
+            live = LiveJobIndex(job_index, warehouse)
+            _live_indexes[key] = live
+    live.refresh()
+    return live
+
+def ingest_postings(postings, path=DEFAULT_WAREHOUSE_PATH):
+    """
+    Store fetched postings and make them searchable by find_job_matches
+
+    Args:
+        postings: List of job posting dicts from the JSearch API
+        path: Warehouse SQLite path
+
+    Returns:
+        Dict with inserted and duplicates counts
+    """
+    counts = get_job_warehouse(path).ingest(postings)
+    if counts["inserted"]:
+        get_live_index(path)
+    return counts
+
+if __name__ == "__main__":
+    # Batch ingestion: python -m utils.job_warehouse "Data Scientist" "India" --pages 5
+    from utils.jsearch_client import collect_jobs, fetch_jobs_pages
+
+    parser = argparse.ArgumentParser(description="Fetch JSearch postings into the local job warehouse")
+    parser.add_argument("job_role")
+    parser.add_argument("location")
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--remote-only", action="store_true")
+    parser.add_argument("--warehouse", default=DEFAULT_WAREHOUSE_PATH)
+    args = parser.parse_args()
+
+    jobs, error = collect_jobs(fetch_jobs_pages(args.job_role, args.location, args.remote_only, args.pages))
+    if error:
+        print(f"⚠️ {error}")
+    start = time.perf_counter()
+    counts = ingest_postings(jobs, args.warehouse)
+    print(
+        f"✅ {counts['inserted']} new, {counts['duplicates']} duplicate postings in "
+        f"{time.perf_counter() - start:.2f}s -> {args.warehouse}"
+    )
@@ -0,0 +1,231 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import requests
+from utils.api_utils import (
+    SERVER_ERROR_STATUSES, JSearchClient, build_jobs_request, get_jsearch_cache,
+    is_cacheable_result, jsearch_cache_key, parse_jobs_response,
+)
+
+# Request budget shared by every session in the process (the RapidAPI quota is per key)
+JSEARCH_RATE_PER_SECOND = float(os.getenv("JSEARCH_RATE_PER_SECOND", "5"))
+JSEARCH_BURST = int(os.getenv("JSEARCH_BURST", "5"))
+# Pages in flight at once for a single search
+JSEARCH_MAX_CONCURRENCY = int(os.getenv("JSEARCH_MAX_CONCURRENCY", "5"))
+
+MAX_ATTEMPTS = 4
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+class TokenBucket:
+    """
+    Thread-safe token bucket usable from any event loop
+
+    rate tokens are added per second up to capacity. pause() blocks every
+    caller until a point in time, which is how a 429 Retry-After is honoured
+    across all concurrent requests rather than only the one that got it.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _try_acquire(self):
+        # Returns 0 when a token was taken, otherwise seconds to wait
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        while True:
+            wait = self._try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold back every request for the next `seconds` seconds"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+rate_limiter = TokenBucket(JSEARCH_RATE_PER_SECOND, JSEARCH_BURST)
+
+# 5xx responses are retried inside the session; 429s are left to the token
+# bucket so one Retry-After holds back every page, not just the one that got it
+page_client = JSearchClient(retry_statuses=SERVER_ERROR_STATUSES, pool_size=max(10, JSEARCH_MAX_CONCURRENCY))
+
+def retry_after_seconds(response):
+    """
+    Delay requested by a Retry-After header (seconds or HTTP date)
+
+    Args:
+        response: requests.Response
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_seconds(attempt):
+    """Exponential backoff with full jitter for retry number `attempt` (0-based)"""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+async def _request_page(url, headers, querystring, limiter):
+    for attempt in range(MAX_ATTEMPTS):
+        await limiter.acquire()
+        try:
+            response = await asyncio.to_thread(page_client.get, "search", url, headers, querystring)
+        except requests.exceptions.RequestException as e:
+            return {"error": f"Network error: {str(e)}"}
+
+        if response.status_code != 429 or attempt == MAX_ATTEMPTS - 1:
+            return parse_jobs_response(response)
+
+        # Jitter on top of Retry-After so concurrent pages do not retry in lockstep
+        delay = retry_after_seconds(response)
+        delay = backoff_seconds(attempt) if delay is None else delay + random.uniform(0, BACKOFF_BASE_SECONDS)
+        limiter.pause(delay)
+    return parse_jobs_response(response)
+
+async def fetch_jobs_page_async(job_role, location, remote_only, page, api_key=None, limiter=None, use_cache=True):
+    """
+    Fetch one results page under the rate limiter, retrying on 429
+
+    Cached pages are returned without touching the limiter. Stale pages are
+    returned immediately and refreshed on a background thread, and a page
+    already being fetched for another user is awaited (for at most
+    the cache's INFLIGHT_WAIT_SECONDS) rather than requested again.
+
+    Args:
+        job_role: Job title to search for
+        location: Location to search in
+        remote_only: Whether to search for remote jobs only
+        page: Page number
+        api_key: RapidAPI key for JSearch
+        limiter: TokenBucket to use, defaults to the shared rate_limiter
+        use_cache: Whether to use the shared search cache
+
+    Returns:
+        List of job postings, or dict with an error message
+    """
+    limiter = limiter or rate_limiter
+    url, headers, querystring = build_jobs_request(job_role, location, remote_only, page, api_key)
+    if not use_cache:
+        return await _request_page(url, headers, querystring, limiter)
+
+    cache = get_jsearch_cache("search")
+    key = jsearch_cache_key(url, querystring)
+    value, state = cache.lookup(key)
+    if state == "fresh":
+        return value
+    future, owner = cache.claim(key)
+    if state == "stale":
+        if owner:
+            # This event loop ends with the search, so refresh on a loop of its own
+            cache.refresh_in_background(
+                key, future, lambda: asyncio.run(_request_page(url, headers, querystring, limiter)), is_cacheable_result
+            )
+        return value
+    if not owner:
+        return await cache.wait_async(future, lambda: _request_page(url, headers, querystring, limiter))
+    try:
+        value = await _request_page(url, headers, querystring, limiter)
+    except Exception as e:
+        cache.resolve(key, future, error=e)
+        raise
+    except BaseException:
+        # Cancelled (e.g. the user reran the app mid-search): release the claim
+        # so later fetches of this page do not wait for it forever
+        cache.abandon(key, future)
+        raise
+    cache.resolve(key, future, value, store=is_cacheable_result(value))
+    return value
+
+async def _fetch_pages(job_role, location, remote_only, pages, api_key, on_page, limiter, max_concurrency, use_cache):
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(page):
+        async with semaphore:
+            return page, await fetch_jobs_page_async(job_role, location, remote_only, page, api_key, limiter, use_cache)
+
+    results = {}
+    for future in asyncio.as_completed([fetch(page) for page in pages]):
+        page, result = await future
+        results[page] = result
+        if on_page is not None:
+            on_page(page, result)
+    return results
+
+def fetch_jobs_pages(job_role, location, remote_only=False, num_pages=1, api_key=None,
+                     on_page=None, limiter=None, max_concurrency=JSEARCH_MAX_CONCURRENCY, use_cache=True):
+    """
+    Fetch several JSearch results pages concurrently
+
+    Pages are requested at once (bounded by max_concurrency and the shared
+    token bucket) and on_page is called from the calling thread as each one
+    arrives, in completion order.
+
+    Args:
+        job_role: Job title to search for
+        location: Location to search in
+        remote_only: Whether to search for remote jobs only
+        num_pages: Pages to fetch, starting at 1
+        api_key: RapidAPI key for JSearch
+        on_page: Optional callback(page, result) for each finished page
+        limiter: TokenBucket to use, defaults to the shared rate_limiter
+        max_concurrency: Maximum pages in flight
+        use_cache: Whether to use the shared search cache
+
+    Returns:
+        Dict of page number -> list of postings or error dict
+    """
+    pages = range(1, num_pages + 1)
+    return asyncio.run(
+        _fetch_pages(job_role, location, remote_only, pages, api_key, on_page, limiter, max_concurrency, use_cache)
+    )
+
+def collect_jobs(page_results):
+    """
+    Concatenate page results in page order, stopping at the first empty page
+
+    Args:
+        page_results: Dict of page number -> list of postings or error dict
+
+    Returns:
+        Tuple (jobs, error) where error is the first error message or None
+    """
+    jobs = []
+    for page in sorted(page_results):
+        result = page_results[page]
+        if isinstance(result, dict) and "error" in result:
+            return jobs, result["error"]
+        if not result:
+            break
+        jobs.extend(result)
+    return jobs, None
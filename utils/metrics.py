@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import defaultdict, deque
+
+# Most recent samples kept per metric name
+MAX_SAMPLES = 1000
+
+_samples = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+_metrics_lock = threading.Lock()
+
+def record_metric(name, **values):
+    """
+    Record one sample of a named metric for this process
+
+    Args:
+        name: Metric name, e.g. "gemini.ats_score"
+        values: Numeric (or descriptive) fields of the sample
+    """
+    sample = {"timestamp": time.time(), **values}
+    with _metrics_lock:
+        _samples[name].append(sample)
+
+def get_metric_samples(name):
+    """
+    Recorded samples of a metric, oldest first
+
+    Args:
+        name: Metric name
+
+    Returns:
+        List of sample dicts
+    """
+    with _metrics_lock:
+        return list(_samples.get(name, ()))
+
+def metric_names():
+    """Names of every metric recorded so far"""
+    with _metrics_lock:
+        return sorted(_samples)
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def _summarize(sorted_values):
+    return {
+        "count": len(sorted_values),
+        "mean": sum(sorted_values) / len(sorted_values),
+        "p50": _percentile(sorted_values, 0.5),
+        "p95": _percentile(sorted_values, 0.95),
+        "max": sorted_values[-1],
+    }
+
+def summarize_values(values):
+    """
+    Count, mean and percentiles of numbers collected outside the metric store
+
+    Args:
+        values: Iterable of numbers
+
+    Returns:
+        Dict with count, mean, p50, p95 and max, or None if there are no values
+    """
+    values = sorted(values)
+    return _summarize(values) if values else None
+
+def summarize_metric(name, field):
+    """
+    Count, mean and percentiles of one numeric field of a metric
+
+    Args:
+        name: Metric name
+        field: Field recorded with record_metric
+
+    Returns:
+        Dict with count, mean, p50, p95 and max, or None if there are no samples
+    """
+    values = sorted(
+        sample[field] for sample in get_metric_samples(name)
+        if isinstance(sample.get(field), (int, float))
+    )
+    if not values:
+        return None
+    return _summarize(values)
+
+def summarize_metric_by(name, field, group_field, exclude=None):
+    """
+    summarize_metric split by the value of another field
+
+    Args:
+        name: Metric name
+        field: Numeric field to summarize
+        group_field: Field whose values define the groups
+        exclude: Optional dict of field -> value; matching samples are skipped
+
+    Returns:
+        Dict of group value -> summary dict
+    """
+    groups = defaultdict(list)
+    for sample in get_metric_samples(name):
+        if exclude and any(sample.get(k) == v for k, v in exclude.items()):
+            continue
+        if isinstance(sample.get(field), (int, float)):
+            groups[sample.get(group_field)].append(sample[field])
+
+    return {group: _summarize(sorted(values)) for group, values in groups.items()}
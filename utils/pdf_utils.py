@@ -1,79 +1,299 @@
 import base64
+import hashlib
 import io
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import fitz  # PyMuPDF
 from PIL import Image
 
-def input_pdf_setup(uploaded_file):
+# Parsed resumes kept per process, keyed by content hash and render settings
+PARSED_RESUME_CACHE_SIZE = 32
+
+# Rasterization resolution and the number of pages processed per resume
+RESUME_DPI = int(os.getenv("RESUME_DPI", "72"))
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "10"))
+# Page images are what Gemini OCRs for scanned resumes, so they keep the full
+# resolution and are made smaller by dropping colour and recompressing instead
+RESUME_IMAGE_GRAYSCALE = os.getenv("RESUME_IMAGE_GRAYSCALE", "1") == "1"
+RESUME_JPEG_QUALITY = int(os.getenv("RESUME_JPEG_QUALITY", "75"))
+
+# What the resume is sent to Gemini as: "auto" (text when the text layer is
+# healthy, otherwise images), "text", "image" or "both"
+GEMINI_PAYLOAD_MODE = os.getenv("GEMINI_PAYLOAD_MODE", "auto")
+PAYLOAD_MODES = ("auto", "text", "image", "both")
+
+# A text layer is trusted when it has enough characters per page and almost
+# all of them are real glyphs (not U+FFFD or control characters from a bad font map)
+MIN_TEXT_CHARS_PER_PAGE = 200
+MIN_GLYPH_COVERAGE = 0.95
+
+# Below this many pages the process pool costs more than it saves
+PARALLEL_MIN_PAGES = 4
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+_parsed_resumes = OrderedDict()
+_parsed_resumes_lock = threading.Lock()
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+class ParsedResume:
+    """
+    Everything the app needs from one uploaded PDF, produced by a single parse
+
+    Attributes:
+        content_hash: SHA-256 of the PDF bytes
+        page_count: Number of pages in the document
+        page_texts: Extracted text, one entry per processed page
+        page_jpegs: JPEG raster of each processed page, grayscale by default (Gemini payload)
+        preview_png: The first page raster encoded as PNG (UI preview)
+    """
+
+    def __init__(self, content_hash, page_count, page_texts, page_jpegs, preview_png):
+        self.content_hash = content_hash
+        self.page_count = page_count
+        self.page_texts = page_texts
+        self.page_jpegs = page_jpegs
+        self.preview_png = preview_png
+
+    @property
+    def text(self):
+        """All page texts joined"""
+        return "".join(self.page_texts)
+
+    @property
+    def first_page_jpeg(self):
+        return self.page_jpegs[0]
+
+    @property
+    def truncated(self):
+        """Whether pages beyond the page cap were skipped"""
+        return len(self.page_texts) < self.page_count
+
+    def text_layer_health(self):
+        """
+        How usable the extracted text layer is
+
+        Returns:
+            Dict with chars_per_page, glyph_coverage and healthy
+        """
+        text = self.text
+        pages = max(1, len(self.page_texts))
+        visible = [ch for ch in text if not ch.isspace()]
+        good = sum(1 for ch in visible if ch.isprintable() and ch != "\ufffd")
+        chars_per_page = len(visible) / pages
+        glyph_coverage = good / len(visible) if visible else 0.0
+        return {
+            "chars_per_page": round(chars_per_page, 1),
+            "glyph_coverage": round(glyph_coverage, 4),
+            "healthy": chars_per_page >= MIN_TEXT_CHARS_PER_PAGE and glyph_coverage >= MIN_GLYPH_COVERAGE,
+        }
+
+    def payload_mode(self, mode=None):
+        """
+        Resolve "auto" to "text" or "image" based on the text layer
+
+        Args:
+            mode: One of PAYLOAD_MODES, defaults to GEMINI_PAYLOAD_MODE
+
+        Returns:
+            "text", "image" or "both"
+        """
+        mode = mode or GEMINI_PAYLOAD_MODE
+        if mode not in PAYLOAD_MODES:
+            raise ValueError(f"Unknown payload mode: {mode}")
+        if mode == "auto":
+            return "text" if self.text_layer_health()["healthy"] else "image"
+        return mode
+
+    def preview_image(self):
+        """First page as a PIL Image"""
+        return Image.open(io.BytesIO(self.preview_png))
+
+    def gemini_parts(self, mode=None):
+        """
+        Resume content parts sent to Gemini
+
+        Text mode sends the extracted text as a plain string part, avoiding the
+        base64 overhead and the model-side OCR of page images.
+
+        Args:
+            mode: One of PAYLOAD_MODES, defaults to GEMINI_PAYLOAD_MODE
+
+        Returns:
+            List of parts: a text string and/or one base64 image dict per page
+        """
+        mode = self.payload_mode(mode)
+        parts = []
+        if mode in ("text", "both"):
+            parts.append(f"Resume text:\n{self.text}")
+        if mode in ("image", "both"):
+            parts.extend(
+                {
+                    "mime_type": "image/jpeg",
+                    "data": base64.b64encode(jpeg).decode()
+                }
+                for jpeg in self.page_jpegs
+            )
+        return parts
+
+def _read_upload(uploaded_file):
+    # Streamlit's UploadedFile exposes getvalue(); plain file objects are read and rewound
+    if hasattr(uploaded_file, "getvalue"):
+        return uploaded_file.getvalue()
+    pdf_bytes = uploaded_file.read()
+    uploaded_file.seek(0)
+    return pdf_bytes
+
+def _process_pages(pdf_bytes, page_numbers, dpi, grayscale):
+    # Runs in a worker process: documents cannot be shared, so each worker opens its own
+    pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        results = []
+        for page_number in page_numbers:
+            page = pdf_document.load_page(page_number)
+            pix = page.get_pixmap(dpi=dpi)
+            preview = pix.tobytes("png") if page_number == 0 else None
+            # Converted from the colour raster, so the preview keeps its colours without a second render
+            image = fitz.Pixmap(fitz.csGRAY, pix) if grayscale else pix
+            results.append((page_number, page.get_text(), image.tobytes("jpeg", jpg_quality=RESUME_JPEG_QUALITY), preview))
+        return results
+    finally:
+        pdf_document.close()
+
+def _get_parse_pool():
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # spawn, not fork: the Streamlit server process is multi-threaded
+            _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _parse_pool
+
+def _process_pages_parallel(pdf_bytes, page_numbers, dpi, grayscale):
+    global _parse_pool
+    chunk_size = -(-len(page_numbers) // PARSE_WORKERS)
+    chunks = [page_numbers[i:i + chunk_size] for i in range(0, len(page_numbers), chunk_size)]
+    try:
+        pool = _get_parse_pool()
+        futures = [pool.submit(_process_pages, pdf_bytes, chunk, dpi, grayscale) for chunk in chunks]
+        return [result for future in futures for result in future.result()]
+    except BrokenProcessPool:
+        # A crashed worker should not take uploads down; rebuild the pool next time
+        with _parse_pool_lock:
+            _parse_pool = None
+        return _process_pages(pdf_bytes, page_numbers, dpi, grayscale)
+
+def parse_resume(pdf_bytes, content_hash=None, dpi=None, max_pages=None, parallel=True, grayscale=None):
+    """
+    Extract page texts and rasterize pages, each page touched once
+
+    Documents with at least PARALLEL_MIN_PAGES pages are split across a
+    process pool; shorter ones are handled inline.
+
+    Args:
+        pdf_bytes: Raw PDF content
+        content_hash: SHA-256 of pdf_bytes if already computed
+        dpi: Raster resolution, defaults to RESUME_DPI
+        max_pages: Maximum pages processed, defaults to RESUME_MAX_PAGES
+        parallel: Allow the process pool
+        grayscale: Encode the page images for Gemini in grayscale, defaults to RESUME_IMAGE_GRAYSCALE
+
+    Returns:
+        ParsedResume instance
+    """
+    content_hash = content_hash or hashlib.sha256(pdf_bytes).hexdigest()
+    dpi = dpi or RESUME_DPI
+    grayscale = RESUME_IMAGE_GRAYSCALE if grayscale is None else grayscale
+    max_pages = max_pages or RESUME_MAX_PAGES
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf_document:
+        page_count = len(pdf_document)
+    if page_count == 0:
+        raise ValueError("The PDF has no pages")
+
+    page_numbers = list(range(min(page_count, max_pages)))
+    if parallel and len(page_numbers) >= PARALLEL_MIN_PAGES and PARSE_WORKERS > 1:
+        results = _process_pages_parallel(pdf_bytes, page_numbers, dpi, grayscale)
+    else:
+        results = _process_pages(pdf_bytes, page_numbers, dpi, grayscale)
+    results.sort(key=lambda result: result[0])
+
+    page_texts = [text for _, text, _, _ in results]
+    page_jpegs = [jpeg for _, _, jpeg, _ in results]
+    return ParsedResume(content_hash, page_count, page_texts, page_jpegs, results[0][3])
+
+def get_parsed_resume(uploaded_file):
+    """
+    Parsed form of an uploaded PDF, parsed at most once per distinct content
+
+    The result is shared across Streamlit reruns, tabs and sessions.
+
+    Args:
+        uploaded_file: The uploaded PDF file object
+
+    Returns:
+        ParsedResume instance
+    """
+    pdf_bytes = _read_upload(uploaded_file)
+    content_hash = hashlib.sha256(pdf_bytes).hexdigest()
+    cache_key = (content_hash, RESUME_DPI, RESUME_MAX_PAGES, RESUME_IMAGE_GRAYSCALE, RESUME_JPEG_QUALITY)
+    with _parsed_resumes_lock:
+        parsed = _parsed_resumes.get(cache_key)
+        if parsed is not None:
+            _parsed_resumes.move_to_end(cache_key)
+            return parsed
+
+    parsed = parse_resume(pdf_bytes, content_hash)
+    with _parsed_resumes_lock:
+        _parsed_resumes[cache_key] = parsed
+        while len(_parsed_resumes) > PARSED_RESUME_CACHE_SIZE:
+            _parsed_resumes.popitem(last=False)
+    return parsed
+
+def input_pdf_setup(uploaded_file, mode=None):
     """
     Process uploaded PDF file and prepare it for Gemini API
-    
+
     Args:
         uploaded_file: The uploaded PDF file object
-        
+        mode: Payload mode (see PAYLOAD_MODES), defaults to GEMINI_PAYLOAD_MODE
+
     Returns:
-        List of dicts with mime_type and base64 encoded data
+        List of parts: extracted text and/or base64 JPEG dicts, one per page
     """
     if uploaded_file is not None:
-        pdf_bytes = uploaded_file.read()
-        pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
-        first_page = pdf_document.load_page(0)
-        pix = first_page.get_pixmap()
-        image_byte_arr = pix.tobytes("jpeg")
-        pdf_parts = [
-            {
-                "mime_type": "image/jpeg",
-                "data": base64.b64encode(image_byte_arr).decode()
-            }
-        ]
-        
-        pdf_document.close()
-        return pdf_parts
+        return get_parsed_resume(uploaded_file).gemini_parts(mode)
     else:
         raise FileNotFoundError("File not found")
 
 def extract_text_from_pdf(uploaded_file):
     """
     Extract text content from uploaded PDF
-    
+
     Args:
         uploaded_file: The uploaded PDF file object
-        
+
     Returns:
         String containing all text from the PDF
     """
     if uploaded_file is not None:
-        pdf_bytes = uploaded_file.read()
-        pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
-        text = ""
-        for page_num in range(len(pdf_document)):
-            page = pdf_document.load_page(page_num)
-            text += page.get_text()
-        
-        pdf_document.close()
-        uploaded_file.seek(0)  # Reset file pointer
-        return text
+        return get_parsed_resume(uploaded_file).text
     else:
         return ""
 
 def generate_pdf_preview(uploaded_file):
     """
     Generate a preview image of the first page of the PDF
-    
+
     Args:
         uploaded_file: The uploaded PDF file object
-        
+
     Returns:
         PIL Image object of the first page
     """
     try:
-        pdf_bytes = uploaded_file.read()
-        pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
-        first_page = pdf_document.load_page(0)
-        pix = first_page.get_pixmap()
-        img_data = pix.tobytes("png")
-        img = Image.open(io.BytesIO(img_data))
-        uploaded_file.seek(0)
-        pdf_document.close()
-        return img
+        return get_parsed_resume(uploaded_file).preview_image()
     except Exception as e:
-        raise Exception(f"Error previewing PDF: {e}")
\ No newline at end of file
+        raise Exception(f"Error previewing PDF: {e}")
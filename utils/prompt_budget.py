@@ -0,0 +1,205 @@
+import os
+import re
+import time
+from utils.metrics import record_metric
+from utils.skill_extractor import extract_skills_locally
+
+# Estimated tokens the job description may use in a prompt; 0 disables compaction
+JD_TOKEN_BUDGET = int(os.getenv("JD_TOKEN_BUDGET", "800"))
+# Average characters per token for English text, used instead of a count_tokens round-trip
+CHARS_PER_TOKEN = 4
+
+# Lines that are almost never about the role itself
+BOILERPLATE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    # Equal employment opportunity statements
+    r"equal (employment )?opportunity", r"\beeo\b", r"affirmative action", r"regardless of (race|age|gender|religion)",
+    r"without regard to", r"protected (veteran|class|status)", r"sexual orientation|gender identity",
+    r"reasonable accommodation", r"e-?verify",
+    # Benefits and perks
+    r"\b401\s*\(?k\)?", r"(health|medical|dental|vision|life) insurance", r"paid time off|\bpto\b",
+    r"parental leave", r"(competitive|attractive) (salary|compensation|pay)", r"benefits (include|package)",
+    r"(gym|wellness) (membership|stipend|program)", r"free (lunch|snacks|meals)", r"stock options|\besop\b",
+    r"^(benefits|perks|perks (and|&) benefits|what we offer|why join us)\W*$",
+    # Application instructions and privacy notices
+    r"how to apply", r"to apply,? (please )?(send|submit|click)", r"privacy (policy|notice)", r"recruitment agencies",
+)]
+# Words marking a sentence as a requirement rather than company description
+REQUIREMENT_CUES = re.compile(
+    r"\b(must|required|requirements?|qualifications?|experience|years?|proficien\w*|knowledge|familiar\w*|"
+    r"degree|bachelor|master|certif\w*|skills?|ability|responsib\w*|you will|you'll|build|design|develop|own)\b",
+    re.IGNORECASE,
+)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
+_BULLET = re.compile(r"^\s*(?:[-*•▪●◦]|\d+[.)])\s*")
+
+def estimate_tokens(text):
+    """
+    Rough input token count of a text (characters / CHARS_PER_TOKEN)
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        Estimated number of tokens
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def _normalize(text):
+    return " ".join(_BULLET.sub("", text).lower().split())
+
+def _dedupe_sentences(line, seen):
+    # Drop sentences of a paragraph that already appeared earlier in the text
+    sentences = _SENTENCE_END.split(line.strip())
+    if len(sentences) < 2:
+        return line
+    kept = []
+    for sentence in sentences:
+        normalized = _normalize(sentence)
+        if normalized not in seen:
+            seen.add(normalized)
+            kept.append(sentence)
+    return " ".join(kept)
+
+def strip_boilerplate(job_description):
+    """
+    Drop EEO statements, benefits, application instructions and repeated lines or sentences
+
+    Args:
+        job_description: Job description text
+
+    Returns:
+        Tuple (text, removed line count)
+    """
+    kept, seen, removed = [], set(), 0
+    for line in job_description.splitlines():
+        normalized = _normalize(line)
+        if not normalized:
+            # Keep paragraph breaks, but only one in a row
+            if kept and kept[-1]:
+                kept.append("")
+            continue
+        if normalized in seen or any(pattern.search(normalized) for pattern in BOILERPLATE_PATTERNS):
+            removed += 1
+            continue
+        seen.add(normalized)
+        line = _dedupe_sentences(line.rstrip(), seen)
+        if line:
+            kept.append(line)
+    return "\n".join(kept).strip(), removed
+
+def _units(text):
+    # Bullets and short lines stay whole, paragraphs are split into sentences
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if _BULLET.match(line) or len(line) < 200:
+            yield line
+        else:
+            yield from _SENTENCE_END.split(line.strip())
+
+def _skill_counter():
+    try:
+        extract_skills_locally("")
+    except Exception:
+        # No job database to take the skill vocabulary from; rank on requirement words only
+        return lambda unit: 0
+    return lambda unit: len(extract_skills_locally(unit))
+
+def _signal(unit, count_skills):
+    cues = len(REQUIREMENT_CUES.findall(unit))
+    return (2 * count_skills(unit) + cues) / (1 + estimate_tokens(unit) / 25)
+
+def _truncate(text, max_tokens):
+    # Cut at a word boundary so the model does not see half a word
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    return cut.rsplit(" ", 1)[0] if " " in cut else cut
+
+def compact_job_description(job_description, budget_tokens=JD_TOKEN_BUDGET):
+    """
+    Fit a job description into a token budget
+
+    Boilerplate and repeated lines are always removed. If the rest is still
+    over budget, the sentences and bullets with the most skills and
+    requirement words per token are kept, in their original order. A unit
+    larger than the whole budget is truncated to fit, so the result is never
+    empty for a non-empty job description.
+
+    Args:
+        job_description: Job description text
+        budget_tokens: Token budget, 0 to leave the text unchanged
+
+    Returns:
+        Tuple (text, stats dict with original_tokens, compacted_tokens,
+        boilerplate_lines and dropped_units)
+    """
+    original_tokens = estimate_tokens(job_description)
+    stats = {"original_tokens": original_tokens, "compacted_tokens": original_tokens,
+             "boilerplate_lines": 0, "dropped_units": 0}
+    if not budget_tokens or not job_description.strip():
+        return job_description, stats
+
+    text, stats["boilerplate_lines"] = strip_boilerplate(job_description)
+    if estimate_tokens(text) > budget_tokens:
+        units = list(_units(text))
+        count_skills = _skill_counter()
+        ranked = sorted(range(len(units)), key=lambda i: _signal(units[i], count_skills), reverse=True)
+        keep, used = set(), 0
+        for i in ranked:
+            # +1 for the newline joining the units
+            cost = estimate_tokens(units[i]) + 1
+            if cost > budget_tokens and used < budget_tokens - 1:
+                # Would never fit (e.g. a long paragraph without sentence breaks)
+                units[i] = _truncate(units[i], budget_tokens - used - 1)
+                cost = estimate_tokens(units[i]) + 1
+            if used + cost <= budget_tokens:
+                keep.add(i)
+                used += cost
+        stats["dropped_units"] = len(units) - len(keep)
+        text = "\n".join(units[i] for i in sorted(keep))
+        if not text.strip():
+            text = _truncate(strip_boilerplate(job_description)[0], budget_tokens)
+    stats["compacted_tokens"] = estimate_tokens(text)
+    return text, stats
+
+def prompt_tokens(prompt, pdf_content, job_description):
+    """
+    Estimated input tokens of a Gemini request, counting text parts only
+
+    Args:
+        prompt: Prompt text
+        pdf_content: Resume parts; page images are not counted
+        job_description: Job description text
+
+    Returns:
+        Estimated number of tokens
+    """
+    texts = [prompt, job_description, *(part for part in pdf_content if isinstance(part, str))]
+    return sum(estimate_tokens(text) for text in texts)
+
+def budget_job_description(job_description, analysis_type, budget_tokens=JD_TOKEN_BUDGET):
+    """
+    Compact a job description for a Gemini call and record what it saved
+
+    Recorded under "jd_budget.<analysis_type>" with original_tokens,
+    compacted_tokens, tokens_saved, boilerplate_lines, dropped_units and seconds.
+
+    Args:
+        job_description: Job description text
+        analysis_type: Analysis the job description is sent with, e.g. "ats_score"
+        budget_tokens: Token budget, 0 to leave the text unchanged
+
+    Returns:
+        Tuple (compacted job description text, stats dict as in compact_job_description)
+    """
+    start = time.perf_counter()
+    text, stats = compact_job_description(job_description, budget_tokens)
+    record_metric(
+        f"jd_budget.{analysis_type}",
+        tokens_saved=stats["original_tokens"] - stats["compacted_tokens"],
+        seconds=time.perf_counter() - start,
+        **stats,
+    )
+    return text, stats
@@ -0,0 +1,367 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+
+DEFAULT_CACHE_DIR = "data/cache"
+# Longest a caller waits on another caller's fetch of the same key before fetching itself
+INFLIGHT_WAIT_SECONDS = float(os.getenv("CACHE_INFLIGHT_WAIT_SECONDS", "60"))
+
+class FetchAbandoned(Exception):
+    """Set on a single-flight future whose owner stopped before finishing the fetch"""
+
+def make_cache_key(*parts):
+    """
+    Content-addressed key: SHA-256 over the given parts
+
+    Args:
+        parts: Strings, bytes, or JSON-serializable values
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            data = part
+        elif isinstance(part, str):
+            data = part.encode("utf-8")
+        else:
+            data = json.dumps(part, sort_keys=True, default=str).encode("utf-8")
+        # Length prefix so ("ab", "c") and ("a", "bc") hash differently
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+class ResponseCache:
+    """
+    Two-tier cache: an in-process LRU in front of a persistent SQLite table
+
+    Entries expire after ttl_seconds. With stale_seconds, expired entries are
+    kept that much longer so get_or_fetch can serve them while a refresh runs
+    (stale-while-revalidate). The memory tier keeps at most memory_items
+    entries; the disk tier is trimmed to disk_max_items entries and
+    disk_max_bytes of payload, oldest access first. Values must be JSON
+    serializable.
+
+    get_or_fetch also coalesces concurrent misses for the same key into a
+    single call of the fetch function (single flight). Callers waiting on
+    another caller's fetch give up after INFLIGHT_WAIT_SECONDS and fetch
+    for themselves.
+    """
+
+    def __init__(self, name, cache_dir=DEFAULT_CACHE_DIR, ttl_seconds=7 * 24 * 3600, stale_seconds=0,
+                 memory_items=256, disk_max_items=5000, disk_max_bytes=200 * 1024 * 1024):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_age = ttl_seconds + stale_seconds
+        self.memory_items = memory_items
+        self.disk_max_items = disk_max_items
+        self.disk_max_bytes = disk_max_bytes
+        self.path = os.path.join(cache_dir, f"{name}.sqlite") if cache_dir else None
+        self._memory = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0, "disk_hits": 0, "stale_hits": 0, "misses": 0,
+            "writes": 0, "evictions": 0, "coalesced": 0, "refreshes": 0, "wait_timeouts": 0,
+        }
+        if self.path:
+            os.makedirs(cache_dir, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                    "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per operation keeps the cache safe across Streamlit threads
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _count(self, stat, amount=1):
+        with self._lock:
+            self._stats[stat] += amount
+
+    def lookup(self, key):
+        """
+        Look up a key in memory, then on disk, including stale entries
+
+        Args:
+            key: Cache key, see make_cache_key
+
+        Returns:
+            Tuple (value, state) where state is "fresh", "stale" or "miss"
+            (value is None on a miss)
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at < self.max_age:
+                    self._memory.move_to_end(key)
+                    return value, self._hit("memory_hits", now - created_at)
+                del self._memory[key]
+
+        if self.path:
+            with self._connect() as conn:
+                row = conn.execute("SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is not None and now - row[1] < self.max_age:
+                    conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+                    value = json.loads(row[0])
+                    self._remember(key, row[1], value)
+                    with self._lock:
+                        return value, self._hit("disk_hits", now - row[1])
+                if row is not None:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+        self._count("misses")
+        return None, "miss"
+
+    def _hit(self, stat, age):
+        # Caller holds self._lock
+        if age < self.ttl_seconds:
+            self._stats[stat] += 1
+            return "fresh"
+        self._stats["stale_hits"] += 1
+        return "stale"
+
+    def get(self, key, default=None):
+        """
+        Look up a fresh value in memory, then on disk
+
+        Args:
+            key: Cache key, see make_cache_key
+            default: Returned on a miss or when the entry is stale
+
+        Returns:
+            Cached value or default
+        """
+        value, state = self.lookup(key)
+        return value if state == "fresh" else default
+
+    def claim(self, key):
+        """
+        Register a fetch for a key, or join the one already running
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple (future, owner). The owner must fetch and call resolve();
+            everyone else waits on the future.
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def resolve(self, key, future, value=None, error=None, store=True):
+        """
+        Finish a claimed fetch: store the value and wake every waiter
+
+        Args:
+            key: Cache key passed to claim()
+            future: Future returned by claim()
+            value: Fetched value
+            error: Exception raised by the fetch, if any
+            store: Whether to cache the value
+        """
+        if error is None and store:
+            self.set(key, value)
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        if future.done():
+            return
+        if error is None:
+            future.set_result(value)
+        else:
+            future.set_exception(error)
+
+    def abandon(self, key, future):
+        """
+        Release a claimed fetch that will not finish (e.g. its task was cancelled)
+
+        Waiters get FetchAbandoned and fetch the value themselves.
+
+        Args:
+            key: Cache key passed to claim()
+            future: Future returned by claim()
+        """
+        self.resolve(key, future, error=FetchAbandoned(f"fetch of {key} was abandoned"))
+
+    def wait(self, future, fetch):
+        """
+        Result of another caller's fetch, or fetch() if it is abandoned or too slow
+
+        Args:
+            future: Future returned by claim() to a non-owner
+            fetch: Zero-argument callable returning the value
+
+        Returns:
+            Fetched value
+        """
+        try:
+            return future.result(timeout=INFLIGHT_WAIT_SECONDS)
+        except FutureTimeoutError:
+            self._count("wait_timeouts")
+        except FetchAbandoned:
+            pass
+        return fetch()
+
+    async def wait_async(self, future, fetch):
+        """
+        wait() for event loops: fetch is a zero-argument coroutine function
+        """
+        try:
+            # Shielded so a cancelled waiter does not cancel the owner's shared future
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), INFLIGHT_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            self._count("wait_timeouts")
+        except FetchAbandoned:
+            pass
+        return await fetch()
+
+    def _run_fetch(self, key, future, fetch, cacheable):
+        try:
+            value = fetch()
+        except Exception as e:
+            self.resolve(key, future, error=e)
+            return
+        except BaseException:
+            self.abandon(key, future)
+            raise
+        self.resolve(key, future, value, store=cacheable is None or cacheable(value))
+
+    def refresh_in_background(self, key, future, fetch, cacheable=None):
+        """
+        Run a claimed fetch on a daemon thread
+
+        Args:
+            key: Cache key passed to claim()
+            future: Future returned by claim()
+            fetch: Zero-argument callable returning the new value
+            cacheable: Optional predicate; values it rejects are not stored
+        """
+        self._count("refreshes")
+        threading.Thread(target=self._run_fetch, args=(key, future, fetch, cacheable), daemon=True).start()
+
+    def get_or_fetch(self, key, fetch, cacheable=None):
+        """
+        Cached value, fetching it once on a miss
+
+        A stale entry is returned immediately and refreshed in the background.
+        Concurrent callers missing the same key share one fetch.
+
+        Args:
+            key: Cache key, see make_cache_key
+            fetch: Zero-argument callable returning the value
+            cacheable: Optional predicate; values it rejects (e.g. error dicts)
+                are returned but not stored
+
+        Returns:
+            Cached or freshly fetched value
+        """
+        value, state = self.lookup(key)
+        if state == "fresh":
+            return value
+        future, owner = self.claim(key)
+        if state == "stale":
+            if owner:
+                self.refresh_in_background(key, future, fetch, cacheable)
+            return value
+        if not owner:
+            return self.wait(future, fetch)
+        self._run_fetch(key, future, fetch, cacheable)
+        return future.result()
+
+    def _remember(self, key, created_at, value):
+        with self._lock:
+            self._memory[key] = (created_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def set(self, key, value):
+        """
+        Store a value in both tiers
+
+        Args:
+            key: Cache key, see make_cache_key
+            value: JSON-serializable value
+        """
+        now = time.time()
+        self._remember(key, now, value)
+        self._count("writes")
+        if not self.path:
+            return
+        payload = json.dumps(value)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now),
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        expired = conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.max_age,)).rowcount
+        count, total_size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        evicted = max(expired, 0)
+        if count > self.disk_max_items or total_size > self.disk_max_bytes:
+            # Drop least recently used entries until both limits hold again
+            rows = conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall()
+            stale = []
+            for key, size in rows:
+                if count <= self.disk_max_items and total_size <= self.disk_max_bytes:
+                    break
+                stale.append((key,))
+                count -= 1
+                total_size -= size
+            conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+            evicted += len(stale)
+        if evicted:
+            self._count("evictions", evicted)
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM entries")
+
+    def stats(self):
+        """
+        Hit/miss counters for this process
+
+        Returns:
+            Dict of counters plus hit_rate
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_items"] = len(self._memory)
+        hits = stats["memory_hits"] + stats["disk_hits"] + stats["stale_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
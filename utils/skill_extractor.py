@@ -0,0 +1,152 @@
+import re
+import threading
+import numpy as np
+from utils.job_index import get_job_index
+from utils.skills import SKILL_ALIASES, normalize_skill
+
+# A skill must be listed by at least this many postings to be matched in resumes
+MIN_SKILL_POSTINGS = 3
+
+# Single words that are listed as skills but are mostly ordinary English in prose
+AMBIGUOUS_SKILLS = {"go", "it", "ms", "me", "us", "am", "do", "be", "on"}
+
+# An optional leading dot keeps names such as .net whole, matching normalize_skill
+_TOKEN = re.compile(r"\.?(?:[a-z0-9][a-z0-9+#.\-/]*[a-z0-9+#]|[a-z0-9])")
+_END = object()
+
+_extractors = {}
+_extractor_lock = threading.Lock()
+
+def tokenize(text):
+    """
+    Lowercase word tokens that keep symbols used in skill names (c++, c#, node.js, .net)
+
+    Args:
+        text: Free text
+
+    Returns:
+        List of tokens
+    """
+    return _TOKEN.findall(text.lower())
+
+class SkillExtractor:
+    """
+    Multi-pattern skill matcher over a token trie
+
+    Every skill phrase is inserted into a trie keyed by its tokens. A resume is
+    scanned once, taking the longest skill that starts at each token, so cost is
+    linear in resume length and independent of the vocabulary size.
+    """
+
+    def __init__(self, skills):
+        self.trie = {}
+        self.max_tokens = 0
+        for phrase, canonical in skills.items():
+            tokens = tokenize(phrase)
+            if not tokens:
+                continue
+            node = self.trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[_END] = canonical
+            self.max_tokens = max(self.max_tokens, len(tokens))
+
+    def extract(self, text):
+        """
+        Skills mentioned in a text
+
+        Args:
+            text: Resume text
+
+        Returns:
+            List of canonical skill names in order of first mention, no duplicates
+        """
+        tokens = tokenize(text)
+        found = {}
+        i = 0
+        while i < len(tokens):
+            node = self.trie
+            match, match_length = None, 0
+            for j in range(i, min(len(tokens), i + self.max_tokens)):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                if _END in node:
+                    match, match_length = node[_END], j - i + 1
+            if match:
+                found.setdefault(match, None)
+                i += match_length
+            else:
+                i += 1
+        return list(found)
+
+def build_skill_vocabulary(job_index, min_postings=MIN_SKILL_POSTINGS):
+    """
+    Skill phrases to look for, taken from the job index vocabulary
+
+    Args:
+        job_index: Loaded JobIndex (its vocabulary is already normalized skills)
+        min_postings: Minimum number of postings listing a skill
+
+    Returns:
+        Dict of phrase -> canonical skill name, aliases included
+    """
+    postings_per_skill = np.diff(np.asarray(job_index.postings_indptr))
+    skills = {}
+    for skill, skill_id in job_index.vectorizer.vocabulary_.items():
+        if postings_per_skill[skill_id] < min_postings or len(skill) < 2 or skill in AMBIGUOUS_SKILLS:
+            continue
+        skills[skill] = skill
+    for alias, canonical in SKILL_ALIASES.items():
+        if canonical in skills and alias not in AMBIGUOUS_SKILLS and len(alias) > 1:
+            skills[alias] = canonical
+    return skills
+
+def get_skill_extractor():
+    """
+    Process-wide SkillExtractor for the current job index
+
+    Rebuilt only when the job index itself is rebuilt.
+
+    Returns:
+        SkillExtractor instance
+    """
+    job_index = get_job_index()
+    key = job_index.manifest["csv"]["sha256"]
+    with _extractor_lock:
+        extractor = _extractors.get(key)
+        if extractor is None:
+            _extractors.clear()
+            extractor = SkillExtractor(build_skill_vocabulary(job_index))
+            _extractors[key] = extractor
+        return extractor
+
+def extract_skills_locally(resume_text):
+    """
+    Extract skills from resume text without any network call
+
+    Args:
+        resume_text: Plain text extracted from resume
+
+    Returns:
+        List of canonical skill names
+    """
+    return get_skill_extractor().extract(resume_text)
+
+def merge_skill_lists(*skill_lists):
+    """
+    Merge skill lists, de-duplicating on the normalized name
+
+    Args:
+        skill_lists: Lists of skill names
+
+    Returns:
+        List of skill names, first spelling kept
+    """
+    merged = {}
+    for skills in skill_lists:
+        for skill in skills:
+            normalized = normalize_skill(skill)
+            if normalized:
+                merged.setdefault(normalized, skill.strip())
+    return list(merged.values())
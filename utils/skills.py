@@ -0,0 +1,94 @@
+import re
+
+# Alternate spellings and abbreviations folded onto one canonical skill name
+SKILL_ALIASES = {
+    "py": "python",
+    "python3": "python",
+    "python 3": "python",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "cv": "computer vision",
+    "js": "javascript",
+    "ts": "typescript",
+    "reactjs": "react",
+    "react.js": "react",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "vuejs": "vue.js",
+    "vue": "vue.js",
+    "golang": "go",
+    "c sharp": "c#",
+    "cpp": "c++",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "mssql": "sql server",
+    "ms sql": "sql server",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "tf": "tensorflow",
+    "amazon web services": "aws",
+    "gcp": "google cloud platform",
+    "google cloud": "google cloud platform",
+    "azure cloud": "azure",
+    "microsoft azure": "azure",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+    "ms office": "microsoft office",
+    "ms word": "microsoft word",
+    "powerbi": "power bi",
+    "ci/cd": "ci cd",
+    "cicd": "ci cd",
+    "oop": "object oriented programming",
+    "rest": "rest api",
+    "restful api": "rest api",
+    "restful apis": "rest api",
+    "rest apis": "rest api",
+    "pm": "project management",
+    "comms": "communication",
+    "communication skills": "communication",
+    "leadership skills": "leadership",
+    "problem-solving": "problem solving",
+    "problemsolving": "problem solving",
+    "team work": "teamwork",
+    "team player": "teamwork",
+}
+
+_SEPARATORS = re.compile(r"[,;\n|•]+")
+_WHITESPACE = re.compile(r"\s+")
+# Trim punctuation at the ends but keep symbols that are part of names (c++, c#, .net):
+# a leading dot is kept, a trailing one ends a sentence
+_LEADING_PUNCTUATION = " \t:-*'\"()[]"
+_TRAILING_PUNCTUATION = " \t.:-*'\"()[]"
+
+def normalize_skill(skill):
+    """
+    Normalize a single skill name
+
+    Args:
+        skill: Raw skill text, e.g. " Py "
+
+    Returns:
+        Canonical lowercase skill name (e.g. "python"), or "" if nothing is left
+    """
+    skill = _WHITESPACE.sub(" ", skill.lower()).lstrip(_LEADING_PUNCTUATION).rstrip(_TRAILING_PUNCTUATION)
+    return SKILL_ALIASES.get(skill, skill)
+
+def split_skills(skills_text):
+    """
+    Split a comma-separated skills string into normalized skill tokens
+
+    Used as the TF-IDF analyzer so multi-word skills like "machine learning"
+    stay one token instead of two unrelated words.
+
+    Args:
+        skills_text: Comma-separated string of skills
+
+    Returns:
+        List of normalized skill names, in order, empty ones dropped
+    """
+    if not isinstance(skills_text, str):
+        return []
+    skills = (normalize_skill(part) for part in _SEPARATORS.split(skills_text))
+    return [skill for skill in skills if skill]
@@ -0,0 +1,277 @@
+import json
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass, fields
+from utils.api_utils import get_gemini_response
+from utils.gemini_client import get_gemini_model_name
+from utils.metrics import record_metric
+from utils.response_cache import ResponseCache, make_cache_key
+
+# "prompt" asks for JSON in the prompt only; "native" also sets the response
+# MIME type, which needs a model that supports it (Gemini 1.5 and later)
+GEMINI_JSON_MODE = os.getenv("GEMINI_JSON_MODE", "prompt")
+# Total attempts per analysis; a new attempt is made only when the reply is not valid
+STRUCTURED_MAX_ATTEMPTS = int(os.getenv("STRUCTURED_MAX_ATTEMPTS", "2"))
+# Bumped whenever a schema changes, so cached records of the old shape are not reused
+SCHEMA_VERSION = 1
+
+_structured_cache = None
+_structured_cache_lock = threading.Lock()
+
+class StructuredOutputError(ValueError):
+    """A model reply that is not valid JSON or does not match the analysis schema"""
+
+@dataclass(frozen=True, slots=True)
+class ResumeReview:
+    verdict: str
+    strengths: tuple
+    weaknesses: tuple
+    summary: str
+
+@dataclass(frozen=True, slots=True)
+class SkillsImprovement:
+    suitability: str
+    skills_to_improve: tuple
+    recommendations: tuple
+
+@dataclass(frozen=True, slots=True)
+class MatchPercentage:
+    match_percentage: int
+    missing_keywords: tuple
+    final_thoughts: str
+
+@dataclass(frozen=True, slots=True)
+class ATSReport:
+    overall_score: int
+    keyword_match: int
+    skills_relevance: int
+    experience_match: int
+    education: int
+    improvements: tuple
+
+@dataclass(frozen=True, slots=True)
+class ATSNarrative:
+    improvements: tuple
+
+@dataclass(frozen=True, slots=True)
+class MatchNarrative:
+    final_thoughts: str
+
+# Record type and fields per analysis: field -> (kind, description, maximum for scores)
+ANALYSIS_SCHEMAS = {
+    "resume_review": (ResumeReview, {
+        "verdict": ("string", "one sentence on whether the profile aligns with the role", None),
+        "strengths": ("list", "strengths of the applicant for this role", None),
+        "weaknesses": ("list", "weaknesses or gaps for this role", None),
+        "summary": ("string", "short overall evaluation", None),
+    }),
+    "skills_improvement": (SkillsImprovement, {
+        "suitability": ("string", "the candidate's suitability for the role from an HR perspective", None),
+        "skills_to_improve": ("list", "skills the candidate should add or strengthen", None),
+        "recommendations": ("list", "concrete advice to improve the candidate's profile", None),
+    }),
+    "match_percentage": (MatchPercentage, {
+        "match_percentage": ("score", "how well the resume matches the job description", 100),
+        "missing_keywords": ("list", "job description keywords missing from the resume", None),
+        "final_thoughts": ("string", "final thoughts", None),
+    }),
+    "ats_score": (ATSReport, {
+        "overall_score": ("score", "overall ATS score", 100),
+        "keyword_match": ("score", "how well the resume contains job-specific keywords", 25),
+        "skills_relevance": ("score", "alignment of the candidate's skills with the required skills", 25),
+        "experience_match": ("score", "how well the experience matches the job requirements", 25),
+        "education": ("score", "relevance of education and certifications to the position", 25),
+        "improvements": ("list", "suggested improvements to increase the ATS score", None),
+    }),
+}
+# Gemini's part of the locally scored analyses (ats_score, match_percentage): text only, no scores
+NARRATIVE_SCHEMAS = {
+    "ats_narrative": (ATSNarrative, {
+        "improvements": ("list", "suggested improvements to increase the ATS score, most important first", None),
+    }),
+    "match_narrative": (MatchNarrative, {
+        "final_thoughts": ("string", "final thoughts on the missing keywords and the candidate's fit", None),
+    }),
+}
+_RECORD_SCHEMAS = {**ANALYSIS_SCHEMAS, **NARRATIVE_SCHEMAS}
+_RECORD_TYPES = {record_type: analysis_type for analysis_type, (record_type, _) in _RECORD_SCHEMAS.items()}
+
+_KIND_EXAMPLES = {"string": '"..."', "list": '["...", "..."]'}
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+def get_structured_cache():
+    """
+    Shared cache of validated analysis records, created on first use
+
+    Returns:
+        ResponseCache keyed by model, schema version, prompt, resume content and job description
+    """
+    global _structured_cache
+    with _structured_cache_lock:
+        if _structured_cache is None:
+            ttl_hours = float(os.getenv("GEMINI_CACHE_TTL_HOURS", "168"))
+            _structured_cache = ResponseCache("gemini_structured", ttl_seconds=ttl_hours * 3600)
+        return _structured_cache
+
+def schema_instructions(analysis_type):
+    """
+    Prompt suffix describing the JSON object expected for an analysis
+
+    Args:
+        analysis_type: Key of ANALYSIS_SCHEMAS or NARRATIVE_SCHEMAS
+
+    Returns:
+        Instruction text
+    """
+    _, schema = _RECORD_SCHEMAS[analysis_type]
+    lines = ["Respond with a single JSON object and nothing else (no markdown, no code fences), with exactly these keys:"]
+    for name, (kind, description, maximum) in schema.items():
+        example = f"integer from 0 to {maximum}" if kind == "score" else _KIND_EXAMPLES[kind]
+        lines.append(f'  "{name}": {example}  // {description}')
+    return "\n".join(lines)
+
+def _validate_field(name, kind, maximum, value):
+    if kind == "score":
+        if isinstance(value, str):
+            # Models sometimes answer "78%" or "18/25"
+            match = re.match(r"\s*(\d+(?:\.\d+)?)", value)
+            value = float(match.group(1)) if match else value
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise StructuredOutputError(f"{name} must be a number, got {value!r}")
+        if not 0 <= value <= maximum:
+            raise StructuredOutputError(f"{name} must be between 0 and {maximum}, got {value}")
+        return int(round(value))
+    if kind == "list":
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list) or not all(isinstance(item, (str, int, float)) for item in value):
+            raise StructuredOutputError(f"{name} must be a list of strings")
+        return tuple(str(item).strip() for item in value if str(item).strip())
+    if not isinstance(value, str):
+        raise StructuredOutputError(f"{name} must be a string")
+    return value.strip()
+
+def parse_structured_response(analysis_type, text):
+    """
+    Parse and validate a model reply into the analysis' record type
+
+    Code fences and text around the JSON object are ignored; missing keys,
+    wrong types and out-of-range scores are errors. Extra keys are dropped.
+
+    Args:
+        analysis_type: Key of ANALYSIS_SCHEMAS or NARRATIVE_SCHEMAS
+        text: Model reply, or an already decoded dict
+
+    Returns:
+        Record instance (e.g. ATSReport)
+
+    Raises:
+        StructuredOutputError: If the reply does not match the schema
+    """
+    record_type, schema = _RECORD_SCHEMAS[analysis_type]
+    if isinstance(text, dict):
+        data = text
+    else:
+        match = _JSON_OBJECT.search(text or "")
+        if not match:
+            raise StructuredOutputError("no JSON object in the reply")
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError as e:
+            raise StructuredOutputError(f"invalid JSON: {e}") from e
+        if not isinstance(data, dict):
+            raise StructuredOutputError("the reply is not a JSON object")
+    missing = [name for name in schema if name not in data]
+    if missing:
+        raise StructuredOutputError(f"missing keys: {', '.join(missing)}")
+    values = {
+        name: _validate_field(name, kind, maximum, data[name])
+        for name, (kind, _, maximum) in schema.items()
+    }
+    return record_type(**values)
+
+def record_to_dict(record):
+    """Plain dict of a record, with an analysis_type key; lists instead of tuples"""
+    values = {key: list(value) if isinstance(value, tuple) else value for key, value in asdict(record).items()}
+    return {"analysis_type": _RECORD_TYPES[type(record)], **values}
+
+def record_from_dict(data):
+    """Rebuild a record from record_to_dict output (e.g. a cache entry or a batch result)"""
+    data = dict(data)
+    return parse_structured_response(data.pop("analysis_type"), data)
+
+def record_to_markdown(record):
+    """
+    Render a record the way the free-form analyses read
+
+    Args:
+        record: Analysis record
+
+    Returns:
+        Markdown text
+    """
+    _, schema = _RECORD_SCHEMAS[_RECORD_TYPES[type(record)]]
+    lines = []
+    for field in fields(record):
+        kind, _, maximum = schema[field.name]
+        label = field.name.replace("_", " ").capitalize()
+        value = getattr(record, field.name)
+        if kind == "score":
+            lines.append(f"**{label}:** {value}/{maximum}")
+        elif kind == "list":
+            lines.append(f"**{label}:**")
+            lines.extend(f"- {item}" for item in value)
+        else:
+            lines.append(f"**{label}:** {value}")
+        lines.append("")
+    return "\n".join(lines).strip()
+
+def get_structured_response(analysis_type, prompt, pdf_content, job_description, use_cache=True, metric_fields=None):
+    """
+    Run an analysis in JSON mode and return a validated record
+
+    Only validated records are cached. The model is asked again, with the
+    validation error, only when its reply does not parse or match the schema.
+
+    Args:
+        analysis_type: Key of ANALYSIS_SCHEMAS or NARRATIVE_SCHEMAS
+        prompt: Analysis prompt; the schema instructions are appended
+        pdf_content: Processed PDF content
+        job_description: Job description text
+        use_cache: Whether to read and write the structured cache
+        metric_fields: Extra fields recorded with each Gemini call's timings
+
+    Returns:
+        Record instance
+
+    Raises:
+        StructuredOutputError: If no attempt produced a valid reply
+    """
+    full_prompt = f"{prompt}\n{schema_instructions(analysis_type)}\n"
+    cache_key = make_cache_key(get_gemini_model_name(), SCHEMA_VERSION, full_prompt, pdf_content, job_description)
+    if use_cache:
+        cached = get_structured_cache().get(cache_key)
+        if cached is not None:
+            return record_from_dict(cached)
+
+    generation_config = {"response_mime_type": "application/json"} if GEMINI_JSON_MODE == "native" else None
+    attempt_prompt = full_prompt
+    for attempt in range(1, STRUCTURED_MAX_ATTEMPTS + 1):
+        # Raw replies bypass the text cache, so an invalid one is never served again
+        reply = get_gemini_response(
+            attempt_prompt, pdf_content, job_description, use_cache=False,
+            metric_name=f"gemini.{analysis_type}.json", generation_config=generation_config,
+            metric_fields=metric_fields,
+        )
+        try:
+            record = parse_structured_response(analysis_type, reply)
+        except StructuredOutputError as e:
+            record_metric("structured.parse_failure", analysis_type=analysis_type, attempt=attempt, error=str(e))
+            if attempt == STRUCTURED_MAX_ATTEMPTS:
+                raise
+            attempt_prompt = f"{full_prompt}\nYour previous reply could not be used ({e}). Reply with only the JSON object.\n"
+            continue
+        if use_cache:
+            get_structured_cache().set(cache_key, record_to_dict(record))
+        return record